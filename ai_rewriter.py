@@ -1,3 +1,14 @@
+import re
+import difflib
+import threading
+from collections import OrderedDict
+from llm_scheduler import PRIORITY_REWRITE
+from text_chunker import estimate_tokens
+
+SECTION_MAX_TOKENS = 300 # 수정 비교 단위(구간) 하나의 크기 (토큰 추정치)
+MAX_SECTIONS = 20 # 대본이 길어도 이보다 많이 나누지 않음 (넘으면 구간 크기를 늘림)
+REWRITE_HISTORY_SIZE = 16 # 수정본 재작성에 다시 쓸 최근 재작성 결과 수
+
 FINAL_CONFIG = {
     "role": {
         "identity": "Expert Speech Writer & Communication Psychologist",
@@ -51,18 +62,17 @@ class AI_Announcer:
     def __init__(self, text_model):
         """(MODIFIED) 텍스트 모델만 전달받음 (TTS 기능 삭제)"""
         self.text_model = text_model
+        # (스타일, 원문 구간 목록) -> 대본 전체 재작성 결과 (LRU, 고친 대본을 다시 변환할 때 기준으로 사용)
+        self.rewrite_history = OrderedDict()
+        self.cache_lock = threading.Lock()
 
-    def rewrite(self, script, type_code):
-        """(MODIFIED) 텍스트 모델(gemini-2.5-pro)을 사용하여 대본 재작성"""
-        if self.text_model is None:
-            return "❌ Gemini 텍스트 모델이 초기화되지 않아 대본 재작성이 불가능합니다."
-
+    def _build_system_prompt(self, type_code):
         style = FINAL_CONFIG["styles"].get(type_code, FINAL_CONFIG["styles"]["A"])
         
         # [수정 부분] 백슬래시(\)가 포함된 join 연산을 f-string 밖으로 뺐습니다.
         core_rules_text = '\n'.join(FINAL_CONFIG['role']['core_rules'])
         
-        system_prompt = f"""
+        return f"""
         You are an {FINAL_CONFIG['role']['identity']}.
         Rewrite the user's script following these strict rules:
         {core_rules_text}
@@ -74,11 +84,148 @@ class AI_Announcer:
 
         Output ONLY the rewritten script in Korean. Do not include any introductory or concluding remarks.
         """
-        
-        full_prompt = system_prompt + f"\n\n--- USER SCRIPT ---\n{script}"
+
+    def _build_prompt(self, script, type_code):
+        """재작성 프롬프트 생성 (일반/스트리밍 호출이 같은 프롬프트를 써야 캐시가 공유됨)"""
+        return self._build_system_prompt(type_code) + f"\n\n--- USER SCRIPT ---\n{script}"
+
+    def rewrite(self, script, type_code):
+        """(MODIFIED) 텍스트 모델(gemini-2.5-pro)을 사용하여 대본 재작성"""
+        if self.text_model is None:
+            return "❌ Gemini 텍스트 모델이 초기화되지 않아 대본 재작성이 불가능합니다."
+
+        full_prompt = self._build_prompt(script, type_code)
 
         try:       
-            response = self.text_model.generate_content(full_prompt)
+            response = self.text_model.generate_content(full_prompt, priority=PRIORITY_REWRITE)
+            self._remember_rewrite(script, type_code, response.text)
             return response.text
         except Exception as e:
-            return f"❌ 대본 재작성 오류 발생: Gemini API(Text) 호출 실패. {e}"
\ No newline at end of file
+            return f"❌ 대본 재작성 오류 발생: Gemini API(Text) 호출 실패. {e}"
+
+    def rewrite_stream(self, script, type_code, cancel_event=None):
+        """재작성 결과를 생성되는 대로 조각(chunk) 단위로 yield
+
+        cancel_event(threading.Event)가 set되면 즉시 중단합니다.
+        끝까지 받은 조각을 이어 붙이면 rewrite()와 같은 결과이며, 같은 캐시 항목을 공유합니다.
+        API 오류는 예외로 그대로 전달됩니다.
+        """
+        if self.text_model is None:
+            yield "❌ Gemini 텍스트 모델이 초기화되지 않아 대본 재작성이 불가능합니다."
+            return
+
+        full_prompt = self._build_prompt(script, type_code)
+        response = self.text_model.generate_content(full_prompt, stream=True, priority=PRIORITY_REWRITE)
+        parts = []
+        try:
+            for chunk in response:
+                if cancel_event is not None and cancel_event.is_set(): return
+                try:
+                    text = chunk.text
+                except Exception:
+                    text = "" # 내용 없는 조각(메타데이터 등)은 건너뜀
+                if text:
+                    parts.append(text)
+                    yield text
+        finally:
+            if hasattr(response, 'close'): response.close()
+        self._remember_rewrite(script, type_code, "".join(parts))
+
+    @staticmethod
+    def split_sections(script, max_tokens=SECTION_MAX_TOKENS, max_sections=MAX_SECTIONS):
+        """빈 줄(빈 줄이 없으면 줄) 단위 조각을 토큰 예산 크기의 구간으로 묶어 분리
+
+        구간 안의 줄바꿈은 원문 그대로이며, 구간이 max_sections개를 넘으면 예산을 늘려 다시 묶습니다.
+        (text_chunker.split_into_chunks는 문장을 공백으로 이어 붙여 줄 구조가 사라지므로 토큰 추정만 같이 씀)
+        """
+        text = script.strip()
+        if not text: return []
+        parts = re.split(r'(\s*\n\s*\n\s*)', text)
+        if len(parts) == 1: parts = re.split(r'(\s*\n\s*)', text)
+        units, separators = parts[0::2], parts[1::2]
+        tokens = [estimate_tokens(unit) for unit in units]
+
+        budget = max(max_tokens, sum(tokens) / max_sections)
+        while True:
+            sections, current, current_tokens = [], "", 0
+            for i, unit in enumerate(units):
+                if current and current_tokens + tokens[i] > budget:
+                    sections.append(current)
+                    current, current_tokens = "", 0
+                current = current + separators[i - 1] + unit if current else unit
+                current_tokens += tokens[i]
+            sections.append(current)
+            if len(sections) <= max_sections: return sections
+            budget *= 1.5
+
+    def _remember_rewrite(self, script, type_code, text):
+        if not text or text.startswith("❌"): return
+        key = (type_code, tuple(self.split_sections(script)))
+        with self.cache_lock:
+            self.rewrite_history[key] = text
+            self.rewrite_history.move_to_end(key)
+            while len(self.rewrite_history) > REWRITE_HISTORY_SIZE:
+                self.rewrite_history.popitem(last=False)
+
+    def find_previous_rewrite(self, script, type_code):
+        """같은 스타일로 재작성한 적 있는 대본 중 구간이 가장 많이 겹치는 것 -> (원문 구간 목록, 재작성 결과)
+
+        겹치는 구간이 하나도 없으면(처음 변환하는 대본) None
+        """
+        sections = set(self.split_sections(script))
+        best, best_shared = None, 0
+        with self.cache_lock:
+            for (code, previous_sections), text in self.rewrite_history.items():
+                if code != type_code: continue
+                shared = len(sections.intersection(previous_sections))
+                if shared > best_shared: best, best_shared = (list(previous_sections), text), shared
+        return best
+
+    @staticmethod
+    def _describe_changes(previous_sections, sections):
+        """이전 원문 구간 -> 현재 구간의 바뀐 부분만 나열 (변경 없는 구간은 보내지 않음)"""
+        changes = []
+        matcher = difflib.SequenceMatcher(a=previous_sections, b=sections, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            before, after = "\n".join(previous_sections[i1:i2]), "\n".join(sections[j1:j2])
+            if tag == 'replace':
+                changes.append(f"[CHANGED]\nBEFORE:\n{before}\nAFTER:\n{after}")
+            elif tag == 'delete':
+                changes.append(f"[REMOVED]\n{before}")
+            elif tag == 'insert':
+                anchor = f"after: {sections[j1 - 1][:40]}…" if j1 > 0 else "at the beginning"
+                changes.append(f"[ADDED] ({anchor})\n{after}")
+        return changes
+
+    def rewrite_incremental(self, script, type_code, cancel_event=None):
+        """이미 재작성한 대본을 고쳐 다시 변환: 이전 재작성 결과와 바뀐 구간만 보내 한 번에 갱신
+
+        이전 결과가 없으면(처음 변환) 대본 전체를 한 번에 요청하고, 고친 곳이 없으면 호출 없이 이전 결과를 반환합니다.
+        취소되면 None, API 오류가 있으면 "❌"로 시작하는 메시지를 반환합니다.
+        """
+        if self.text_model is None:
+            return "❌ Gemini 텍스트 모델이 초기화되지 않아 대본 재작성이 불가능합니다."
+
+        sections = self.split_sections(script)
+        previous = self.find_previous_rewrite(script, type_code)
+        if previous is None:
+            prompt = self._build_prompt(script, type_code)
+        else:
+            previous_sections, previous_text = previous
+            changes = self._describe_changes(previous_sections, sections)
+            if not changes: return previous_text
+            print(f"♻️ [대본 재작성] 전체 {len(sections)}개 구간 중 바뀐 부분 {len(changes)}곳만 전달")
+            prompt = (self._build_system_prompt(type_code) +
+                      f"\n\n--- PREVIOUS REWRITE (of an earlier version of the script) ---\n{previous_text}"
+                      f"\n\n--- CHANGES IN THE SOURCE SCRIPT SINCE THAT REWRITE ---\n" + "\n\n".join(changes) +
+                      "\n\nUpdate the previous rewrite so that it reflects these changes. Keep the parts unrelated "
+                      "to the changes as they are. Output the full updated script.")
+
+        if cancel_event is not None and cancel_event.is_set(): return None
+        try:
+            text = self.text_model.generate_content(prompt, priority=PRIORITY_REWRITE).text
+        except Exception as e:
+            return f"❌ 대본 재작성 오류 발생: Gemini API(Text) 호출 실패. {e}"
+        if cancel_event is not None and cancel_event.is_set(): return None
+        self._remember_rewrite(script, type_code, text)
+        return text
@@ -1,13 +1,24 @@
 import re
+import json
 import numpy as np
 from collections import Counter
+from concurrent.futures import CancelledError
 from question_generator import IMRADValidator 
+from keyword_extractor import LocalKeywordExtractor
+from llm_scheduler import PRIORITY_REPORT, PRIORITY_ANALYSIS
+from text_chunker import split_into_chunks, map_reduce
+from prosody import MONOTONE_RANGE_ST, WIDE_RANGE_ST, JITTER_WARN_PCT, LONG_PAUSE_SEC
+
+def _check_cancelled(cancel_token):
+    """분석 화면을 떠나 작업이 취소됐으면 남은 LLM 호출을 보내지 않고 중단"""
+    if cancel_token is not None and cancel_token.cancelled: raise CancelledError()
 
 class AnalysisManager:
-    def __init__(self, stopwords, coaching_config):
+    def __init__(self, stopwords, coaching_config, corpus_file=None):
         self.STOPWORDS = stopwords
         self.COACHING_CONFIG = coaching_config
         self.imrad_validator = IMRADValidator() # IMRAD 검증기 인스턴스화
+        self.keyword_extractor = LocalKeywordExtractor(stopwords, corpus_file) # 로컬 TF-IDF 키워드 추출기
     def extract_keywords_from_script(self, script, ai_available, gemini_model):
         """대본 길이에 맞춰 유동적으로 핵심 키워드 추출 (최소 5개 ~ 최대 15개)"""
         
@@ -17,48 +28,38 @@ class AnalysisManager:
 
         extracted_keywords = []
         
-        # 1. AI 모드
+        # 1. AI 모드 (app_config.USE_AI_KEYWORDS가 켜진 경우에만 호출됨)
         if ai_available and len(script) > 50 and gemini_model:
             try:
-                # 프롬프트에 동적 개수(target_count) 반영
-                prompt = (f"다음 발표 대본에서 가장 중요한 핵심 키워드 {target_count}개를 추출해줘. "
-                          f"추상적인 단어보다는 구체적인 소재나 데이터 관련 단어 위주로.\n"
-                          f"결과는 쉼표로 구분해서 단어만 나열해줘:\n\n{script[:3000]}") # 길이 제한 늘림
-                
-                response = gemini_model.generate_content(prompt)
-                if response.text:
-                    extracted_keywords = [k.strip() for k in response.text.split(',')]
+                # 긴 대본은 자르지 않고 구간별로 추출(map)한 뒤 여러 구간에서 나온 키워드 우선으로 합침(reduce)
+                def map_keywords(chunk):
+                    # 프롬프트에 동적 개수(target_count) 반영
+                    prompt = (f"다음 발표 대본에서 가장 중요한 핵심 키워드 {target_count}개를 추출해줘. "
+                              f"추상적인 단어보다는 구체적인 소재나 데이터 관련 단어 위주로.\n"
+                              f"결과는 쉼표로 구분해서 단어만 나열해줘:\n\n{chunk}")
+                    response = gemini_model.generate_content(prompt, priority=PRIORITY_ANALYSIS)
+                    return [k.strip() for k in response.text.split(',') if k.strip()]
+
+                def reduce_keywords(keyword_lists):
+                    votes, first_seen = Counter(), {}
+                    for keywords in keyword_lists:
+                        for k in keywords:
+                            votes[k] += 1
+                            first_seen.setdefault(k, len(first_seen))
+                    return sorted(votes, key=lambda k: (-votes[k], first_seen[k]))
+
+                extracted_keywords = map_reduce(split_into_chunks(script), map_keywords, reduce_keywords)
+                if extracted_keywords:
                     # 혹시 AI가 너무 많이 주면 자르기
                     return extracted_keywords[:target_count]
             except Exception as e:
                 print(f"AI 추출 실패: {e}")
         
-        # 2. 로컬 모드 (빈도수 기반)
-        raw_words = re.findall(r'[가-힣a-zA-Z]{2,}', script)
-        meaningful_words = []
-        for w in raw_words:
-            # 불용어 필터링
-            if w not in self.STOPWORDS and not any(w.startswith(sw) for sw in self.STOPWORDS if len(sw) > 1):
-                 meaningful_words.append(w)
-        
-        counter = Counter(meaningful_words)
-        
-        # [수정] 동적으로 계산된 target_count만큼 추출
-        extracted_keywords = [word for word, freq in counter.most_common(target_count)]
+        # 2. 로컬 모드 (과거 대본 대비 TF-IDF, 밀리초 단위)
+        extracted_keywords = self.keyword_extractor.extract(script, target_count)
         
         print(f">>> [키워드 추출] 목표 개수: {target_count}개 -> 추출 결과: {extracted_keywords}")
         return extracted_keywords
-        
-        # AI 실패 시 로컬 분석
-        raw_words = re.findall(r'[가-힣a-zA-Z]{2,}', script)
-        meaningful_words = []
-        for w in raw_words:
-            if w not in self.STOPWORDS and not any(w.startswith(sw) for sw in self.STOPWORDS if len(sw) > 1):
-                 meaningful_words.append(w)
-        counter = Counter(meaningful_words)
-        extracted_keywords = [word for word, freq in counter.most_common(5)]
-        print(f">>> [로컬] 추출 키워드: {extracted_keywords}")
-        return extracted_keywords
 
     def calculate_smart_match(self, original, transcribed, mode):
         """대본과 STT 결과의 일치율 분석 (모드별 차등 적용)"""
@@ -89,12 +90,18 @@ class AnalysisManager:
         else:
             return f"✅ [속도 분석] 아주 적절한 발표 속도입니다. ({spm} SPM)\n"
         
-    def analyze_vocal_energy(self, volume_data, mapped_mode):
-        """볼륨 데이터의 표준편차로 에너지(역동성) 분석"""
-        if not volume_data or len(volume_data) < 2: 
+    def analyze_vocal_energy(self, volume_data, mapped_mode, prosody=None):
+        """볼륨 데이터의 표준편차로 에너지(역동성) 분석 (+ 억양/쉼 분석이 있으면 덧붙임)
+
+        volume_data: 녹화 중 누적된 볼륨 통계 dict({"count", "std", ...}, streaming_stats) 또는 볼륨 목록
+        prosody: prosody.analyze_prosody() 결과 또는 None
+        """
+        if isinstance(volume_data, dict): count, std_dev = volume_data.get("count", 0), volume_data.get("std", 0.0)
+        else: count, std_dev = len(volume_data or []), None
+        if count < 2: 
             return "⚠️ [에너지 분석] 오디오 데이터가 부족합니다."
         
-        std_dev = np.std(volume_data)
+        if std_dev is None: std_dev = np.std(volume_data) # 누적 통계가 없는 예전 결과
         # audioop.rms (0~32768) 스케일에 맞춘 임계값
         energy_score = min(100, max(0, int((std_dev - 50) / 450 * 100))) 
 
@@ -116,6 +123,27 @@ class AnalysisManager:
                  feedback = "⚠️ [에너지 분석] 자칫 지루하게 들릴 수 있습니다. 목소리에 조금 더 생기를 넣어보세요.\n"
             else:
                  feedback = "⚠️ [에너지 분석] 다소 과하거나 불안정하게 들릴 수 있습니다.\n"
+        if prosody: feedback += self.analyze_prosody(prosody, mapped_mode)
+        return feedback
+
+    def analyze_prosody(self, prosody, mapped_mode):
+        """억양 폭(반음) / 목소리 흔들림(지터) / 긴 쉼 피드백"""
+        feedback = ""
+        range_st = prosody.get("intonation_range_st")
+        if range_st is not None:
+            if range_st < MONOTONE_RANGE_ST:
+                feedback += f"🎵 [억양 분석] 억양 폭이 좁아 단조롭게 들릴 수 있습니다. ({range_st:.1f}반음) 핵심 단어에서 음을 살짝 올려보세요.\n"
+            elif range_st > WIDE_RANGE_ST and mapped_mode == '논리적':
+                feedback += f"🎵 [억양 분석] 억양 변화가 커서 차분한 인상이 약해질 수 있습니다. ({range_st:.1f}반음)\n"
+            else:
+                feedback += f"✅ [억양 분석] 억양에 적절한 변화가 있습니다. ({range_st:.1f}반음)\n"
+        jitter = prosody.get("jitter_pct")
+        if jitter is not None and jitter > JITTER_WARN_PCT:
+            feedback += f"⚠️ [떨림 분석] 목소리 음높이가 자주 흔들립니다. (변동률 {jitter:.1f}%) 호흡을 길게 가져가 보세요.\n"
+        pauses = prosody.get("pauses") or {}
+        if pauses.get("long_count"):
+            feedback += (f"⏸️ [쉼 분석] {LONG_PAUSE_SEC:g}초 이상 긴 쉼이 {pauses['long_count']}번 있었습니다. "
+                         f"(가장 긴 쉼 {pauses['max_sec']:.1f}초) 흐름이 끊기지 않게 연결 문장을 준비해보세요.\n")
         return feedback
 
     def analyze_speech_style(self, transcript, mapped_mode):
@@ -142,14 +170,34 @@ class AnalysisManager:
              feedback = "✅ [어조 분석] 역동적인 발표에 어울리는 자연스러운 어조입니다.\n"
         return feedback
 
-    def generate_ai_feedback(self, gemini_model, script, target_type, delivery_metrics, style_feedback, energy_feedback, imrad_report):
-        """Gemini를 사용하여 LLM에게 최종 리포트 생성 요청"""
-        rubric = self.COACHING_CONFIG["rubrics"][target_type]
-        print(f"🤖 [{rubric['type_name']}] 기준으로 Gemini 심층 코칭 리포트 작성 중...")
+    def _condense_long_text(self, gemini_model, text, label, cancel_token=None):
+        """예산을 넘는 긴 대본/STT를 구간별 요약(map) 후 이어 붙여(reduce) 압축 (짧으면 그대로 반환)"""
+        chunks = split_into_chunks(text)
+        if len(chunks) == 1: return text
+        print(f"📚 [{label}] 긴 텍스트를 {len(chunks)}개 구간으로 나누어 요약 중...")
+
+        def summarize(chunk):
+            _check_cancelled(cancel_token)
+            prompt = (f"다음은 긴 발표 {label}의 한 구간입니다. 이 구간의 핵심 주장, 근거/데이터, "
+                      f"논리적 허점이나 어색한 표현을 원문을 짧게 인용하며 5줄 이내로 요약하세요.\n\n{chunk}")
+            return gemini_model.generate_content(prompt, priority=PRIORITY_REPORT).text.strip()
 
+        def join_notes(notes):
+            return "\n".join(f"[구간 {i}/{len(notes)}] {note}" for i, note in enumerate(notes, 1))
+
+        return map_reduce(chunks, summarize, join_notes)
+
+    def _condense_texts(self, gemini_model, script, transcript, cancel_token=None):
+        """대본/STT를 한 번씩만 압축 -> (대본, STT) (통합 분석이 실패해도 개별 리포트에서 그대로 재사용)"""
+        return (self._condense_long_text(gemini_model, script, "대본", cancel_token),
+                self._condense_long_text(gemini_model, transcript, "STT", cancel_token))
+
+    def _build_report_prompt(self, target_type, delivery_metrics, style_feedback, energy_feedback, imrad_report):
+        """최종 리포트용 시스템 프롬프트 (단일 리포트/통합 분석 요청에서 공용)"""
+        rubric = self.COACHING_CONFIG["rubrics"][target_type]
         imrad_data = "\n".join(imrad_report) if imrad_report else "논리적 허점 없음"
 
-        system_prompt = f"""
+        return f"""
         {self.COACHING_CONFIG['coach_persona']}
         목표 유형: [{rubric['type_name']}]
         평가 기준:\n{rubric['criteria']}
@@ -168,12 +216,177 @@ class AnalysisManager:
         2. (전달력/어조/에너지 측면 1가지 - *'자동 분석 데이터'를 근거로 제시*)
         **💡 총평** (따뜻한 격려)
         """
-        
-        full_prompt = system_prompt + f"\n\n--- USER SCRIPT (STT) ---\n{script}"
+
+    def generate_ai_feedback(self, gemini_model, script, target_type, delivery_metrics, style_feedback, energy_feedback, imrad_report,
+                             cancel_token=None, condensed=False):
+        """Gemini를 사용하여 LLM에게 최종 리포트 생성 요청 (condensed=True면 이미 압축된 STT로 보고 다시 요약하지 않음)"""
+        rubric = self.COACHING_CONFIG["rubrics"][target_type]
+        print(f"🤖 [{rubric['type_name']}] 기준으로 Gemini 심층 코칭 리포트 작성 중...")
+
+        system_prompt = self._build_report_prompt(target_type, delivery_metrics, style_feedback, energy_feedback, imrad_report)
 
         try:
-            response = gemini_model.generate_content(full_prompt)
+            # 긴 발표는 뒷부분을 버리지 않고 구간 요약으로 압축해서 전달
+            if not condensed: script = self._condense_long_text(gemini_model, script, "STT", cancel_token)
+            full_prompt = system_prompt + f"\n\n--- USER SCRIPT (STT) ---\n{script}"
+            _check_cancelled(cancel_token)
+            # 최종 리포트는 최우선 순위 (돌발 질문 때문에 한도가 밀리지 않도록)
+            response = gemini_model.generate_content(full_prompt, priority=PRIORITY_REPORT)
             return response.text
+        except CancelledError: raise
         except Exception as e:
             print(f"Gemini 리포트 생성 실패: {e}")
-            return None # 실패 시 None 반환
\ No newline at end of file
+            return None # 실패 시 None 반환
+
+    def generate_combined_analysis(self, gemini_model, original_script, transcript, target_type, delivery_metrics, style_feedback, energy_feedback, imrad_report,
+                                   cancel_token=None, condensed=False):
+        """키워드 + 논리 허점 + 예상 질문 + 최종 리포트를 JSON 한 번의 호출로 요청
+
+        검증에 실패하면 None을 반환하므로, 호출하는 쪽에서 기존 개별 프롬프트로 대체하면 됩니다.
+        condensed=True면 대본/STT가 이미 압축된 것으로 보고 다시 요약하지 않습니다.
+        """
+        rubric = self.COACHING_CONFIG["rubrics"][target_type]
+        target_count = min(15, 5 + int(len(original_script) / 200))
+        print(f"🤖 [{rubric['type_name']}] 통합 분석(키워드/논리/질문/리포트) 1회 요청 중...")
+
+        report_prompt = self._build_report_prompt(target_type, delivery_metrics, style_feedback, energy_feedback, imrad_report)
+        if not condensed:
+            try:
+                original_script, transcript = self._condense_texts(gemini_model, original_script, transcript, cancel_token)
+            except CancelledError: raise
+            except Exception as e:
+                print(f"긴 텍스트 압축 실패: {e}")
+                return None
+
+        full_prompt = f"""
+        {report_prompt}
+
+        위 리포트와 함께 아래 항목도 분석해서, 반드시 다음 JSON 형식 하나로만 응답하세요:
+        {{
+          "keywords": ["원본 대본의 핵심 키워드 {target_count}개 (구체적인 소재/데이터 위주)"],
+          "logic_gaps": ["원본 대본에서 논리적으로 취약하거나 근거가 부족한 부분 (최대 3개, 없으면 빈 배열)"],
+          "question": "청중이 던질 법한 가장 날카로운 예상 질문 1개",
+          "report": "위 형식의 AI 코칭 리포트 전문 (마크다운)"
+        }}
+
+        --- ORIGINAL SCRIPT ---
+        {original_script}
+
+        --- USER SCRIPT (STT) ---
+        {transcript}
+        """
+
+        _check_cancelled(cancel_token)
+        try:
+            response = gemini_model.generate_content(
+                full_prompt,
+                generation_config={"response_mime_type": "application/json"},
+                priority=PRIORITY_REPORT
+            )
+            result = self.validate_combined_response(response.text, target_count)
+            if result is None: print("통합 분석 응답이 스키마와 맞지 않아 개별 요청으로 대체합니다.")
+            return result
+        except Exception as e:
+            print(f"Gemini 통합 분석 실패: {e}")
+            return None
+
+    def build_feedback_report(self, text_model, mode_raw, script, spm, transcript, volume_data, prosody=None, cancel_token=None):
+        """규칙 기반 + AI 코칭 리포트 텍스트 생성 (UI/배치 분석 공용)
+
+        반환값: (리포트 텍스트, 통합 분석 결과 dict 또는 None)
+        cancel_token(CancelToken)이 취소되면 다음 LLM 호출 전에 CancelledError로 중단합니다.
+        """
+        if '정보' in mode_raw: mapped_mode = '논리적'; target_type_key = 'A'
+        elif '공감' in mode_raw: mapped_mode = '친화적'; target_type_key = 'C'
+        else: mapped_mode = '열정적'; target_type_key = 'B'
+        
+        if spm == 0 and len(transcript.strip()) < 10:
+            return "🚨 **데이터 부족:** 음성 데이터가 충분히 인식되지 않았습니다.", None
+
+        final_report_text = "--- 📈 AI 코칭 리포트 (규칙 기반) ---\n"
+        style_feedback = self.analyze_speech_style(transcript, mapped_mode)
+        energy_feedback = self.analyze_vocal_energy(volume_data, mapped_mode, prosody)
+        delivery_metrics = {"spm": spm} 
+        
+        final_report_text += f"{style_feedback}\n{energy_feedback}\n\n"
+        
+        imrad_report = []
+        if target_type_key == 'A': imrad_report = self.imrad_validator.validate_imrad_sections(script)
+        if imrad_report: final_report_text += "--- [논리 구조 경고] ---\n" + "\n".join(imrad_report) + "\n\n"
+        
+        ai_generated_feedback = None 
+        combined = None
+        condensed_stt = None
+        if text_model: 
+            # 긴 대본/STT 압축은 한 번만 (통합 분석이 실패해 개별 리포트로 넘어가도 다시 요약하지 않음)
+            try:
+                condensed_script, condensed_stt = self._condense_texts(text_model, script, transcript, cancel_token)
+            except CancelledError: raise
+            except Exception as e:
+                print(f"긴 텍스트 압축 실패: {e}")
+                ai_generated_feedback = f"오류: {e}"
+
+        if condensed_stt is not None:
+            # 1순위: 키워드/논리 허점/예상 질문/리포트를 JSON 한 번의 호출로 받음
+            try:
+                combined = self.generate_combined_analysis(
+                    text_model, condensed_script, condensed_stt, target_type_key, delivery_metrics,
+                    style_feedback, energy_feedback, imrad_report, cancel_token, condensed=True
+                )
+            except CancelledError: raise
+            except Exception as e:
+                print(f"통합 분석 오류: {e}")
+
+            if combined:
+                if combined['logic_gaps']:
+                    final_report_text += "--- [AI 논리 허점 분석] ---\n" + "\n".join(f"- {g}" for g in combined['logic_gaps']) + "\n\n"
+                if combined['question']:
+                    final_report_text += f"--- 🎯 예상 질문 ---\n{combined['question']}\n\n"
+                ai_generated_feedback = combined['report']
+            else:
+                # 2순위: 기존 개별 리포트 프롬프트
+                try:
+                    ai_generated_feedback = self.generate_ai_feedback(
+                        text_model, condensed_stt, target_type_key, delivery_metrics, 
+                        style_feedback, energy_feedback, imrad_report, cancel_token, condensed=True
+                    )
+                except CancelledError: raise
+                except Exception as e:
+                    ai_generated_feedback = f"오류: {e}"
+        
+        final_report_text += "--- 🤖 AI 심층 피드백 (Gemini) ---\n"
+        
+        if ai_generated_feedback: final_report_text += ai_generated_feedback
+        else: final_report_text += "Gemini API 미연결로 심층 피드백을 건너뜁니다."
+        return final_report_text, combined
+
+    def validate_combined_response(self, text, keyword_count=15):
+        """통합 분석 JSON 응답 검증 (keywords/logic_gaps: 문자열 리스트, question/report: 문자열)"""
+        if not text: return None
+        raw = text.strip()
+        # ```json ... ``` 코드 블록으로 감싸서 주는 경우 대비
+        fenced = re.match(r'^```(?:json)?\s*(.*?)\s*```$', raw, re.DOTALL)
+        if fenced: raw = fenced.group(1)
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        if not isinstance(data, dict): return None
+
+        def str_list(value):
+            if not isinstance(value, list): return None
+            return [v.strip() for v in value if isinstance(v, str) and v.strip()]
+
+        keywords = str_list(data.get('keywords'))
+        logic_gaps = str_list(data.get('logic_gaps', []))
+        question = data.get('question')
+        report = data.get('report')
+        if keywords is None or logic_gaps is None: return None
+        if not isinstance(question, str) or not isinstance(report, str) or not report.strip(): return None
+
+        return {
+            "keywords": keywords[:keyword_count],
+            "logic_gaps": logic_gaps,
+            "question": question.strip(),
+            "report": report.strip()
+        }
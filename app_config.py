@@ -1,28 +1,6 @@
 import os
-import google.generativeai as genai
-from matplotlib import font_manager, rc
 import json
 
-# --- 한글 폰트 설정 ---
-def set_korean_font():
-    """Matplotlib 한글 폰트 설정"""
-    try:
-        # 윈도우
-        font_path = "C:/Windows/Fonts/malgun.ttf"
-        font = font_manager.FontProperties(fname=font_path).get_name()
-        rc('font', family=font)
-    except Exception as e:
-        print(f"한글 폰트(malgun.ttf)를 찾을 수 없습니다. (오류: {e})")
-        try:
-            # macOS
-            font_path = "/Library/Fonts/AppleGothic.ttf"
-            font = font_manager.FontProperties(fname=font_path).get_name()
-            rc('font', family=font)
-        except Exception as e_mac:
-            print(f"AppleGothic 폰트도 찾을 수 없습니다. (오류: {e_mac})")
-            print("그래프의 한글이 깨질 수 있습니다.")
-
-
 # --- API 키 로드/저장 함수 (Gemini 전용) ---
 KEYS_FILE = "keys.json"
 
@@ -50,6 +28,26 @@ def save_api_keys(gemini_key):
     except Exception as e:
         print(f"API 키 저장 실패: {e}")
 
+# --- Gemini 호출 설정 ---
+LLM_CONFIG = {
+    "backend": os.environ.get("LLM_BACKEND", "gemini"), # "gemini" 또는 "local"(오프라인 테스트용 가짜 LLM)
+    "model_name": "gemini-2.5-flash",
+    "cache_file": "llm_cache.sqlite3",      # 응답 디스크 캐시 (같은 프롬프트는 API 호출 없이 재사용)
+    "cache_max_bytes": 20 * 1024 * 1024,    # 캐시 최대 용량 (초과 시 LRU 삭제)
+    "cache_ttl_sec": 7 * 24 * 3600,         # 캐시 유효 기간 (7일)
+    "requests_per_minute": 10,              # 무료 티어 분당 요청 한도
+    "burst": 3,                             # 한 번에 몰아서 보낼 수 있는 최대 요청 수
+    "report_reserve": 1,                    # 최종 리포트 전용으로 남겨두는 토큰 수
+    "max_retries": 3,                       # 429 응답 시 재시도 횟수
+    "max_concurrency": 2,                   # 동시에 진행되는 요청 수
+    "stub": {                               # backend="local"일 때 가짜 LLM 동작 (지연/오류/429 비율)
+        "latency_sec": 0.8,
+        "jitter_sec": 0.3,
+        "error_rate": 0.0,
+        "rate_limit_rate": 0.0
+    }
+}
+
 # --- AI 코칭 평가 기준 ---
 COACHING_CONFIG = {
     "coach_persona": "당신은 날카롭지만 따뜻한 전문 발표 코치입니다. '샌드위치 피드백'(칭찬-개선점-격려)을 제공합니다.",
@@ -57,18 +55,30 @@ COACHING_CONFIG = {
         "A": {
             "type_name": "📘 정보 전달형",
             "tone_mode": "논리적",
-            "criteria": "- [내용] IMRAD 구조/논리적 흐름\n- [표현] 정확한 수치/팩트 사용\n- [전달] 일정한 속도, 또렷한 발음"
+            "criteria": "- [내용] IMRAD 구조/논리적 흐름\n- [표현] 정확한 수치/팩트 사용\n- [전달] 일정한 속도, 또렷한 발음",
+            "score_weights": {"match_rate": 0.4, "fluency": 0.3, "gaze": 0.2, "score_speed": 0.1} # 종합 점수 가중치 (더하는 순서 유지)
         },
         "B": {
             "type_name": "🔥 설득/동기부여형",
             "tone_mode": "열정적",
-            "criteria": "- [내용] 강력한 행동 촉구(Call to Action)\n- [설득 기법] 심리적 트리거(희소성, 권위 등) 활용\n- [전달] 속도와 성량의 드라마틱한 변화"
+            "criteria": "- [내용] 강력한 행동 촉구(Call to Action)\n- [설득 기법] 심리적 트리거(희소성, 권위 등) 활용\n- [전달] 속도와 성량의 드라마틱한 변화",
+            "score_weights": {"gaze": 0.4, "score_speed": 0.2, "fluency": 0.2, "match_rate": 0.2}
         },
         "C": {
             "type_name": "🤝 공감/소통형",
             "tone_mode": "친화적",
-            "criteria": "- [내용] 진솔한 경험(취약성) 공유\n- [표현] 자연스러운 구어체(대화체) 사용\n- [전달] 편안하고 따뜻한 톤"
+            "criteria": "- [내용] 진솔한 경험(취약성) 공유\n- [표현] 자연스러운 구어체(대화체) 사용\n- [전달] 편안하고 따뜻한 톤",
+            "score_weights": {"match_rate": 0.3, "gaze": 0.3, "fluency": 0.2, "score_speed": 0.2}
         }
+    },
+    # 세부 점수 계산 기준 (scoring.py). 기준을 바꾸면 version을 올려 예전 결과와 구분
+    "scoring": {
+        "version": 2,
+        "speed": {"target_spm": 350, "slope": 0.4, "slow_spm": 280, "fast_spm": 420},
+        "gaze": {"script_penalty": 150, "warning_ratio": 0.2},       # 대본 응시 비율 감점 가중치 / 경고 기준
+        "match": {"boost": 1.05, "min_transcript_chars": 5},         # 전달률 보정 배율 / 전사가 이보다 짧으면 '데이터 부족'
+        # 긴 쉼(prosody.LONG_PAUSE_SEC 이상) 감점은 억양/쉼 분석이 있는 세션에만 적용 (v2, 없으면 v1과 같음)
+        "fluency": {"filler_penalty": 3, "tremble_per_min_penalty": 2, "long_pause_per_min_penalty": 10}
     }
 }
 
@@ -81,7 +91,22 @@ BACKUP_QUESTIONS = [
     "이 아이디어를 한 문장으로 요약한다면 무엇인가요?",
     "청중이 꼭 기억해야 할 단 한 가지는 무엇인가요?"
 ]
-HISTORY_FILE = "score_history.json"
+QUESTION_POOL_CONFIG = {
+    "max_ai_questions": 2 # 대본 하나당 미리 받아둘 AI 돌발 질문 최대 개수 (무료 한도 고려)
+}
+HISTORY_FILE = "score_history.json" # 예전 점수 기록 (처음 실행 시 SESSION_DB_FILE로 옮겨짐)
+SESSION_DB_FILE = "practice_sessions.sqlite3" # 세션별 점수/지표 저장소
+HISTORY_WINDOW = 500 # 트렌드 그래프용으로 불러올 최근 세션 수
+PROGRESS_WINDOW = 5 # 성장 기록 패널의 이동 평균 구간 (최근 N회)
+SESSION_ARCHIVE_CONFIG = {
+    "root_dir": "sessions", # 세션별 영상/음성/결과 폴더
+    "max_bytes": 2 * 1024 ** 3, # 전체 보관 용량 (초과 시 오래된 세션부터 삭제)
+    "max_age_days": 30, # 보관 기간
+    "keep_min": 5 # 용량/기간과 관계없이 항상 남겨둘 최근 세션 수
+}
+KEYWORD_CORPUS_FILE = "keyword_corpus.json" # 로컬 TF-IDF용 과거 대본 코퍼스
+USE_AI_KEYWORDS = False # True면 키워드 추출에 Gemini 호출 (기본: 로컬 추출)
+TRACE_ENABLED = os.environ.get("APP_TRACE") == "1" # True면 녹화마다 구간별 소요 시간을 sessions/<id>/trace.json으로 저장
 STOPWORDS = set([
     '있습니다', '하겠습니다', '합니다', '있는', '것입니다', '생각합니다', 
     '저는', '제가', '저희', '우리', '이번', '통해', '대해', '관한', '관련',
@@ -0,0 +1,251 @@
+"""녹화된 발표 세션을 화면(Tk) 없이 일괄 분석해 JSON 리포트로 저장
+
+세션마다 Whisper 전사 -> 영상 시선 재분석 -> 점수 계산 -> (선택) AI 코칭 리포트를 수행하며,
+여러 세션은 프로세스 풀에서 병렬로 처리합니다. 점수 계산은 앱과 같은 scoring 모듈을 사용합니다.
+
+예)
+  # 세션 하나
+  python batch_analyze.py --script script.txt --audio audio.wav --video video.avi --mode "📘 정보 전달형" --out reports
+  # 여러 세션 (jobs.json: [{"id", "script" 또는 "script_file", "audio", "video", "mode"}, ...])
+  python batch_analyze.py --jobs jobs.json --workers 4 --out reports
+  # 보관된 세션(sessions/) 전체 재채점 (전사/시선은 저장된 값을 재사용)
+  python batch_analyze.py --archive sessions --no-transcribe --no-gaze --out reports
+  # 채점 기준만 바뀐 경우: 저장된 집계값으로 한 번에 재채점 (프로세스 풀/모델 로드 없음)
+  python batch_analyze.py --archive sessions --rescore --out reports
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import app_config
+from scoring import compute_scores, rescore_results
+from session_analysis import (count_syllables, count_fillers, analyze_video_gaze,
+                              read_pcm, audio_features, transcribe, create_face_mesh, create_whisper_model)
+from session_archive import SessionArchive, VIDEO_FILE
+from streaming_stats import volume_stats
+from prosody import analyze_prosody
+
+# 프로세스마다 한 번만 만드는 무거운 객체 (Whisper/FaceMesh/LLM)
+_worker = {}
+
+def _init_worker(options):
+    """프로세스 풀 초기화: 모델을 프로세스당 한 번만 로드"""
+    _worker["options"] = options
+    if options["transcribe"]:
+        try: _worker["whisper"] = create_whisper_model(options["whisper_size"])
+        except Exception as e: print(f"Whisper 로드 실패 (저장된 전사 사용): {e}")
+    if options["gaze"]:
+        try: _worker["face_mesh"] = create_face_mesh()
+        except Exception as e: print(f"FaceMesh 로드 실패 (저장된 시선 지표 사용): {e}")
+    if options["ai"]:
+        _worker["text_model"] = _create_text_model(options["workers"])
+
+def _create_text_model(workers):
+    """앱과 같은 LLM 스택(백엔드 -> 스케줄러 -> 디스크 캐시). 분당 요청 한도는 프로세스 수로 나눠 씀"""
+    from llm_backend import create_provider
+    from llm_scheduler import LLMScheduler, ScheduledTextModel
+    from llm_cache import LLMResponseCache, CachedTextModel
+
+    llm_config = app_config.LLM_CONFIG
+    api_key = app_config.load_api_keys() if llm_config['backend'] == 'gemini' else None
+    if llm_config['backend'] == 'gemini' and not api_key:
+        print("Gemini API 키 없음. AI 리포트 없이 분석합니다.")
+        return None
+    try:
+        provider = create_provider(llm_config, api_key)
+        scheduler = LLMScheduler(
+            max(1.0, llm_config['requests_per_minute'] / max(1, workers)), llm_config['burst'],
+            llm_config['report_reserve'], llm_config['max_retries'], max_concurrency=llm_config['max_concurrency']
+        )
+        scheduled_model = ScheduledTextModel(provider, scheduler, provider.model_name)
+        cache = LLMResponseCache(llm_config['cache_file'], llm_config['cache_max_bytes'], llm_config['cache_ttl_sec'])
+        return CachedTextModel(scheduled_model, cache, provider.model_name)
+    except Exception as e:
+        print(f"LLM 연결 실패: {e}")
+        return None
+
+def _read_script(job):
+    if job.get("script") is not None: return job["script"]
+    with open(job["script_file"], "r", encoding='utf-8') as f:
+        return f.read()
+
+def analyze_job(job):
+    """세션 하나 분석 -> 리포트 dict (프로세스 풀 작업 함수)
+
+    job: {"id", "script"/"script_file", "audio", "video", "mode",
+          "previous": 보관된 result.json (전사/시선을 다시 계산하지 않을 때 사용)}
+    """
+    options = _worker["options"]
+    previous = job.get("previous") or {}
+    t0 = time.perf_counter()
+    timings = {}
+
+    script = _read_script(job)
+    mode = job.get("mode") or previous.get("mode") or ""
+
+    # 음성: 볼륨/떨림/길이
+    audio = {"volumes": previous.get("volumes", []), "tremble_count": previous.get("tremble_count", 0),
+             "duration_sec": previous.get("duration_sec", 0.0), "per_minute": previous.get("per_minute", []),
+             "prosody": previous.get("prosody")}
+    audio["volume_stats"] = previous.get("volume_stats") or volume_stats(audio["volumes"])
+    if job.get("audio") and os.path.exists(job["audio"]):
+        t = time.perf_counter()
+        pcm, rate = read_pcm(job["audio"])
+        audio = audio_features(pcm, rate)
+        timings["audio_sec"] = time.perf_counter() - t
+        t = time.perf_counter()
+        audio["prosody"] = analyze_prosody(pcm, rate)
+        timings["prosody_sec"] = time.perf_counter() - t
+
+    # 전사: Whisper (또는 보관된 전사 재사용)
+    transcript = job.get("transcript", previous.get("transcript", ""))
+    if _worker.get("whisper") and job.get("audio") and os.path.exists(job["audio"]):
+        t = time.perf_counter()
+        transcript = transcribe(_worker["whisper"], job["audio"])
+        timings["transcribe_sec"] = time.perf_counter() - t
+
+    # 시선: 영상 재분석 (또는 보관된 프레임 집계 재사용)
+    gaze = previous.get("gaze_frames") or {"total_frames": 0, "looking_frames": 0, "script_frames": 0}
+    if _worker.get("face_mesh") and job.get("video") and os.path.exists(job["video"]):
+        t = time.perf_counter()
+        gaze = analyze_video_gaze(job["video"], _worker["face_mesh"])
+        timings["gaze_sec"] = time.perf_counter() - t
+
+    if "transcribe_sec" not in timings and "word_count" in previous:
+        # 전사를 다시 하지 않으면 앱이 실시간으로 센 음절/필러 수를 그대로 사용 (앱과 같은 점수)
+        word_count, filler_count = previous["word_count"], previous.get("filler_count", 0)
+    else:
+        word_count = count_syllables(transcript)
+        filler_count = count_fillers(transcript, app_config.FILLER_WORDS)
+    duration_sec = audio["duration_sec"] or max(6.0, previous.get("duration_sec", 0.0))
+    result = compute_scores(script, transcript, word_count, filler_count, gaze,
+                            audio["tremble_count"], duration_sec, mode, prosody=audio["prosody"])
+    result.update({"id": job.get("id"), "mode": mode, "script": script, "transcript": transcript,
+                   "volumes": audio["volumes"], "volume_stats": audio["volume_stats"], "per_minute": audio["per_minute"],
+                   "prosody": audio["prosody"], "created": previous.get("created", time.time())})
+    if previous:
+        result["previous_total_score"] = previous.get("total_score")
+
+    # AI 코칭 리포트 (규칙 기반 부분은 AI 없이도 생성)
+    if options["report"]:
+        from analysis_manager import AnalysisManager
+        manager = _worker.get("manager")
+        if manager is None:
+            manager = _worker["manager"] = AnalysisManager(app_config.STOPWORDS, app_config.COACHING_CONFIG)
+        t = time.perf_counter()
+        result["report"], _ = manager.build_feedback_report(
+            _worker.get("text_model"), mode, script, result["spm"], transcript, audio["volume_stats"], audio["prosody"])
+        timings["report_sec"] = time.perf_counter() - t
+
+    timings["total_sec"] = time.perf_counter() - t0
+    result["timings"] = timings
+    return result
+
+def jobs_from_archive(root_dir):
+    """보관된 세션 폴더(sessions/)에서 작업 목록 생성"""
+    archive = SessionArchive(root_dir, max_bytes=0, max_age_days=0)
+    jobs = []
+    for entry in archive.list_sessions():
+        session_id = entry["id"]
+        try: previous = archive.load_result(session_id)
+        except (OSError, ValueError): continue
+        video = archive.path(session_id, VIDEO_FILE)
+        jobs.append({"id": session_id, "script": previous.get("script", ""), "mode": previous.get("mode"),
+                     "audio": archive.audio_path(session_id), "video": video if os.path.exists(video) else None,
+                     "previous": previous})
+    return jobs
+
+def rescore_archive(jobs, out_dir):
+    """보관된 결과의 집계값만으로 새 채점 기준을 일괄 적용 (scoring.score_batch 한 번)"""
+    previous = [job["previous"] for job in jobs]
+    summary = {"sessions": [], "failed": []}
+    for job, old, scores in zip(jobs, previous, rescore_results(previous)):
+        result = dict(old, **scores)
+        result.update({"id": job["id"], "previous_total_score": old.get("total_score")})
+        path = os.path.join(out_dir, f"{job['id']}.json")
+        with open(path, "w", encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        summary["sessions"].append({"id": job["id"], "mode": result.get("mode"), "total_score": result["total_score"],
+                                    "previous_total_score": result["previous_total_score"], "report_file": path})
+    return summary
+
+def load_jobs(args):
+    if args.archive: return jobs_from_archive(args.archive)
+    if args.jobs:
+        with open(args.jobs, "r", encoding='utf-8') as f:
+            jobs = json.load(f)
+        for i, job in enumerate(jobs):
+            job.setdefault("id", f"job{i + 1:04d}")
+        return jobs
+    if not (args.script and (args.audio or args.video)):
+        return []
+    return [{"id": args.id or os.path.splitext(os.path.basename(args.audio or args.video))[0],
+             "script_file": args.script, "audio": args.audio, "video": args.video, "mode": args.mode}]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="녹화된 발표 세션 일괄 분석 (화면 없이 실행)")
+    parser.add_argument("--script", help="대본 텍스트 파일 (세션 하나)")
+    parser.add_argument("--audio", help="녹음 파일 (wav/flac)")
+    parser.add_argument("--video", help="녹화 영상 (avi)")
+    parser.add_argument("--mode", default="📘 정보 전달형", help="발표 유형 (정보/설득/공감)")
+    parser.add_argument("--id", help="리포트 파일 이름 (기본: 음성/영상 파일 이름)")
+    parser.add_argument("--jobs", help="여러 세션 작업 목록 JSON")
+    parser.add_argument("--archive", help="보관된 세션 폴더 (예: sessions) 전체 재채점")
+    parser.add_argument("--out", default="batch_reports", help="리포트 저장 폴더")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--whisper-size", default="small")
+    parser.add_argument("--no-transcribe", action="store_true", help="Whisper 전사 생략 (저장된 전사 사용)")
+    parser.add_argument("--no-gaze", action="store_true", help="영상 시선 재분석 생략 (저장된 지표 사용)")
+    parser.add_argument("--no-report", action="store_true", help="코칭 리포트 생략 (점수만 계산)")
+    parser.add_argument("--ai", action="store_true", help="AI 코칭 리포트 포함 (LLM 호출)")
+    parser.add_argument("--rescore", action="store_true", help="--archive의 저장된 집계값으로 점수만 다시 계산")
+    args = parser.parse_args(argv)
+
+    jobs = load_jobs(args)
+    if not jobs:
+        parser.error("--script와 --audio/--video, 또는 --jobs, --archive 중 하나가 필요합니다.")
+
+    options = {"transcribe": not args.no_transcribe, "gaze": not args.no_gaze, "report": not args.no_report,
+               "ai": args.ai and not args.no_report, "workers": args.workers, "whisper_size": args.whisper_size}
+    os.makedirs(args.out, exist_ok=True)
+    start = time.perf_counter()
+    if args.rescore:
+        if not args.archive: parser.error("--rescore는 --archive와 함께 사용합니다.")
+        summary = rescore_archive(jobs, args.out)
+        return _write_summary(summary, start, args.out)
+
+    workers = max(1, min(args.workers, len(jobs)))
+    print(f"🗂️ 세션 {len(jobs)}개 분석 시작 (프로세스 {workers}개)")
+    summary = {"sessions": [], "failed": []}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as pool:
+        futures = {pool.submit(analyze_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ {job.get('id')}: {e}")
+                summary["failed"].append({"id": job.get("id"), "error": str(e)})
+                continue
+            path = os.path.join(args.out, f"{result['id']}.json")
+            with open(path, "w", encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            summary["sessions"].append({"id": result["id"], "mode": result["mode"], "total_score": result["total_score"],
+                                        "previous_total_score": result.get("previous_total_score"), "report_file": path})
+            print(f"✅ {result['id']}: {result['total_score']}점 ({result['timings']['total_sec']:.1f}초)")
+
+    return _write_summary(summary, start, args.out)
+
+def _write_summary(summary, start, out_dir):
+    summary["sessions"].sort(key=lambda s: str(s["id"]))
+    summary["wall_sec"] = time.perf_counter() - start
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    print(f"📄 완료: 성공 {len(summary['sessions'])}개, 실패 {len(summary['failed'])}개 ({summary['wall_sec']:.1f}초) -> {out_dir}")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
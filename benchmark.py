@@ -0,0 +1,281 @@
+"""주요 계산 경로 벤치마크 (합성 한국어 대본/음성/프레임, 결과는 JSON)
+
+측정 대상: AnalysisManager 텍스트 분석, 전달률(difflib), IMRAD/동적 질문 규칙, 실시간 음성 구간 처리,
+시선 판정(랜드마크 기하 계산 / FaceMesh), 억양/쉼 분석(YIN), 점수 계산, Whisper 모델 크기별 전사.
+설치되지 않은 구성요소(vosk, mediapipe, faster_whisper)는 건너뛰고 결과에 이유를 남깁니다.
+
+예)
+  python benchmark.py --json bench_v2.json
+  python benchmark.py --quick --compare bench_v1.json     # 이전 결과와 비교 (느려진 항목 표시)
+  python benchmark.py --only text,audio --whisper tiny,base
+"""
+import os
+import sys
+import json
+import time
+import wave
+import tempfile
+import random
+import argparse
+import platform
+import contextlib
+import statistics
+import numpy as np
+
+import app_config
+from analysis_manager import AnalysisManager
+from question_generator import IMRADValidator, DynamicQuestionGenerator
+from recording_session import RecordingSession
+from session_analysis import SpeechChunkAnalyzer, classify_gaze, AUDIO_RATE, AUDIO_CHUNK
+from scoring import match_ratio, compute_scores, score_batch, stack_features
+from prosody import analyze_prosody
+
+BENCH_VERSION = 1
+REGRESSION_RATIO = 1.2 # 이전 결과보다 20% 이상 느리면 회귀로 표시
+
+# 합성 대본 재료 (IMRAD 구간 키워드 + 필러 + 종결어미가 고르게 섞이도록)
+SECTIONS = {
+    "서론": ["오늘은", "연구", "배경과", "목적을", "소개하겠습니다", "문제를", "제기합니다"],
+    "방법": ["실험", "방법으로", "데이터를", "수집하고", "분석", "모델을", "설계했습니다"],
+    "결과": ["결과", "정확도가", "향상되었고", "수치는", "퍼센트", "증가했습니다", "나타났습니다"],
+    "논의": ["의미는", "한계와", "향후", "계획을", "말씀드리면", "기대됩니다", "결론적으로"],
+}
+FILLERS = ["어", "음", "그", "뭐", "이제"]
+ENDINGS = ["입니다.", "습니다.", "해요.", "이죠.", "인데요."]
+
+def make_script(n_chars, seed=0):
+    """n_chars 글자 안팎의 합성 한국어 발표 대본 (문단 = IMRAD 구간)"""
+    rng = random.Random(seed)
+    paragraphs, length = [], 0
+    names = list(SECTIONS)
+    while length < n_chars:
+        words = SECTIONS[names[len(paragraphs) % len(names)]]
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(5, 10))) + " " + rng.choice(ENDINGS)
+        paragraphs.append(sentence)
+        length += len(sentence)
+    return "\n\n".join(paragraphs)
+
+def make_transcript(script, seed=0, drop=0.15, filler=0.05):
+    """대본에서 단어 일부를 빠뜨리고 필러를 섞은 가짜 전사"""
+    rng = random.Random(seed)
+    words = []
+    for w in script.split():
+        if rng.random() < drop: continue
+        if rng.random() < filler: words.append(rng.choice(FILLERS))
+        words.append(w)
+    return " ".join(words)
+
+def make_audio(seconds, seed=0):
+    """말하기/쉬기 구간이 번갈아 나오는 16kHz 16bit 합성 음성 (기본 주파수 120~220Hz)"""
+    rng = np.random.RandomState(seed)
+    t = np.arange(int(seconds * AUDIO_RATE)) / AUDIO_RATE
+    f0 = 170 + 50 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / AUDIO_RATE
+    envelope = np.where((t % 2.5) < 1.8, 6000.0, 200.0)
+    signal = envelope * (np.sin(phase) + 0.3 * np.sin(2 * phase)) + rng.normal(0, 150, len(t))
+    return np.clip(signal, -32768, 32767).astype(np.int16).tobytes()
+
+class _Landmark:
+    __slots__ = ("x", "y")
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+def make_landmarks(n_faces, seed=0):
+    """FaceMesh 결과를 흉내 낸 랜드마크 목록 (눈 위/아래/눈동자 좌표만 의미 있음)"""
+    rng = random.Random(seed)
+    faces = []
+    for _ in range(n_faces):
+        points = [_Landmark(0.5, 0.5) for _ in range(478)]
+        for top, bottom, iris in ((159, 145, 468), (386, 374, 473)):
+            y = rng.uniform(0.35, 0.45)
+            points[top] = _Landmark(0.4, y)
+            points[bottom] = _Landmark(0.4, y + 0.03)
+            points[iris] = _Landmark(0.4, y + rng.uniform(0.005, 0.025))
+        faces.append(points)
+    return faces
+
+def measure(fn, repeat=5, warmup=1, min_time=0.05):
+    """fn을 반복 실행해 1회 소요 시간 통계(ms) 반환 (짧은 작업은 min_time을 채울 만큼 묶어서 측정)
+
+    측정 대상의 디버깅용 print는 버림 (콘솔 출력 시간이 결과에 섞이지 않게)
+    """
+    with open(os.devnull, "w", encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(warmup): fn()
+        t = time.perf_counter(); fn(); once = time.perf_counter() - t
+        inner = max(1, int(min_time / once)) if once > 0 else 1000
+        samples = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            for _ in range(inner): fn()
+            samples.append((time.perf_counter() - t) / inner * 1000)
+    return {"ms_median": statistics.median(samples), "ms_min": min(samples), "ms_max": max(samples),
+            "repeat": repeat, "inner": inner}
+
+# --- 벤치마크 묶음 (각 함수는 {이름: 결과} 반환) ---
+def bench_text(sizes, repeat):
+    manager = AnalysisManager(app_config.STOPWORDS, app_config.COACHING_CONFIG)
+    imrad, dynamic = IMRADValidator(None), DynamicQuestionGenerator(None)
+    results = {}
+    for n in sizes:
+        script = make_script(n, seed=n)
+        transcript = make_transcript(script, seed=n)
+        cases = {
+            "keywords_local": lambda: manager.extract_keywords_from_script(script, False, None),
+            "smart_match_info": lambda: manager.calculate_smart_match(script, transcript, "📘 정보 전달형"),
+            "smart_match_other": lambda: manager.calculate_smart_match(script, transcript, "🔥 설득/동기부여형"),
+            "speech_style": lambda: manager.analyze_speech_style(transcript, "논리적"),
+            "match_rate_difflib": lambda: match_ratio(script, transcript),
+            "imrad_validate": lambda: imrad.validate_imrad_sections(script),
+            "imrad_rule_questions": lambda: imrad.get_rule_based_imrad_questions(script),
+            "dynamic_rule_questions": lambda: dynamic.get_rule_based_dynamic_questions(script, "B"),
+        }
+        for name, fn in cases.items():
+            results[f"text.{name}[{n}ch]"] = measure(fn, repeat)
+    return results
+
+def bench_audio(durations, repeat, vosk_model_dir=None):
+    results = {}
+    recognizer_cls = model = None
+    if vosk_model_dir:
+        try:
+            from vosk import Model, KaldiRecognizer
+            model, recognizer_cls = Model(vosk_model_dir), KaldiRecognizer
+        except Exception as e:
+            results["audio.vosk"] = {"skipped": f"vosk 사용 불가: {e}"}
+    for seconds in durations:
+        pcm = make_audio(seconds, seed=seconds)
+        chunks = [pcm[i:i + AUDIO_CHUNK * 2] for i in range(0, len(pcm), AUDIO_CHUNK * 2)]
+
+        def run(recognizer=None, sensitivity=1.0):
+            session = RecordingSession(None, "", "")
+            session.start()
+            analyzer = SpeechChunkAnalyzer(session, recognizer, app_config.FILLER_WORDS, sensitivity)
+            for chunk in chunks: analyzer.process(chunk)
+            analyzer.finish()
+
+        stats = measure(run, repeat)
+        stats["ms_per_chunk"] = stats["ms_median"] / len(chunks)
+        results[f"audio.chunk_rms[{seconds}s]"] = stats
+        stats = measure(lambda: run(sensitivity=5.0), repeat) # 마이크 입력과 같은 증폭 포함
+        stats["ms_per_chunk"] = stats["ms_median"] / len(chunks)
+        results[f"audio.chunk_rms_gain[{seconds}s]"] = stats
+        stats = measure(lambda: analyze_prosody(pcm), max(1, repeat // 2), warmup=0)
+        stats["realtime_factor"] = seconds * 1000 / stats["ms_median"]
+        results[f"audio.prosody[{seconds}s]"] = stats
+        if model is not None:
+            stats = measure(lambda: run(recognizer_cls(model, AUDIO_RATE)), max(1, repeat // 2), warmup=0)
+            stats["realtime_factor"] = seconds * 1000 / stats["ms_median"]
+            results[f"audio.chunk_vosk[{seconds}s]"] = stats
+    return results
+
+def bench_gaze(n_frames, repeat, use_face_mesh=True):
+    results = {}
+    faces = make_landmarks(n_frames)
+    stats = measure(lambda: [classify_gaze(points, 640, 360) for points in faces], repeat)
+    stats["us_per_frame"] = stats["ms_median"] * 1000 / n_frames
+    results[f"gaze.classify[{n_frames}f]"] = stats
+    if use_face_mesh:
+        try:
+            from session_analysis import create_face_mesh, analyze_frame_gaze
+            face_mesh = create_face_mesh()
+            rng = np.random.RandomState(0)
+            frames = [rng.randint(0, 255, (360, 640, 3), dtype=np.uint8) for _ in range(min(n_frames, 30))]
+            stats = measure(lambda: [analyze_frame_gaze(f, face_mesh) for f in frames], repeat, min_time=0)
+            stats["ms_per_frame"] = stats["ms_median"] / len(frames)
+            results["gaze.face_mesh[640x360]"] = stats
+        except Exception as e:
+            results["gaze.face_mesh[640x360]"] = {"skipped": f"mediapipe 사용 불가: {e}"}
+    return results
+
+def bench_scoring(n_sessions, repeat):
+    rng = random.Random(0)
+    sessions = [{"word_count": rng.randint(0, 3000), "duration_sec": rng.uniform(30, 900),
+                 "total_frames": 1000, "looking_frames": rng.randint(0, 800), "script_frames": rng.randint(0, 200),
+                 "match_ratio": rng.random(), "filler_count": rng.randint(0, 30), "tremble_count": rng.randint(0, 50),
+                 "mode": rng.choice(["정보", "설득", "공감"])} for _ in range(n_sessions)]
+    arrays = stack_features(sessions)
+    script = make_script(1000); transcript = make_transcript(script)
+    gaze = {"total_frames": 1000, "looking_frames": 700, "script_frames": 100}
+    return {
+        "scoring.single_session": measure(lambda: compute_scores(script, transcript, 900, 3, gaze, 4, 180, "정보"), repeat),
+        f"scoring.batch[{n_sessions}]": measure(lambda: score_batch(arrays), repeat),
+    }
+
+def bench_whisper(sizes, seconds, repeat):
+    results = {}
+    try:
+        from session_analysis import create_whisper_model, transcribe
+    except Exception as e:
+        return {"whisper": {"skipped": str(e)}}
+    path = os.path.join(tempfile.gettempdir(), f"bench_whisper_{seconds}s.wav")
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1); wf.setsampwidth(2); wf.setframerate(AUDIO_RATE)
+        wf.writeframes(make_audio(seconds))
+    for size in sizes:
+        try:
+            t = time.perf_counter()
+            model = create_whisper_model(size)
+            load_ms = (time.perf_counter() - t) * 1000
+        except Exception as e:
+            results[f"whisper.{size}"] = {"skipped": f"faster_whisper 사용 불가: {e}"}
+            continue
+        stats = measure(lambda: transcribe(model, path), repeat, warmup=0, min_time=0)
+        stats.update({"load_ms": load_ms, "realtime_factor": seconds * 1000 / stats["ms_median"]})
+        results[f"whisper.{size}[{seconds}s]"] = stats
+    return results
+
+def compare(current, baseline, ratio=REGRESSION_RATIO):
+    """이전 결과와 중앙값 비교 -> {이름: {"before", "after", "ratio", "regressed"}}"""
+    diff = {}
+    for name, stats in current.items():
+        before = baseline.get(name, {}).get("ms_median")
+        if before is None or "ms_median" not in stats: continue
+        r = stats["ms_median"] / before if before > 0 else None
+        diff[name] = {"before": before, "after": stats["ms_median"], "ratio": r, "regressed": bool(r and r > ratio)}
+    return diff
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="주요 계산 경로 벤치마크")
+    parser.add_argument("--only", default="text,audio,gaze,scoring,whisper", help="실행할 묶음 (쉼표 구분)")
+    parser.add_argument("--quick", action="store_true", help="작은 입력/적은 반복 (빠른 확인용)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--whisper", default="tiny,base,small", help="측정할 Whisper 모델 크기")
+    parser.add_argument("--vosk-model", default=None, help="Vosk 모델 폴더 (지정 시 인식 포함 측정)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    only = set(args.only.split(","))
+    repeat = 3 if args.quick else args.repeat
+    text_sizes = (500, 2000) if args.quick else (500, 2000, 8000)
+    audio_secs = (10,) if args.quick else (10, 60, 300)
+
+    started = time.perf_counter()
+    results = {}
+    if "text" in only: results.update(bench_text(text_sizes, repeat))
+    if "audio" in only: results.update(bench_audio(audio_secs, repeat, args.vosk_model))
+    if "gaze" in only: results.update(bench_gaze(200 if args.quick else 2000, repeat))
+    if "scoring" in only: results.update(bench_scoring(1000 if args.quick else 10000, repeat))
+    if "whisper" in only: results.update(bench_whisper(args.whisper.split(","), 10 if args.quick else 30, 1))
+
+    for name, stats in results.items():
+        if "skipped" in stats: print(f"  {name:<42} 건너뜀 ({stats['skipped']})")
+        else: print(f"  {name:<42} {stats['ms_median']:10.3f} ms")
+
+    report = {"version": BENCH_VERSION, "created": time.time(), "wall_sec": time.perf_counter() - started,
+              "platform": {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system(),
+                           "numpy": np.__version__},
+              "results": results}
+    if args.compare:
+        with open(args.compare, "r", encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+        report["compare"] = compare(results, baseline)
+        regressed = [name for name, d in report["compare"].items() if d["regressed"]]
+        print(f"📉 회귀 {len(regressed)}개: " + (", ".join(regressed) if regressed else "없음"))
+    if args.json:
+        with open(args.json, "w", encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""마이크/카메라 입력 추상화 (실제 장치 + 파일/합성 재생)
+
+- 오디오 소스: open() 후 read()가 16bit 모노 PCM 구간(CHUNK)을 돌려줌
+  (아직 준비 안 됨 -> b"", 끝 -> None). sensitivity는 실시간 분석 전 곱할 증폭 배율.
+- 비디오 소스: cv2.VideoCapture와 같은 isOpened()/read()/release()를 제공해 App.cap에 그대로 넣을 수 있음.
+  mirror가 True면 화면 표시 전에 좌우 반전 (카메라만 해당, 녹화 파일은 이미 반전되어 저장됨).
+- 파일 소스는 realtime=False면 기다리지 않고 CPU가 허용하는 만큼 빠르게 재생하며,
+  ReplayClock(가상 시계)을 읽은 길이만큼만 진행시켜 속도 마커/경과 시간이 실제 재생과 같게 계산됩니다.
+"""
+import time
+import numpy as np
+
+import tracing
+from session_analysis import AUDIO_RATE, AUDIO_CHUNK, read_pcm
+
+MIC_SENSITIVITY = 5.0 # 마이크 입력 증폭 배율 (녹음 파일에는 증폭된 값이 저장되므로 재생 시에는 1.0)
+
+class ReplayClock:
+    """재생용 가상 시계 (time.time 대신 RecordingSession/SpeechChunkAnalyzer에 넘김)"""
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, sec):
+        self.now += sec
+
+# --- 오디오 ---
+class MicrophoneSource:
+    """PyAudio 마이크 입력"""
+    sensitivity = MIC_SENSITIVITY
+
+    def __init__(self, pa, rate=AUDIO_RATE, chunk=AUDIO_CHUNK):
+        self.pa = pa
+        self.rate = rate
+        self.chunk = chunk
+        self.stream = None
+        self.overruns = 0 # 처리가 밀려 버퍼에 2구간 이상 쌓인 횟수 (계속되면 입력이 버려짐)
+
+    def open(self):
+        import pyaudio
+        self.stream = self.pa.open(format=pyaudio.paInt16, channels=1, rate=self.rate, input=True, frames_per_buffer=self.chunk)
+        return self
+
+    def read(self):
+        available = self.stream.get_read_available()
+        if available < self.chunk: return b""
+        if available >= self.chunk * 2:
+            self.overruns += 1
+            tracing.counter("audio_overruns", self.overruns)
+        tracing.counter("audio_backlog", available)
+        return self.stream.read(self.chunk, exception_on_overflow=False)
+
+    def close(self):
+        if self.stream is None: return
+        self.stream.stop_stream()
+        self.stream.close()
+        self.stream = None
+
+class WavFileSource:
+    """녹음 파일(WAV/FLAC) 재생. 샘플레이트가 다르면 16kHz로 변환"""
+    sensitivity = 1.0
+
+    def __init__(self, path, rate=AUDIO_RATE, chunk=AUDIO_CHUNK, realtime=False, clock=None):
+        self.path = path
+        self.rate = rate
+        self.chunk = chunk
+        self.realtime = realtime
+        self.clock = clock
+        self.pcm = b""
+        self.pos = 0
+        self.wall_start = None
+
+    def open(self):
+        pcm, rate = read_pcm(self.path)
+        if rate != self.rate:
+            samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float64)
+            n = int(len(samples) * self.rate / rate)
+            pcm = np.interp(np.linspace(0, len(samples) - 1, n), np.arange(len(samples)), samples).astype(np.int16).tobytes()
+        self.pcm = pcm
+        self.pos = 0
+        self.wall_start = time.perf_counter()
+        return self
+
+    @property
+    def duration_sec(self):
+        return len(self.pcm) / 2 / self.rate
+
+    @property
+    def position_sec(self):
+        return self.pos / 2 / self.rate
+
+    def read(self):
+        if self.pos >= len(self.pcm): return None
+        # 실시간 재생이면 마이크처럼 구간 길이만큼 기다렸다가 내보냄
+        if self.realtime and time.perf_counter() - self.wall_start < self.position_sec + self.chunk / self.rate: return b""
+        data = self.pcm[self.pos:self.pos + self.chunk * 2]
+        self.pos += len(data)
+        if self.clock is not None: self.clock.advance(len(data) / 2 / self.rate)
+        return data
+
+    def close(self):
+        self.pcm = b""
+
+# --- 비디오 ---
+class CameraSource:
+    """웹캠 입력 (exe 환경에서 안정적인 DSHOW -> 일반 모드 -> -1번 장치 순서로 시도)"""
+    mirror = True
+
+    def __init__(self, width=640, height=360):
+        import cv2
+        # 1단계: exe 환경에서 가장 안정적인 DSHOW 모드 시도
+        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        # 2단계: DSHOW가 실패했거나 카메라가 안 열리면 일반 모드로 재시도
+        if self.cap is None or not self.cap.isOpened():
+            print("⚠️ DSHOW 모드 실패, 일반 모드로 재시도합니다.")
+            if self.cap: self.cap.release()
+            self.cap = cv2.VideoCapture(0) # 일반 모드
+        # 3단계: 그래도 안 되면 -1번 장치 시도 (일부 노트북용)
+        if self.cap is None or not self.cap.isOpened():
+            self.cap = cv2.VideoCapture(-1)
+        if self.cap.isOpened():
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+class VideoFileSource:
+    """녹화 영상(avi) 재생 (loop=True면 끝나면 처음부터 다시)"""
+    mirror = False
+
+    def __init__(self, path, loop=False, clock=None, fps=None):
+        import cv2
+        self.cap = cv2.VideoCapture(path)
+        self.loop = loop
+        self.clock = clock
+        self.fps = fps or self.cap.get(cv2.CAP_PROP_FPS) or 20.0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        import cv2
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if ret and self.clock is not None: self.clock.advance(1.0 / self.fps)
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+class SyntheticVideoSource:
+    """카메라 없는 환경용 합성 프레임 (seed가 같으면 같은 프레임 순서)"""
+    mirror = False
+
+    def __init__(self, n_frames=None, width=640, height=360, fps=20.0, seed=0, clock=None):
+        self.n_frames = n_frames
+        self.size = (height, width, 3)
+        self.fps = fps
+        self.clock = clock
+        self.rng = np.random.RandomState(seed)
+        self.index = 0
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+        if not self.opened or (self.n_frames is not None and self.index >= self.n_frames): return False, None
+        self.index += 1
+        # 배경(어두운 회색) + 약한 노이즈
+        frame = np.full(self.size, 60, dtype=np.uint8)
+        frame += self.rng.randint(0, 16, self.size, dtype=np.uint8)
+        if self.clock is not None: self.clock.advance(1.0 / self.fps)
+        return True, frame
+
+    def release(self):
+        self.opened = False
@@ -0,0 +1,119 @@
+import re
+import os
+import json
+import math
+import hashlib
+from collections import Counter
+
+# 명사 뒤에 붙는 대표 조사/어미 (긴 것부터 매칭되도록 정렬해서 사용)
+JOSA_SUFFIXES = [
+    '에서는', '에게서', '으로는', '으로서', '으로써', '이라는', '입니다',
+    '에서', '에게', '으로', '부터', '까지', '처럼', '보다', '이나', '라는', '이다',
+    '은', '는', '을', '를', '의', '에', '와', '로', '만'
+]
+# 명사의 끝 글자와 겹치는 조사 ('결과', '정확도', '제도'). 떼어낸 어간이 코퍼스에 이미 있을 때만 제거
+AMBIGUOUS_JOSA = ('도', '과')
+MAX_DOC_HASHES = 5000 # 중복 방지용 대본 해시 보관 개수 (넘으면 오래된 것부터 버림)
+
+class LocalKeywordExtractor:
+    """API 호출 없이 TF-IDF로 핵심 키워드를 뽑는 로컬 추출기
+
+    - 불용어 접두사/조사 패턴은 생성 시 한 번만 정규식으로 컴파일합니다.
+    - IDF는 사용자가 과거에 연습한 대본들(corpus_file)을 기준으로 계산합니다.
+    - '도'/'과'처럼 명사 끝 글자와 같은 조사는 떼어낸 어간이 코퍼스 어휘에 있을 때만 제거합니다.
+    """
+    def __init__(self, stopwords, corpus_file=None):
+        self.STOPWORDS = set(stopwords)
+        self.corpus_file = corpus_file
+
+        self._token_re = re.compile(r'[가-힣a-zA-Z]{2,}')
+        # 기존 로직(w.startswith(sw) for sw in STOPWORDS if len(sw) > 1)을 단일 정규식으로 대체
+        prefixes = sorted((sw for sw in self.STOPWORDS if len(sw) > 1), key=len, reverse=True)
+        self._stop_prefix_re = re.compile('|'.join(map(re.escape, prefixes))) if prefixes else None
+        # 어간은 최소 2글자를 남기고, 가장 긴 조사부터 떼어냄
+        josa = sorted(JOSA_SUFFIXES, key=len, reverse=True)
+        self._josa_re = re.compile(r'(.{2,}?)(?:' + '|'.join(map(re.escape, josa)) + r')')
+
+        # 과거 대본 코퍼스 (문서 수, 단어별 문서 빈도, 중복 방지용 해시)
+        self.doc_count = 0
+        self.doc_freq = Counter()
+        self.doc_hashes = {} # 해시 -> None (추가 순서 유지, MAX_DOC_HASHES개까지)
+        self.load_corpus()
+
+    def load_corpus(self):
+        if not self.corpus_file or not os.path.exists(self.corpus_file): return
+        try:
+            with open(self.corpus_file, "r", encoding='utf-8') as f:
+                data = json.load(f)
+            self.doc_count = int(data.get("doc_count", 0))
+            self.doc_freq = Counter(data.get("doc_freq", {}))
+            self.doc_hashes = dict.fromkeys(data.get("doc_hashes", [])[-MAX_DOC_HASHES:])
+        except Exception as e:
+            print(f"키워드 코퍼스 로드 실패: {e}")
+
+    def save_corpus(self):
+        if not self.corpus_file: return
+        data = {
+            "doc_count": self.doc_count,
+            "doc_freq": dict(self.doc_freq),
+            "doc_hashes": list(self.doc_hashes)
+        }
+        try:
+            tmp_path = self.corpus_file + ".tmp"
+            with open(tmp_path, "w", encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.corpus_file)
+        except Exception as e:
+            print(f"키워드 코퍼스 저장 실패: {e}")
+
+    def tokenize(self, script):
+        """대본을 불용어/조사가 제거된 명사 후보 리스트로 변환"""
+        terms = []
+        for w in self._token_re.findall(script):
+            if w in self.STOPWORDS: continue
+            if self._stop_prefix_re and self._stop_prefix_re.match(w): continue
+            m = self._josa_re.fullmatch(w)
+            if m: w = m.group(1)
+            elif len(w) >= 3 and w.endswith(AMBIGUOUS_JOSA) and w[:-1] in self.doc_freq:
+                w = w[:-1]
+            if w in self.STOPWORDS: continue
+            terms.append(w)
+        return terms
+
+    def add_document(self, script, terms=None):
+        """대본을 코퍼스에 추가 (같은 대본은 한 번만 집계)"""
+        doc_hash = hashlib.sha1(script.encode('utf-8')).hexdigest()
+        if doc_hash in self.doc_hashes: return False
+        if terms is None: terms = self.tokenize(script)
+        self.doc_hashes[doc_hash] = None
+        while len(self.doc_hashes) > MAX_DOC_HASHES:
+            del self.doc_hashes[next(iter(self.doc_hashes))]
+        self.doc_count += 1
+        self.doc_freq.update(set(terms))
+        self.save_corpus()
+        return True
+
+    def extract(self, script, top_k, learn=True):
+        """TF-IDF 상위 top_k개 키워드 반환 (동점이면 먼저 등장한 단어 우선)"""
+        terms = self.tokenize(script)
+        if not terms: return []
+
+        doc_hash = hashlib.sha1(script.encode('utf-8')).hexdigest()
+        # 현재 대본이 이미 코퍼스에 있으면 IDF 계산에서 자기 자신을 제외
+        in_corpus = doc_hash in self.doc_hashes
+        n_docs = self.doc_count - (1 if in_corpus else 0)
+
+        tf = Counter(terms)
+        first_seen = {}
+        for i, t in enumerate(terms): first_seen.setdefault(t, i)
+
+        def score(term):
+            df = self.doc_freq.get(term, 0) - (1 if in_corpus else 0)
+            idf = math.log((1 + n_docs) / (1 + max(0, df))) + 1
+            return tf[term] * idf
+
+        ranked = sorted(tf, key=lambda t: (-score(t), first_seen[t]))
+
+        if learn and not in_corpus:
+            self.add_document(script, terms)
+        return ranked[:top_k]
@@ -0,0 +1,139 @@
+import threading
+import tkinter as tk
+from collections import deque
+
+HUD_REFRESH_MS = 100 # 화면 갱신 주기 (10Hz)
+SPM_WINDOW_SEC = 15.0 # 순간 속도(SPM) 계산 구간
+GAZE_WINDOW_SEC = 5.0 # 시선 비율 계산 구간
+VOLUME_SMOOTHING = 0.3 # 볼륨 미터 지수 평활 계수 (클수록 빠르게 반응)
+VOLUME_FULL_SCALE = 8000 # 볼륨 미터가 가득 차는 RMS
+
+class SlidingWindowSum:
+    """최근 window_sec 초 동안의 (시각, 값) 합계와 개수
+
+    값은 시각 순서로만 들어오므로 앞에서부터 만료시키면 되어 add()/total()이 분할 상환 O(1)입니다.
+    """
+    def __init__(self, window_sec):
+        self.window_sec = window_sec
+        self.items = deque()
+        self.sum = 0.0
+
+    def _expire(self, now):
+        limit = now - self.window_sec
+        while self.items and self.items[0][0] < limit:
+            self.sum -= self.items.popleft()[1]
+
+    def add(self, t, value):
+        self.items.append((t, value))
+        self.sum += value
+        self._expire(t)
+
+    def total(self, now):
+        self._expire(now)
+        return self.sum
+
+    def count(self, now):
+        self._expire(now)
+        return len(self.items)
+
+class LiveMetrics:
+    """녹화 중 화면 HUD용 실시간 지표 (음성 스레드/영상 루프가 쓰고, Tk 타이머가 10Hz로 읽음)
+
+    - add_*()는 누적값만 갱신하고 위젯은 건드리지 않으므로 음성 구간마다 UI 호출이 생기지 않습니다.
+    - snapshot()은 version이 바뀌었을 때만 새로 그리면 되도록 변경 번호를 함께 돌려줍니다.
+    - clock은 RecordingSession과 같은 시계 (재생 모드에서는 가상 시계)
+    """
+    def __init__(self, clock, spm_window=SPM_WINDOW_SEC, gaze_window=GAZE_WINDOW_SEC):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.start_time = clock()
+        self.syllables = SlidingWindowSum(spm_window)
+        self.gaze_frames = SlidingWindowSum(gaze_window)
+        self.gaze_front = SlidingWindowSum(gaze_window)
+        self.volume = 0.0
+        self.peak = 0.0
+        self.filler_count = 0
+        self.face_detected = False
+        self.looking_down = False
+        self.version = 0
+
+    def add_volume(self, rms):
+        with self.lock:
+            self.volume += VOLUME_SMOOTHING * (rms - self.volume)
+            self.peak = max(rms, self.peak * 0.95) # 최고점은 천천히 내려옴
+            self.version += 1
+
+    def add_speech(self, syllables, fillers=0):
+        with self.lock:
+            self.syllables.add(self.clock(), syllables)
+            self.filler_count += fillers
+            self.version += 1
+
+    def add_gaze(self, face_detected, looking_down):
+        with self.lock:
+            now = self.clock()
+            self.gaze_frames.add(now, 1)
+            self.gaze_front.add(now, 1 if face_detected and not looking_down else 0)
+            self.face_detected, self.looking_down = face_detected, looking_down
+            self.version += 1
+
+    def snapshot(self):
+        """{"version", "spm", "volume", "peak", "gaze_ratio", "face_detected", "looking_down", "filler_count"}"""
+        with self.lock:
+            now = self.clock()
+            # 녹화 초반에는 지난 시간만큼만 나눠 속도가 낮게 나오지 않게 함
+            span = min(self.syllables.window_sec, max(1.0, now - self.start_time))
+            frames = self.gaze_frames.count(now)
+            return {
+                "version": self.version,
+                "spm": int(self.syllables.total(now) / span * 60),
+                "volume": min(1.0, self.volume / VOLUME_FULL_SCALE),
+                "peak": min(1.0, self.peak / VOLUME_FULL_SCALE),
+                "gaze_ratio": self.gaze_front.total(now) / frames if frames else None,
+                "face_detected": self.face_detected,
+                "looking_down": self.looking_down,
+                "filler_count": self.filler_count,
+            }
+
+class LiveHud(tk.Canvas):
+    """카메라 화면 위에 겹쳐 그리는 실시간 HUD (속도 / 볼륨 미터 / 시선 / 필러워)
+
+    항목(item)은 처음 한 번만 만들고 render()에서는 좌표/글자/색만 바꿉니다.
+    render()는 App의 10Hz 타이머에서만 호출되므로 음성 구간 수와 무관하게 UI 갱신 횟수가 일정합니다.
+    """
+    WIDTH, HEIGHT = 210, 112
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, width=self.WIDTH, height=self.HEIGHT, bg="#1e1e1e", highlightthickness=0, **kwargs)
+        font = ("Arial", 11, "bold")
+        self.spm_text = self.create_text(10, 14, anchor='w', fill="white", font=font, text="속도 -- SPM")
+        self.create_text(10, 40, anchor='w', fill="#bbbbbb", font=("Arial", 10), text="볼륨")
+        self.create_rectangle(50, 33, 200, 47, outline="#555555")
+        self.volume_bar = self.create_rectangle(51, 34, 51, 46, outline="", fill="#4caf50")
+        self.peak_line = self.create_line(51, 32, 51, 48, fill="white")
+        self.gaze_dot = self.create_oval(10, 60, 24, 74, outline="", fill="#777777")
+        self.gaze_text = self.create_text(32, 67, anchor='w', fill="white", font=("Arial", 10), text="시선 대기 중")
+        self.filler_text = self.create_text(10, 94, anchor='w', fill="white", font=("Arial", 10), text="필러워 0회")
+        self.last_version = None
+
+    def render(self, snap):
+        if snap["version"] == self.last_version: return # 바뀐 게 없으면 그리지 않음
+        self.last_version = snap["version"]
+
+        spm = snap["spm"]
+        color = "#ffb300" if spm > 420 else "#64b5f6" if 0 < spm < 280 else "white"
+        self.itemconfigure(self.spm_text, text=f"속도 {spm} SPM", fill=color)
+
+        x = 51 + int(148 * snap["volume"])
+        self.coords(self.volume_bar, 51, 34, x, 46)
+        self.itemconfigure(self.volume_bar, fill="#e53935" if snap["volume"] > 0.9 else "#4caf50")
+        px = 51 + int(148 * snap["peak"])
+        self.coords(self.peak_line, px, 32, px, 48)
+
+        if not snap["face_detected"]: dot, label = "#777777", "얼굴 인식 안 됨"
+        elif snap["looking_down"]: dot, label = "#e53935", "대본 보는 중"
+        else: dot, label = "#4caf50", "정면 응시"
+        if snap["gaze_ratio"] is not None: label += f" ({int(snap['gaze_ratio'] * 100)}%)"
+        self.itemconfigure(self.gaze_dot, fill=dot)
+        self.itemconfigure(self.gaze_text, text=label)
+        self.itemconfigure(self.filler_text, text=f"필러워 {snap['filler_count']}회")
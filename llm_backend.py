@@ -0,0 +1,117 @@
+import json
+import time
+import random
+import threading
+
+from llm_cache import normalize_generation_config
+
+STUB_REPORT = "## 📋 AI 코칭 리포트 (stub)\n**👍 베스트 포인트**\n구조가 명확합니다.\n**💡 총평**\n잘하셨습니다."
+
+class LLMResponse:
+    """백엔드 공통 응답 객체 (Gemini 응답처럼 .text로 접근)"""
+    def __init__(self, text):
+        self.text = text
+
+class RateLimitExceeded(Exception):
+    """429 (요청 한도 초과) - LLMScheduler가 백오프 후 재시도하는 오류"""
+    code = 429
+
+class LLMProvider:
+    """모든 LLM 백엔드가 구현하는 공통 인터페이스
+
+    - generate_content(prompt, generation_config=None): 응답 객체(.text) 반환
+    - generate_content(..., stream=True): 조각(.text)들의 iterator 반환
+    """
+    model_name = "base"
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        raise NotImplementedError
+
+class GeminiProvider(LLMProvider):
+    """google.generativeai 기반 실제 백엔드 (SDK는 이 클래스에서만 import)"""
+    def __init__(self, api_key, model_name="gemini-2.5-flash"):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        return self.model.generate_content(prompt, generation_config=generation_config, stream=stream, **kwargs)
+
+class LocalStubProvider(LLMProvider):
+    """API 키/네트워크 없이 질문/재작성/리포트 흐름을 테스트하기 위한 가짜 백엔드
+
+    지연 시간(latency_sec ± jitter_sec), 일반 오류 비율(error_rate), 429 비율(rate_limit_rate),
+    스트리밍 조각 크기/간격을 설정할 수 있고, seed를 주면 같은 순서로 재현됩니다.
+    """
+    model_name = "local-stub"
+
+    def __init__(self, latency_sec=0.5, jitter_sec=0.2, error_rate=0.0, rate_limit_rate=0.0,
+                 chunk_chars=20, chunk_delay_sec=0.05, seed=None, responder=None):
+        self.latency_sec = latency_sec
+        self.jitter_sec = jitter_sec
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.chunk_chars = chunk_chars
+        self.chunk_delay_sec = chunk_delay_sec
+        self.responder = responder
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"calls": 0, "errors": 0, "rate_limited": 0}
+
+    def _roll(self):
+        with self.lock:
+            self.stats["calls"] += 1
+            delay = max(0.0, self.latency_sec + self.rng.uniform(-self.jitter_sec, self.jitter_sec))
+            r = self.rng.random()
+            if r < self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return delay, RateLimitExceeded("429 Resource has been exhausted (local stub)")
+            if r < self.rate_limit_rate + self.error_rate:
+                self.stats["errors"] += 1
+                return delay, RuntimeError("500 Internal error (local stub)")
+            return delay, None
+
+    def _default_response(self, prompt, config):
+        if config.get("response_mime_type") == "application/json":
+            return json.dumps({
+                "keywords": ["데이터", "분석", "결과"],
+                "logic_gaps": ["(stub) 결과 해석의 근거가 부족합니다."],
+                "question": "(stub) 이 결과를 뒷받침하는 가장 강력한 근거는 무엇입니까?",
+                "report": STUB_REPORT
+            }, ensure_ascii=False)
+        if "코칭 리포트" in prompt:
+            return STUB_REPORT
+        if "키워드" in prompt:
+            return "데이터, 분석, 결과, 발표, 코칭"
+        marker = next((m for m in ("--- PARAGRAPH", "--- USER SCRIPT ---") if m in prompt), None)
+        if marker:
+            # 재작성 요청은 원문을 그대로 돌려줌 (길이에 비례한 출력)
+            return prompt.rsplit(marker, 1)[1].split("\n", 1)[-1].strip()
+        if "[질문]" in prompt:
+            return "(stub) 그 주장을 수치로 증명할 수 있습니까?"
+        return "(stub) 요약: 핵심 주장과 근거가 제시되었습니다."
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        config = normalize_generation_config(generation_config)
+        delay, error = self._roll()
+        time.sleep(delay)
+        if error is not None: raise error
+        text = self.responder(prompt, config) if self.responder else self._default_response(prompt, config)
+        if not stream: return LLMResponse(text)
+        return self._stream(text)
+
+    def _stream(self, text):
+        for i in range(0, len(text), self.chunk_chars):
+            if i: time.sleep(self.chunk_delay_sec)
+            yield LLMResponse(text[i:i + self.chunk_chars])
+
+def create_provider(llm_config, api_key=None):
+    """LLM_CONFIG['backend'] 값("gemini" / "local")에 맞는 백엔드 생성"""
+    backend = llm_config.get("backend", "gemini")
+    if backend == "local":
+        return LocalStubProvider(**llm_config.get("stub", {}))
+    if backend == "gemini":
+        if not api_key: raise ValueError("Gemini API 키가 필요합니다.")
+        return GeminiProvider(api_key, llm_config["model_name"])
+    raise ValueError(f"알 수 없는 LLM 백엔드: {backend}")
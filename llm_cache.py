@@ -0,0 +1,190 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import dataclasses
+
+class CachedResponse:
+    """캐시에서 꺼낸 응답 (Gemini 응답 객체처럼 .text로 접근)"""
+    def __init__(self, text):
+        self.text = text
+
+def normalize_generation_config(generation_config):
+    """GenerationConfig(dataclass/dict/None)를 캐시 키용 dict로 정규화"""
+    if generation_config is None: return {}
+    if isinstance(generation_config, dict): return generation_config
+    if dataclasses.is_dataclass(generation_config):
+        return {k: v for k, v in dataclasses.asdict(generation_config).items() if v is not None}
+    if hasattr(generation_config, '__dict__'):
+        return {k: v for k, v in vars(generation_config).items() if v is not None}
+    return {"repr": repr(generation_config)}
+
+class LLMResponseCache:
+    """(모델, 프롬프트 해시, 생성 설정) 단위로 LLM 응답을 디스크(SQLite)에 저장하는 LRU 캐시
+
+    - max_bytes를 넘으면 가장 오래 사용되지 않은 응답부터 삭제합니다.
+    - ttl_sec이 지난 응답은 조회 시점에 만료 처리됩니다.
+    """
+    def __init__(self, path, max_bytes=20 * 1024 * 1024, ttl_sec=7 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                text TEXT,
+                size INTEGER,
+                created REAL,
+                last_access REAL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        self.conn.commit()
+        self._purge_expired()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(model_name, prompt, generation_config=None):
+        payload = json.dumps([model_name, prompt, normalize_generation_config(generation_config)],
+                             sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _purge_expired(self):
+        if not self.ttl_sec: return
+        with self.lock:
+            self.conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_sec,))
+            self.conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT text, size, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            text, size, created = row
+            if self.ttl_sec and now - created > self.ttl_sec:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                self.total_bytes -= size
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return text
+
+    def put(self, key, model_name, text):
+        if not text: return
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes: return
+        now = time.time()
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if old: self.total_bytes -= old[0]
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                              (key, model_name, text, size, now, now))
+            self.total_bytes += size
+            self._evict_locked()
+            self.conn.commit()
+
+    def _evict_locked(self):
+        """용량 초과 시 last_access가 가장 오래된 항목부터 삭제 (lock 보유 상태에서 호출)"""
+        while self.total_bytes > self.max_bytes:
+            rows = self.conn.execute("SELECT key, size FROM responses ORDER BY last_access LIMIT 16").fetchall()
+            if not rows: break
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes: break
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.total_bytes -= size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class CachedTextModel:
+    """text_model.generate_content() 호출을 LLMResponseCache로 감싸는 래퍼
+
+    기존 모듈은 그대로 generate_content(prompt, generation_config=...)를 호출하면 되고,
+    같은 프롬프트/설정이면 네트워크 없이 캐시된 응답을 돌려줍니다.
+    매번 달라야 하는 요청(temperature > 0, 돌발 질문 우선순위)은 캐시를 거치지 않습니다.
+    """
+    def __init__(self, model, cache, model_name=None, uncached_priorities=None):
+        self.model = model
+        self.cache = cache
+        self.model_name = model_name or getattr(model, 'model_name', type(model).__name__)
+        if uncached_priorities is None:
+            from llm_scheduler import PRIORITY_QUESTION # llm_scheduler가 이 모듈을 import하므로 여기서 가져옴
+            uncached_priorities = (PRIORITY_QUESTION,)
+        self.uncached_priorities = tuple(uncached_priorities)
+        self.bypassed = 0
+
+    def cacheable(self, generation_config=None, priority=None):
+        """같은 프롬프트에 같은 응답을 돌려줘도 되는 요청인지 (창의적인 질문 생성은 제외)"""
+        if priority is not None and priority in self.uncached_priorities: return False
+        temperature = normalize_generation_config(generation_config).get("temperature")
+        return not (isinstance(temperature, (int, float)) and temperature > 0)
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        if not self.cacheable(generation_config, kwargs.get("priority")):
+            self.bypassed += 1
+            if stream: kwargs['stream'] = True
+            return self.model.generate_content(prompt, generation_config=generation_config, **kwargs)
+        key = self.cache.make_key(self.model_name, prompt, generation_config)
+        text = self.cache.get(key)
+        if text is not None:
+            # 스트리밍 요청이어도 캐시 적중이면 전체 응답을 한 조각으로 바로 돌려줌
+            return iter([CachedResponse(text)]) if stream else CachedResponse(text)
+
+        if stream:
+            inner = self.model.generate_content(prompt, generation_config=generation_config, stream=True, **kwargs)
+            return self._stream_and_store(key, inner)
+
+        response = self.model.generate_content(prompt, generation_config=generation_config, **kwargs)
+        try:
+            text = response.text
+        except Exception:
+            # 안전 필터 등으로 text가 없으면 캐시하지 않고 원본 응답을 그대로 반환
+            return response
+        self.cache.put(key, self.model_name, text)
+        return response
+
+    def _stream_and_store(self, key, stream):
+        """조각을 그대로 흘려보내고, 끝까지 다 받은 경우에만 이어 붙인 전체 응답을 캐시에 저장"""
+        parts = []
+        for chunk in stream:
+            try:
+                parts.append(chunk.text)
+            except Exception:
+                pass
+            yield chunk
+        self.cache.put(key, self.model_name, ''.join(parts))
@@ -0,0 +1,125 @@
+"""가짜 LLM(LocalStubProvider)으로 질문/재작성/리포트 흐름을 오프라인 부하 테스트
+
+예) python llm_loadtest.py --sessions 5 --latency 0.8 --rate-limit-rate 0.1 --rpm 10
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+
+import app_config
+from llm_backend import LocalStubProvider
+from llm_scheduler import LLMScheduler, ScheduledTextModel
+from ai_rewriter import AI_Announcer
+from analysis_manager import AnalysisManager
+from question_generator import IMRADValidator, DynamicQuestionGenerator
+
+SAMPLE_SCRIPT = (
+    "안녕하세요. 오늘은 인공지능 기반 발표 코칭 시스템에 대해 말씀드리겠습니다.\n\n"
+    "기존 연구는 발표자의 음성만 분석했지만, 저희는 시선과 속도를 함께 분석했습니다.\n\n"
+    "실험 결과 연습 횟수와 점수 사이에 상관관계가 나타났습니다.\n\n"
+    "앞으로 더 많은 사용자 데이터로 검증할 계획입니다."
+)
+
+def percentile(values, p):
+    if not values: return 0.0
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[idx]
+
+class LagProbe:
+    """UI 스레드 대용: 16ms마다 깨어나서 얼마나 늦게 깨어났는지 기록 (GIL/스레드 경합 지표)"""
+    def __init__(self, interval=0.016):
+        self.interval = interval
+        self.lags = []
+        self.running = False
+
+    def _loop(self):
+        while self.running:
+            t = time.perf_counter()
+            time.sleep(self.interval)
+            self.lags.append((time.perf_counter() - t - self.interval) * 1000)
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+
+def run_session(idx, text_model, results):
+    script = SAMPLE_SCRIPT + f"\n\n(세션 {idx})"  # 세션마다 다른 프롬프트
+    announcer = AI_Announcer(text_model)
+    imrad = IMRADValidator(text_model)
+    dynamic = DynamicQuestionGenerator(text_model)
+    manager = AnalysisManager(app_config.STOPWORDS, app_config.COACHING_CONFIG)
+
+    def timed(flow, fn):
+        t = time.perf_counter()
+        try:
+            ok = fn() is not None
+        except Exception:
+            ok = False
+        results.append({"flow": flow, "ms": (time.perf_counter() - t) * 1000, "ok": ok})
+
+    def stream_rewrite():
+        t = time.perf_counter(); first = None; parts = []
+        for chunk in announcer.rewrite_stream(script.split("\n\n")[0], "B"):
+            if first is None: first = (time.perf_counter() - t) * 1000
+            parts.append(chunk)
+        results.append({"flow": "rewrite_first_chunk", "ms": first or 0.0, "ok": bool(parts)})
+        return "".join(parts)
+
+    threads = [
+        threading.Thread(target=timed, args=("question_imrad", lambda: imrad._generate_ai_imrad_question(script))),
+        threading.Thread(target=timed, args=("question_vc", lambda: dynamic._generate_ai_dynamic_question(script, "B"))),
+        threading.Thread(target=timed, args=("rewrite_stream", stream_rewrite)),
+        threading.Thread(target=timed, args=("rewrite_incremental", lambda: announcer.rewrite_incremental(script, "A"))),
+    ]
+    for t in threads: t.start()
+    timed("report", lambda: manager.generate_combined_analysis(
+        text_model, script, script, "A", {"spm": 350}, "s", "e", []))
+    for t in threads: t.join()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LLM 흐름 오프라인 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=float, default=app_config.LLM_CONFIG["requests_per_minute"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    provider = LocalStubProvider(args.latency, args.jitter, args.error_rate, args.rate_limit_rate, seed=args.seed)
+    llm_config = app_config.LLM_CONFIG
+    scheduler = LLMScheduler(args.rpm, llm_config["burst"], llm_config["report_reserve"],
+                             llm_config["max_retries"], backoff_base=1.5, max_concurrency=llm_config["max_concurrency"])
+    text_model = ScheduledTextModel(provider, scheduler, provider.model_name)
+
+    probe = LagProbe(); probe.start()
+    results, start = [], time.perf_counter()
+    sessions = [threading.Thread(target=run_session, args=(i, text_model, results)) for i in range(args.sessions)]
+    for t in sessions: t.start()
+    for t in sessions: t.join()
+    probe.stop()
+
+    summary = {"wall_sec": time.perf_counter() - start, "flows": {}, "scheduler": scheduler.get_stats(),
+               "provider": provider.stats,
+               "ui_lag_ms": {"p50": percentile(probe.lags, 50), "p95": percentile(probe.lags, 95), "max": max(probe.lags, default=0.0)}}
+    for flow in sorted({r["flow"] for r in results}):
+        ms = [r["ms"] for r in results if r["flow"] == flow]
+        summary["flows"][flow] = {"n": len(ms), "ok": sum(r["ok"] for r in results if r["flow"] == flow),
+                                  "p50_ms": percentile(ms, 50), "p95_ms": percentile(ms, 95)}
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
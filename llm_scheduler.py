@@ -0,0 +1,202 @@
+import time
+import heapq
+import random
+import threading
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import tracing
+from llm_cache import LLMResponseCache
+
+# 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_REPORT = 0      # 최종 AI 코칭 리포트 (절대 밀리면 안 됨)
+PRIORITY_REWRITE = 1     # 대본 재작성 (사용자가 결과를 기다리는 중)
+PRIORITY_ANALYSIS = 2    # 키워드 추출 등 부가 분석
+PRIORITY_QUESTION = 3    # 돌발 질문 (실패해도 규칙 기반으로 대체 가능)
+
+REQUEST_TIMEOUT_SEC = 90.0 # 대기열 + 재시도 + 응답까지 기다리는 최대 시간 (넘으면 TimeoutError)
+
+def is_rate_limit_error(e):
+    """429 / ResourceExhausted 계열 오류인지 판별 (google.api_core를 직접 import하지 않음)"""
+    if getattr(e, 'code', None) == 429: return True
+    name = type(e).__name__
+    if name in ('ResourceExhausted', 'TooManyRequests'): return True
+    msg = str(e)
+    return '429' in msg or 'quota' in msg.lower()
+
+class TokenBucket:
+    """분당 요청 수(RPM) 한도에 맞춘 토큰 버킷"""
+    def __init__(self, requests_per_minute, capacity):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, reserve=0):
+        """토큰 1개를 쓰고도 reserve개가 남으려면 몇 초 기다려야 하는지 (0이면 바로 가능)"""
+        self._refill()
+        need = 1 + reserve - self.tokens
+        return 0.0 if need <= 0 else need / self.rate
+
+    def consume(self):
+        self._refill()
+        self.tokens -= 1
+
+    def drain(self):
+        """서버가 429를 돌려주면 버킷을 비워서 다른 요청도 잠시 쉬게 함"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+class _Job:
+    def __init__(self, key, fn, priority):
+        self.key = key
+        self.fn = fn
+        self.priority = priority
+        self.attempts = 0
+        self.not_before = 0.0
+        self.future = Future()
+        self.dispatched = False
+
+class LLMScheduler:
+    """모든 Gemini 호출이 거쳐가는 클라이언트 측 스케줄러
+
+    - 토큰 버킷으로 설정된 RPM 한도를 넘지 않게 요청을 내보냅니다.
+    - 우선순위 큐로 처리하며, report_reserve개의 토큰은 최종 리포트 전용으로 남겨둡니다.
+    - 같은 키의 요청이 이미 대기/진행 중이면 새로 보내지 않고 같은 Future를 공유합니다.
+    - 429 응답은 지수 백오프 후 재시도합니다. 백오프 중인 작업은 대기열 맨 앞에 있어도 건너뛰므로
+      그동안 준비된 다른 요청이 먼저 나갑니다.
+    """
+    def __init__(self, requests_per_minute=10, burst=3, report_reserve=1, max_retries=3,
+                 backoff_base=2.0, max_concurrency=2):
+        self.bucket = TokenBucket(requests_per_minute, max(burst, report_reserve + 1))
+        self.report_reserve = report_reserve
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.cond = threading.Condition()
+        self.queue = []  # (priority, seq, job) 힙
+        self.seq = itertools.count()
+        self.inflight = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self.stats = {"submitted": 0, "deduplicated": 0, "dispatched": 0, "retries": 0, "failed": 0}
+        threading.Thread(target=self._dispatch_loop, daemon=True).start()
+
+    def submit(self, key, fn, priority=PRIORITY_ANALYSIS):
+        """fn()을 스케줄링하고 Future 반환 (같은 key가 진행 중이면 그 Future 공유, key=None이면 공유 안 함)"""
+        with self.cond:
+            self.stats["submitted"] += 1
+            job = self.inflight.get(key) if key is not None else None
+            if job is not None:
+                self.stats["deduplicated"] += 1
+                if priority < job.priority and not job.dispatched:
+                    # 더 급한 요청이 합류하면 대기 중인 작업의 우선순위를 끌어올림
+                    job.priority = priority
+                    heapq.heappush(self.queue, (priority, next(self.seq), job))
+                    self.cond.notify()
+                return job.future
+            job = _Job(key, fn, priority)
+            if key is not None: self.inflight[key] = job
+            heapq.heappush(self.queue, (priority, next(self.seq), job))
+            tracing.counter("llm_queue_depth", len(self.queue))
+            self.cond.notify()
+            return job.future
+
+    def _next_ready(self):
+        """백오프 중이 아닌 가장 급한 항목과 가장 이른 재시도 시각 (lock 보유 상태에서 호출)"""
+        # 이미 처리됐거나 우선순위가 바뀐 낡은 항목은 버림
+        while self.queue and (self.queue[0][2].dispatched or self.queue[0][0] != self.queue[0][2].priority):
+            heapq.heappop(self.queue)
+        now = time.monotonic()
+        next_retry = None
+        for entry in sorted(self.queue):
+            job = entry[2]
+            if job.dispatched or entry[0] != job.priority: continue
+            if job.not_before > now:
+                next_retry = job.not_before if next_retry is None else min(next_retry, job.not_before)
+                continue
+            return entry, next_retry
+        return None, next_retry
+
+    def _dispatch_loop(self):
+        while True:
+            with self.cond:
+                entry, next_retry = self._next_ready()
+                retry_wait = None if next_retry is None else max(0.0, next_retry - time.monotonic())
+                if entry is None:
+                    self.cond.wait(timeout=retry_wait)
+                    continue
+
+                priority, _, job = entry
+                reserve = 0 if priority == PRIORITY_REPORT else self.report_reserve
+                wait = self.bucket.wait_time(reserve)
+                if wait > 0:
+                    # 기다리는 동안 더 급한 요청이 들어오거나 백오프가 끝나면 다시 판단
+                    self.cond.wait(timeout=wait if retry_wait is None else min(wait, retry_wait))
+                    continue
+
+                self.queue.remove(entry)
+                heapq.heapify(self.queue)
+                job.dispatched = True
+                self.bucket.consume()
+                self.stats["dispatched"] += 1
+            self.executor.submit(self._run, job)
+
+    def _run(self, job):
+        try:
+            with tracing.span("llm_call", "llm", priority=job.priority, attempt=job.attempts):
+                result = job.fn()
+        except Exception as e:
+            if is_rate_limit_error(e) and job.attempts < self.max_retries:
+                job.attempts += 1
+                delay = self.backoff_base ** job.attempts + random.uniform(0, 0.5)
+                print(f"⏳ [LLM 스케줄러] 요청 한도 초과(429), {delay:.1f}초 후 재시도 ({job.attempts}/{self.max_retries})")
+                with self.cond:
+                    self.stats["retries"] += 1
+                    self.bucket.drain()
+                    job.dispatched = False
+                    job.not_before = time.monotonic() + delay
+                    heapq.heappush(self.queue, (job.priority, next(self.seq), job))
+                    self.cond.notify()
+                return
+            with self.cond:
+                self.stats["failed"] += 1
+                self.inflight.pop(job.key, None)
+            job.future.set_exception(e)
+            return
+        with self.cond:
+            self.inflight.pop(job.key, None)
+        job.future.set_result(result)
+
+    def get_stats(self):
+        with self.cond:
+            stats = dict(self.stats)
+            stats["queued"] = sum(1 for _, _, j in self.queue if not j.dispatched)
+            stats["inflight"] = len(self.inflight)
+            return stats
+
+class ScheduledTextModel:
+    """text_model.generate_content() 호출을 LLMScheduler를 통해 내보내는 래퍼
+
+    timeout초 안에 응답이 없으면 concurrent.futures.TimeoutError를 던집니다 (호출한 스레드가 무한정 묶이지 않게).
+    """
+    def __init__(self, model, scheduler, model_name=None, timeout=REQUEST_TIMEOUT_SEC):
+        self.model = model
+        self.scheduler = scheduler
+        self.model_name = model_name or getattr(model, 'model_name', type(model).__name__)
+        self.timeout = timeout
+
+    def generate_content(self, prompt, generation_config=None, priority=PRIORITY_ANALYSIS, **kwargs):
+        # 스트리밍 응답(iterator)은 여러 호출자가 나눠 쓸 수 없으므로 중복 제거 대상에서 제외
+        key = None if kwargs.get('stream') else LLMResponseCache.make_key(self.model_name, prompt, generation_config)
+        # llm_request: 대기열에서 기다린 시간까지 포함 (llm_call은 실제 API 호출 시간)
+        with tracing.span("llm_request", "llm", priority=priority):
+            future = self.scheduler.submit(
+                key,
+                lambda: self.model.generate_content(prompt, generation_config=generation_config, **kwargs),
+                priority
+            )
+            return future.result(timeout=self.timeout)
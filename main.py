@@ -1,37 +1,19 @@
+import time
+STARTUP_T0 = time.perf_counter() # 시작 시간 리포트 기준점
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter import simpledialog 
-import cv2
-from PIL import Image, ImageTk
-import threading
-import time
-import numpy as np
-import matplotlib
-matplotlib.use('TkAgg') 
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import random
 import os
-import json
-import re
-import pyaudio
 import wave
-import audioop
 import sys
 import queue
-import contextlib 
-import difflib 
-import math 
-
-# [필수] MediaPipe
-import mediapipe as mp
-
-# [필수] Whisper (고성능 분석)
-from faster_whisper import WhisperModel
+import numpy as np
 
-# [필수] Vosk (실시간)
-from vosk import Model, KaldiRecognizer
+# [지연 로드] MediaPipe / Whisper / Vosk / PyAudio 는
+# 창을 먼저 띄운 뒤 startup.ComponentLoader가 백그라운드에서 병렬로 불러옵니다.
+# OpenCV / PIL 은 첫 화면에 필요 없으므로 사용하는 함수 안에서 import (capture_sources와 같은 방식)
+# NumPy는 아래 분석 모듈들이 어차피 모듈 수준에서 불러오므로 여기서도 바로 import
 
 def resource_path(relative_path):
     try:
@@ -47,6 +29,10 @@ try:
     from question_generator import DynamicQuestionGenerator, IMRADValidator
     from analysis_manager import AnalysisManager
     from ai_rewriter import AI_Announcer 
+    from llm_cache import LLMResponseCache, CachedTextModel
+    from llm_scheduler import LLMScheduler, ScheduledTextModel
+    from llm_backend import create_provider
+    from question_pool import QuestionPool
 except ImportError as e:
     print(f"경고: 필요한 모듈을 찾을 수 없습니다: {e}")
     class DynamicQuestionGenerator: 
@@ -57,35 +43,59 @@ except ImportError as e:
         def __init__(self, *args): pass
     class AI_Announcer: 
         def __init__(self, *args): pass
+    class QuestionPool: 
+        def __init__(self, *args): pass
+from startup import ComponentLoader
+from sprite_cache import AudienceSprites
+from trend_chart import TrendChart
+from session_store import SessionStore
+from session_archive import SessionArchive, VIDEO_FILE, TRACE_FILE
+from progress_analytics import ProgressAnalytics
+from recording_session import RecordingSession
+from live_metrics import LiveMetrics, LiveHud, HUD_REFRESH_MS
+from prosody import analyze_prosody
+from task_executor import TaskExecutor
+import tracing
+from scoring import compute_scores
+from session_analysis import AUDIO_RATE, AUDIO_CHUNK, analyze_frame_gaze, create_face_mesh, create_whisper_model, transcribe, SpeechChunkAnalyzer
+from capture_sources import MicrophoneSource, WavFileSource, CameraSource, VideoFileSource
+from sprite_cache import choose_audience_states
 
 # --- 전역 변수 설정 ---
-is_recording = False
-start_time = 0
-speech_data = {"full_transcript": "", "word_count": 0, "filler_count": 0}
-gaze_data = {"total_frames": 0, "looking_frames": 0, "script_frames": 0} # script_frames 추가
-audio_data = {"volumes": [], "tremble_count": 0}
-timeline_markers = []
-cap = None
-out = None
-pa = pyaudio.PyAudio()
-
-# MediaPipe 초기화
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(
-    max_num_faces=1,
-    refine_landmarks=True, # 눈동자(Iris) 추적을 위해 필수
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
+# (녹화 상태/수집 데이터는 RecordingSession, 카메라는 App.cap이 소유)
+
+# 백그라운드에서 채워지는 무거운 구성요소 (로드 전에는 None)
+pyaudio = None
+pa = None
+face_mesh = None
+KaldiRecognizer = None
+vosk_model = None
+whisper_model = None
 
 # 얼굴 인식 최적화 변수
 current_face_box = None
 frame_count = 0
+VIDEO_FPS = 20.0 # 녹화 파일 fps (프레임 간격이 이 주기의 2배를 넘으면 드롭으로 집계)
+
+def load_pyaudio():
+    global pyaudio, pa
+    import pyaudio as pyaudio_module
+    pyaudio = pyaudio_module
+    pa = pyaudio.PyAudio()
+    return pa
+
+def load_face_mesh():
+    global face_mesh
+    # [필수] MediaPipe
+    face_mesh = create_face_mesh()
+    return face_mesh
+
+def load_vosk():
+    global vosk_model, KaldiRecognizer
+    # [필수] Vosk (실시간)
+    from vosk import Model, KaldiRecognizer as recognizer_cls
+    KaldiRecognizer = recognizer_cls
 
-# --- mainFinal.py 수정할 부분 ---
-
-vosk_model = None
-try:
     # 1순위: 가장 단순한 방법 (잘 되는 코드의 방식)
     if os.path.exists("model"):
         vosk_model = Model("model")
@@ -99,13 +109,33 @@ try:
             print(f"✅ Vosk 오프라인 모델 로드 완료! (절대 경로): {model_path}")
         else:
             print(f"⚠️ 경고: 모델 경로를 찾을 수 없습니다.")
-
-except Exception as e:
-    print(f"❌ Vosk 모델 로드 오류: {e}")
+    return vosk_model
+
+def load_whisper():
+    global whisper_model
+    # [필수] Whisper (고성능 분석)
+    # 모델 로드 (tiny, base, small 중 선택. small이 한국어 성능/속도 밸런스 굿)
+    whisper_model = create_whisper_model("small")
+    return whisper_model
+
+startup_loader = ComponentLoader(t0=STARTUP_T0)
+startup_loader.register('pyaudio', load_pyaudio)
+startup_loader.register('face_mesh', load_face_mesh)
+startup_loader.register('vosk', load_vosk)
+startup_loader.register('whisper', load_whisper)
+startup_loader.mark_stage('imports')
+
+# 녹화 시작 버튼은 아래 구성요소가 모두 준비(또는 실패 확정)된 뒤에 활성화
+RECORDING_COMPONENTS = ('pyaudio', 'face_mesh', 'vosk')
+COMPONENT_LABELS = {'pyaudio': '오디오', 'face_mesh': '시선 추적', 'vosk': '음성 인식', 'whisper': '정밀 분석'}
 
 class App(tk.Tk):
-    def __init__(self):
+    def __init__(self, replay=None):
         super().__init__()
+        # 재생 모드: 마이크/카메라 대신 녹음/영상 파일을 실시간 속도로 입력 ({"audio", "video", "seed"})
+        self.replay = replay or {}
+        if self.replay.get('seed') is not None:
+            random.seed(self.replay['seed']); np.random.seed(self.replay['seed']) # 청중/질문 선택 재현
         self.title("AI Presentation Pro (Final Ver: Enhanced UI & Gaze)")
         self.geometry("1400x950") # 화면을 좀 더 넓게 설정
         
@@ -113,43 +143,119 @@ class App(tk.Tk):
         self.is_anxious = False
         self.heart_phase = 0.0
         
-        if 'app_config' in globals() and hasattr(app_config, 'set_korean_font'):
-            app_config.set_korean_font() 
-        
         self.user_settings = {}
         self.original_script = ""
         self.style = ttk.Style()
         self.style.theme_use('clam')
         
-        self.load_and_initialize_apis() 
+        # 모든 백그라운드 작업(질문/재작성/분석/사운드/재생)은 공유 풀에서 실행
+        # 그룹: 'page'(현재 화면), 'rewriter'(재작성 창), 'session'(녹화 분석), 'question'(질문 미리 받기)
+        self.executor = TaskExecutor()
+        self.executor.attach(self)
+        self.anxiety_task = None
+        self.rewrite_task = None
+        self.feedback_label = None # 분석 화면의 AI 피드백 라벨 (백그라운드 리포트 완료 시 갱신)
+
+        # API 키 입력창은 첫 화면이 뜬 뒤에 띄움 (아래 _initialize_apis_deferred)
+        self.AI_AVAILABLE = False
+        self.text_model = None
+        self.llm_cache = None
+        self.llm_scheduler = None
         
         if 'app_config' in globals() and hasattr(app_config, 'STOPWORDS'):
-            self.analysis_manager = AnalysisManager(app_config.STOPWORDS, app_config.COACHING_CONFIG)
-            self.dynamic_generator = DynamicQuestionGenerator(self.text_model) 
-            self.imrad_validator = IMRADValidator(self.text_model)
-            self.ai_announcer = AI_Announcer(self.text_model) 
+            self.analysis_manager = AnalysisManager(app_config.STOPWORDS, app_config.COACHING_CONFIG, app_config.KEYWORD_CORPUS_FILE)
+            self.question_pool_backup = app_config.BACKUP_QUESTIONS
         else:
             self.analysis_manager = AnalysisManager({}, {})
-            self.dynamic_generator = DynamicQuestionGenerator(None)
-            self.imrad_validator = IMRADValidator(None)
-            self.ai_announcer = AI_Announcer(None)
+            self.question_pool_backup = []
+        self.dynamic_generator = DynamicQuestionGenerator(None)
+        self.imrad_validator = IMRADValidator(None)
+        self.ai_announcer = AI_Announcer(None)
+        self.question_pool = QuestionPool(self.imrad_validator, self.dynamic_generator, self.question_pool_backup, 0, self.executor)
 
         self.extracted_keywords = []
-        self.raw_audio_frames = []
+        self.session = None # 현재(또는 마지막) 녹화의 RecordingSession
+        self.live_metrics = None # 녹화 중 HUD 지표 (녹화마다 새로 만듦)
+        self.hud = None
+        self.cap = None # 카메라 (Tk 스레드 전용)
+        self.last_frame_time = None
+        self.dropped_frames = 0
+
+        # 청중 이미지는 시작 시 한 번만 디코딩/리사이즈 (상태 변경은 참조 교체만)
+        self.audience_sprites = AudienceSprites(resource_path)
+        self.audience_states = ('default', 'default')
+        startup_loader.register('audience_sprites', self.audience_sprites.preload)
 
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.load_history()
+        self.session_archive = None
+        if 'app_config' in globals() and hasattr(app_config, 'SESSION_ARCHIVE_CONFIG'):
+            try:
+                self.session_archive = SessionArchive(**app_config.SESSION_ARCHIVE_CONFIG)
+                self.session_archive.apply_retention()
+            except Exception as e:
+                print(f"세션 보관함 초기화 실패: {e}")
         self.show_setup_page()
 
+        # 창을 먼저 보여주고, 무거운 모델들은 백그라운드에서 병렬 로드
+        startup_loader.start()
+        self.after(0, self._on_first_window_shown)
+
+    def _on_first_window_shown(self):
+        self.update_idletasks()
+        startup_loader.mark_stage('window_shown')
+        self.after(50, self._initialize_apis_deferred)
+        self.after(200, self._poll_component_readiness)
+
+    def _initialize_apis_deferred(self):
+        """API 키 확인/입력 후 텍스트 모델을 각 모듈에 연결"""
+        t = time.perf_counter()
+        self.load_and_initialize_apis()
+        startup_loader.mark_stage('llm_setup', time.perf_counter() - t)
+        self.dynamic_generator.text_model = self.text_model
+        self.imrad_validator.text_model = self.text_model
+        self.ai_announcer.text_model = self.text_model
+        if self.AI_AVAILABLE and hasattr(self.question_pool, 'max_ai_questions'):
+            self.question_pool.max_ai_questions = app_config.QUESTION_POOL_CONFIG['max_ai_questions']
+
+    def _poll_component_readiness(self):
+        """구성요소 준비 상태를 현재 화면(설정/연습)에 반영하고, 모두 끝나면 시간 리포트 출력"""
+        if not self.winfo_exists(): return
+        self._refresh_component_status()
+        if startup_loader.all_done():
+            print(startup_loader.format_report())
+        else:
+            self.after(200, self._poll_component_readiness)
+
+    def _component_status_text(self, names):
+        icons = {'ready': '✅', 'failed': '❌'}
+        return "  ".join(f"{COMPONENT_LABELS[n]} {icons.get(startup_loader.status(n), '⏳')}" for n in names)
+
+    def _refresh_component_status(self):
+        if hasattr(self, 'component_status_label') and self.component_status_label.winfo_exists():
+            self.component_status_label.config(text=self._component_status_text(COMPONENT_LABELS))
+        if hasattr(self, 'btn_start') and self.btn_start.winfo_exists() and not self.is_recording:
+            if startup_loader.is_ready(*RECORDING_COMPONENTS):
+                if str(self.btn_start['state']) == 'disabled':
+                    self.btn_start['state'] = 'normal'
+                    self.status_label.config(text="준비 완료", foreground="gray")
+            else:
+                self.btn_start['state'] = 'disabled'
+                self.status_label.config(text="⏳ 준비 중: " + self._component_status_text(RECORDING_COMPONENTS), foreground="gray")
+
     def load_and_initialize_apis(self):
         if 'app_config' not in globals() or not hasattr(app_config, 'load_api_keys'):
             self.AI_AVAILABLE = False
             self.text_model = None
+            self.llm_cache = None
+            self.llm_scheduler = None
             return
 
-        gemini_key = app_config.load_api_keys()
+        llm_config = app_config.LLM_CONFIG
+        use_gemini = llm_config['backend'] == 'gemini'
+        gemini_key = app_config.load_api_keys() if use_gemini else None
         
-        if not gemini_key:
+        if use_gemini and not gemini_key:
             gemini_key = simpledialog.askstring("Gemini API 키 필요", 
                                                 "Gemini API 키를 입력하세요 (AI 피드백용):\n", 
                                                 parent=self)
@@ -157,49 +263,89 @@ class App(tk.Tk):
                 app_config.save_api_keys(gemini_key)
 
         self.text_model = None
+        self.llm_cache = None
+        self.llm_scheduler = None
         self.AI_AVAILABLE = False
 
-        if gemini_key:
+        if gemini_key or not use_gemini:
             try:
-                if 'app_config' in globals() and hasattr(app_config, 'genai'):
-                    app_config.genai.configure(api_key=gemini_key)
-                    self.text_model = app_config.genai.GenerativeModel('gemini-2.5-flash') #2.5-flash
-                    self.AI_AVAILABLE = True
-                    print("Gemini API 연결 성공")
+                # 백엔드(Gemini 또는 오프라인 가짜 LLM)는 llm_backend에서만 생성
+                provider = create_provider(llm_config, gemini_key)
+                # 모든 모듈의 호출이 하나의 스케줄러(RPM 한도/우선순위/429 재시도)를 거쳐감
+                self.llm_scheduler = LLMScheduler(
+                    llm_config['requests_per_minute'], llm_config['burst'], llm_config['report_reserve'],
+                    llm_config['max_retries'], max_concurrency=llm_config['max_concurrency']
+                )
+                scheduled_model = ScheduledTextModel(provider, self.llm_scheduler, provider.model_name)
+                # 같은 프롬프트 재요청은 디스크 캐시에서 즉시 응답 (무료 API 한도 절약)
+                self.llm_cache = LLMResponseCache(llm_config['cache_file'], llm_config['cache_max_bytes'], llm_config['cache_ttl_sec'])
+                self.text_model = CachedTextModel(scheduled_model, self.llm_cache, provider.model_name)
+                self.AI_AVAILABLE = True
+                print(f"LLM 백엔드 연결 성공 ({llm_config['backend']}: {provider.model_name})")
             except Exception as e:
                 print(f"Gemini 연결 실패: {e}")
         else:
             print("Gemini API 키 없음.")
 
+    @property
+    def is_recording(self):
+        return self.session is not None and self.session.is_recording
+
     def on_closing(self):
-        global is_recording, cap, out, pa
-        is_recording = False
         self.is_anxious = False 
-        if cap and cap.isOpened(): cap.release()
-        if out: out.release()
+        if self.session:
+            self.session.stop()
+            self.session.close_video()
+        if self.cap and self.cap.isOpened(): self.cap.release()
         if pa: pa.terminate() 
+        if self.llm_cache:
+            print(f"📦 LLM 캐시 통계: {self.llm_cache.stats()}")
+            self.llm_cache.close()
+        if self.llm_scheduler:
+            print(f"🚦 LLM 스케줄러 통계: {self.llm_scheduler.get_stats()}")
+        if self.session_store: self.session_store.close()
+        self.executor.shutdown()
         try:
-            for f in ["rewritten_script_output.wav", "output.avi", "output.wav"]:
+            for f in ["rewritten_script_output.wav"]: # 녹화 영상/음성은 세션 보관함에 남김
                 if os.path.exists(f): os.remove(f)
         except: pass
         self.destroy()
         os._exit(0)
 
     def load_history(self):
+        # 전체 기록이 아니라 그래프에 필요한 최근 구간만 불러옴
         self.history = []
-        if 'app_config' in globals() and hasattr(app_config, 'HISTORY_FILE') and os.path.exists(app_config.HISTORY_FILE):
-            try:
-                with open(app_config.HISTORY_FILE, "r", encoding='utf-8') as f:
-                    self.history = json.load(f)
-            except: self.history = []
+        self.session_store = None
+        self.progress = None
+        if 'app_config' not in globals() or not hasattr(app_config, 'SESSION_DB_FILE'): return
+        try:
+            self.session_store = SessionStore(app_config.SESSION_DB_FILE)
+            self.session_store.migrate_json_history(app_config.HISTORY_FILE)
+            self.history = self.session_store.recent_scores(app_config.HISTORY_WINDOW)
+            # 진행 통계는 저장된 스냅샷을 불러오고 그 이후 세션만 반영
+            self.progress = ProgressAnalytics(self.session_store, app_config.PROGRESS_WINDOW)
+        except Exception as e:
+            print(f"세션 기록 불러오기 실패: {e}")
 
-    def save_history(self, score):
-        if 'app_config' not in globals() or not hasattr(app_config, 'HISTORY_FILE'): return
+    def save_history(self, score, mode=None, metrics=None, duration_sec=None):
+        """세션 저장 후 진행 통계를 증분 갱신하고, 개인 최고 기록을 갱신한 지표 목록 반환"""
         self.history.append(score)
-        with open(app_config.HISTORY_FILE, "w", encoding='utf-8') as f:
-            json.dump(self.history, f, ensure_ascii=False, indent=4)
+        if not self.session_store: return []
+        if len(self.history) > app_config.HISTORY_WINDOW: del self.history[0]
+        try:
+            session_id = self.session_store.add_session(mode, score, metrics, duration_sec)
+            if not self.progress: return []
+            return self.progress.add_session({"id": session_id, "mode": mode, "total_score": score, "metrics": metrics})
+        except Exception as e:
+            print(f"세션 기록 저장 실패: {e}")
+            return []
 
     def clear_window(self):
+        # 화면을 떠나면 그 화면(및 재작성 창)의 진행 중 작업은 취소
+        self.is_anxious = False
+        self.is_playing = False
+        self.executor.cancel_group('page')
+        self.executor.cancel_group('rewriter')
         self.unbind_all("<MouseWheel>")
         for widget in self.winfo_children(): widget.destroy()
 
@@ -223,6 +369,43 @@ class App(tk.Tk):
         
         ttk.Button(frame, text="연습 시작하기", command=self.go_to_practice).pack(pady=20, ipadx=20, ipady=10)
         ttk.Button(frame, text="📢 AI 대본 재작성 (Gemini)", command=self.show_rewriter_window).pack(pady=10, ipadx=10, ipady=5)
+        ttk.Button(frame, text="📂 지난 연습 다시 보기", command=self.show_session_list_window).pack(pady=10, ipadx=10, ipady=5)
+
+        # 백그라운드 로드 상태 (모두 준비되기 전에도 유형 선택/대본 재작성은 바로 가능)
+        self.component_status_label = ttk.Label(frame, text=self._component_status_text(COMPONENT_LABELS), font=("Arial", 10), foreground="gray")
+        self.component_status_label.pack(pady=(20, 0))
+
+    def show_session_list_window(self):
+        if not self.session_archive:
+            messagebox.showinfo("알림", "세션 보관함을 사용할 수 없습니다.")
+            return
+        sessions = self.session_archive.list_sessions()
+        if not sessions:
+            messagebox.showinfo("알림", "아직 저장된 연습 세션이 없습니다.")
+            return
+        win = tk.Toplevel(self)
+        win.title("📂 지난 연습 다시 보기")
+        win.geometry("500x400")
+        listbox = tk.Listbox(win, font=("Arial", 12))
+        listbox.pack(fill='both', expand=True, padx=10, pady=10)
+        for e in sessions:
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(e['created']))
+            listbox.insert(tk.END, f"{created}  |  {e['total_score']}점  |  {e.get('mode') or '-'}")
+
+        def open_selected(event=None):
+            sel = listbox.curselection()
+            if not sel: return
+            session_id = sessions[sel[0]]['id']
+            try:
+                result = self.session_archive.load_result(session_id)
+            except Exception as e:
+                messagebox.showerror("오류", f"세션을 열 수 없습니다: {e}", parent=win)
+                return
+            win.destroy()
+            self.show_analysis_page(result, session_id)
+
+        listbox.bind("<Double-Button-1>", open_selected)
+        ttk.Button(win, text="열기", command=open_selected).pack(pady=(0, 10))
 
     def go_to_practice(self):
         self.user_settings['atmosphere'] = self.atmosphere_var.get()
@@ -262,6 +445,8 @@ class App(tk.Tk):
         
         self.video_panel = ttk.Label(video_bg_frame)
         self.video_panel.pack(expand=True)
+        # 실시간 HUD (녹화 중에만 표시, 10Hz로 한 번에 갱신)
+        self.hud = LiveHud(video_bg_frame)
 
         # 3. 청중 패널 2 (오른쪽)
         self.aud_right_frame = tk.Frame(top_frame, bg="#e9ecef", bd=2, relief="sunken")
@@ -275,6 +460,9 @@ class App(tk.Tk):
 
         # 초기 청중 이미지 설정
         self.update_audience_images('default', 'default') 
+        # 패널 크기가 바뀔 때만 청중 이미지 재리사이즈
+        self._audience_resize_job = None
+        self.aud_left_frame.bind('<Configure>', self._on_audience_panel_resize)
         
         # --- 중단 영역: 컨트롤 버튼 ---
         control_frame = ttk.Frame(main_frame)
@@ -298,6 +486,7 @@ class App(tk.Tk):
         
         self.status_label = ttk.Label(btn_box, text="준비 완료", font=("Arial", 12), foreground="gray")
         self.status_label.pack(side="left", padx=20)
+        self._refresh_component_status() # 모델 로드 전이면 녹화 시작 버튼 비활성화
 
         # --- 하단 영역: 대본 (스크롤 가능, 크게) ---
         bottom_frame = ttk.LabelFrame(main_frame, text="📄 발표 대본 (시선이 내려가면 감점됩니다!)")
@@ -325,8 +514,9 @@ class App(tk.Tk):
             # [긴장 효과] 청중들이 즉시 산만해짐 (Distracted)
             self.update_audience_images('distracted', 'distracted')
             
-            threading.Thread(target=self.anxiety_sound_loop, daemon=True).start()
+            self.anxiety_task = self.executor.submit(self.anxiety_sound_loop, group='page')
         else:
+            if self.anxiety_task: self.anxiety_task.cancel()
             self.btn_panic.config(text="😰 긴장 모드: OFF", bg="#dddddd", fg="black")
             self.script_text.config(fg="black", bg="white") # 글씨 복구
             
@@ -336,7 +526,7 @@ class App(tk.Tk):
     # 리얼 심장 사운드 생성기
     # =========================================================================
     
-    def anxiety_sound_loop(self):
+    def anxiety_sound_loop(self, token):
         RATE = 16000
         BPM = 115 
         DURATION = 60 / BPM 
@@ -361,9 +551,10 @@ class App(tk.Tk):
         audio_bytes = audio_signal.astype(np.int16).tobytes()
         
         try:
+            startup_loader.get('pyaudio') # 백그라운드 로드가 끝날 때까지 대기
             p = pyaudio.PyAudio()
             stream = p.open(format=pyaudio.paInt16, channels=1, rate=RATE, output=True)
-            while self.is_anxious:
+            while self.is_anxious and not token.cancelled:
                 stream.write(audio_bytes)
                 time.sleep(random.uniform(0.0, 0.03))
             stream.stop_stream(); stream.close(); p.terminate()
@@ -371,30 +562,18 @@ class App(tk.Tk):
             print(f"사운드 재생 오류: {e}")
 
     def start_camera(self):
-        global cap
         try:
-            # 1단계: exe 환경에서 가장 안정적인 DSHOW 모드 시도
-            cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-            
-            # 2단계: DSHOW가 실패했거나 카메라가 안 열리면 일반 모드로 재시도
-            if cap is None or not cap.isOpened():
-                print("⚠️ DSHOW 모드 실패, 일반 모드로 재시도합니다.")
-                if cap: cap.release()
-                cap = cv2.VideoCapture(0) # 일반 모드
-            
-            # 3단계: 그래도 안 되면 -1번 장치 시도 (일부 노트북용)
-            if cap is None or not cap.isOpened():
-                cap = cv2.VideoCapture(-1)
+            if self.replay.get('video'):
+                # 재생 모드: 녹화 영상을 반복 재생
+                self.cap = VideoFileSource(self.replay['video'], loop=True)
+            else:
+                self.cap = CameraSource(640, 360) # 해상도 설정 (640x360)
 
             # 최종 확인
-            if not cap.isOpened():
+            if not self.cap.isOpened():
                 messagebox.showerror("카메라 오류", "카메라를 연결할 수 없습니다.\n다른 프로그램이 카메라를 쓰고 있는지 확인해주세요.")
                 return
 
-            # 해상도 설정 (640x360)
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 360)
-            
             # 화면 업데이트 시작
             self.update_video_stream()
             
@@ -406,146 +585,135 @@ class App(tk.Tk):
     # [핵심 수정] 정교한 시선 추적 (Iris Tracking & Head Pitch)
     # =========================================================================
     def update_video_stream(self):
-        global gaze_data, cap, frame_count, face_mesh 
         if not self.winfo_exists(): return
+        session = self.session
         
         try:
-            if cap is None or not cap.isOpened(): return 
-
-            ret, frame = cap.read()
-            if not ret: return
-            
-            frame = cv2.flip(frame, 1)
-            frame_count += 1
-            h, w, _ = frame.shape
+            if self.cap is None or not self.cap.isOpened(): return 
 
-            # --- 긴장 시각 효과(스크린 펌프 효과) ---       
-            if self.is_anxious:
-                try:
-                    self.heart_phase += 0.35
-                    pulse = (np.sin(self.heart_phase) + 1) / 2 
-                    
-                    overlay = frame.copy()
-                    h, w, channels = frame.shape
-                    if channels == 4: overlay[:] = (0, 0, 255, 255)   
-                    else: overlay[:] = (0, 0, 255)      
-                    
-                    alpha = pulse * 0.25 
-                    frame = cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0)
-                    
-                    dx = random.randint(-5, 5)
-                    dy = random.randint(-5, 5)
-                    M = np.float32([[1, 0, dx], [0, 1, dy]])
-                    frame = cv2.warpAffine(frame, M, (w, h))
-                except: pass 
-
-            # --- MediaPipe 얼굴/시선 분석 ---
-            script_gaze_detected = False
-            
-            # 성능을 위해 2프레임마다 분석하지만, 녹화 중에는 매 프레임 체크가 더 정확할 수 있음
-            # 여기서는 2프레임 간격 유지
-            if frame_count % 2 == 0: 
-                try:
-                    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    results = face_mesh.process(rgb_frame)
-                    
-                    if results.multi_face_landmarks:
-                        landmarks = results.multi_face_landmarks[0].landmark
-                        
-                        # 3D 좌표 변환
-                        mesh_points = np.array([np.multiply([p.x, p.y], [w, h]).astype(int) for p in landmarks])
-                        
-                        # [알고리즘 복구] 눈동자 수직 위치 비율 (Vertical Gaze Ratio)
-                        # 왼쪽 눈: 159(위), 145(아래), 468(눈동자)
-                        # 오른쪽 눈: 386(위), 374(아래), 473(눈동자)
-                        
-                        def get_gaze_ratio(top, bottom, iris):
-                            eye_height = np.linalg.norm(top - bottom)
-                            dist_to_top = np.linalg.norm(top - iris)
-                            # 눈을 감았거나 인식이 불안정하면 0.5(정면) 반환
-                            if eye_height < 3: return 0.5 
-                            return dist_to_top / eye_height
-
-                        left_ratio = get_gaze_ratio(mesh_points[159], mesh_points[145], mesh_points[468])
-                        right_ratio = get_gaze_ratio(mesh_points[386], mesh_points[374], mesh_points[473])
-                        avg_ratio = (left_ratio + right_ratio) / 2
-                        
-                        # [핵심 수정] 임계값 재조정 (0.68)
-                        # 0.50: 정면
-                        # 0.57: 너무 예민함 (가만히 있어도 걸림)
-                        # 0.75: 너무 둔감함 (대본 봐도 안 걸림)
-                        # --> 0.68로 설정하여 안정성 확보
-                        if avg_ratio > 0.57: 
-
-                            script_gaze_detected = True
-                            # 시각적 피드백
-                            cv2.putText(frame, "LOOKING DOWN!", (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                           # cv2.circle(frame, tuple(mesh_points[468]), 3, (0, 0, 255), -1)
-                           # cv2.circle(frame, tuple(mesh_points[473]), 3, (0, 0, 255), -1)
-                        else:
-                            # 정면 응시
-                            #cv2.circle(frame, tuple(mesh_points[468]), 3, (0, 255, 0), -1)
-                            #cv2.circle(frame, tuple(mesh_points[473]), 3, (0, 255, 0), -1)
-                            pass
-                        #눈깔 색 삭제
-
-                    # 데이터 집계
-                    if is_recording:
-                        gaze_data['total_frames'] += 1
-                        if script_gaze_detected:
-                            gaze_data['script_frames'] += 1 # 감점 요인
-                        elif results.multi_face_landmarks:
-                            gaze_data['looking_frames'] += 1 # 득점 요인 (정면 응시)
-                            
-                except Exception as e: 
-                    # print(f"Medipipe 오류: {e}") 
-                    pass
-
-            if is_recording and out: 
-                out.write(frame)
-                cv2.circle(frame, (30, 30), 10, (0, 0, 255), -1)
-
-            # 화면 표시를 위해 크기 조정 (640x360)
-            img = ImageTk.PhotoImage(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)).resize((640, 360))) 
-            self.video_panel.configure(image=img); self.video_panel.image = img
+            with tracing.span("frame", "video"):
+                if not self._process_video_frame(session): return
             
             if self.winfo_exists():
                 self.after(30, self.update_video_stream)
                 
-        except Exception as e:
+        except Exception:
             if self.winfo_exists():
                 self.after(1000, self.update_video_stream)
 
+    def _process_video_frame(self, session):
+        """프레임 하나 읽기 -> 긴장 효과 -> 시선 분석 -> 녹화 -> 화면 표시. 카메라 읽기에 실패하면 False"""
+        global frame_count
+        import cv2
+        from PIL import Image, ImageTk
+        if tracing.enabled(): self._count_dropped_frames()
+        with tracing.span("camera_read", "video"):
+            ret, frame = self.cap.read()
+        if not ret: return False
+        
+        if self.cap.mirror: frame = cv2.flip(frame, 1)
+        frame_count += 1
+        h, w, _ = frame.shape
+
+        # --- 긴장 시각 효과(스크린 펌프 효과) ---       
+        if self.is_anxious:
+            try:
+                self.heart_phase += 0.35
+                pulse = (np.sin(self.heart_phase) + 1) / 2 
+                
+                overlay = frame.copy()
+                h, w, channels = frame.shape
+                if channels == 4: overlay[:] = (0, 0, 255, 255)   
+                else: overlay[:] = (0, 0, 255)      
+                
+                alpha = pulse * 0.25 
+                frame = cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0)
+                
+                dx = random.randint(-5, 5)
+                dy = random.randint(-5, 5)
+                M = np.float32([[1, 0, dx], [0, 1, dy]])
+                frame = cv2.warpAffine(frame, M, (w, h))
+            except: pass 
+
+        # --- MediaPipe 얼굴/시선 분석 ---
+        script_gaze_detected = False
+        
+        # 성능을 위해 2프레임마다 분석하지만, 녹화 중에는 매 프레임 체크가 더 정확할 수 있음
+        # 여기서는 2프레임 간격 유지
+        if frame_count % 2 == 0 and face_mesh is not None: # 로드 전에는 시선 분석 생략
+            try:
+                # 눈동자 수직 위치 비율 판정 + 녹화 중 집계 (파일 재생/배치 분석과 공용)
+                with tracing.span("face_mesh", "video"):
+                    face_detected, script_gaze_detected = analyze_frame_gaze(frame, face_mesh, session)
+                if self.live_metrics is not None and session is not None and session.is_recording:
+                    self.live_metrics.add_gaze(face_detected, script_gaze_detected)
+                if script_gaze_detected:
+                    # 시각적 피드백
+                    cv2.putText(frame, "LOOKING DOWN!", (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                        
+            except Exception: 
+                # print(f"Medipipe 오류: {e}") 
+                pass
+
+        with tracing.span("video_write", "video"):
+            recorded = session is not None and session.write_frame(frame)
+        if recorded: 
+            cv2.circle(frame, (30, 30), 10, (0, 0, 255), -1)
+
+        # 화면 표시를 위해 크기 조정 (640x360)
+        with tracing.span("display", "video"):
+            img = ImageTk.PhotoImage(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)).resize((640, 360))) 
+            self.video_panel.configure(image=img); self.video_panel.image = img
+        return True
+
+    def _count_dropped_frames(self):
+        """이전 프레임과의 간격으로 놓친 프레임 수를 추정해 카운터에 기록 (추적이 켜진 경우만 호출)"""
+        now = time.perf_counter()
+        if self.last_frame_time is not None:
+            missed = int((now - self.last_frame_time) * VIDEO_FPS) - 1
+            if missed > 0:
+                self.dropped_frames += missed
+                tracing.counter("dropped_frames", self.dropped_frames)
+        self.last_frame_time = now
+
     # =========================================================================
     # [수정됨] 청중 이미지 업데이트 (크기 640x360에 맞춰 조정)
     # =========================================================================
     def update_audience_images(self, s1, s2):
-        def get_image(idx, state):
-            filename = f"audience{idx}_{state}.png" 
-            path = resource_path(filename)
-            if not os.path.exists(path): path = resource_path(f"audience{idx}_default.png")
-            try:
-                # 화면 분할 크기에 맞춰 이미지 리사이징 (약 320x240 정도가 적당)
-                return ImageTk.PhotoImage(Image.open(path).resize((300, 225)))
-            except: return None
-
-        img1 = get_image(1, s1)
-        img2 = get_image(2, s2)
-        
-        if img1: self.aud_labels[0].configure(image=img1); self.aud_labels[0].image = img1
-        if img2: self.aud_labels[1].configure(image=img2); self.aud_labels[1].image = img2
+        # 디스크/디코딩 없이 캐시된 PhotoImage로 교체만 함
+        self.audience_states = (s1, s2)
+        for label, (idx, state) in zip(self.aud_labels, ((1, s1), (2, s2))):
+            img = self.audience_sprites.get(idx, state)
+            if img and label.cget('image') != str(img):
+                label.configure(image=img); label.image = img
+
+    def _on_audience_panel_resize(self, event):
+        # 창 크기 조절 중에는 이벤트가 연속으로 오므로 마지막 크기로 한 번만 처리
+        if self._audience_resize_job: self.after_cancel(self._audience_resize_job)
+        self._audience_resize_job = self.after(150, self._apply_audience_panel_size, event.width, event.height)
+
+    def _apply_audience_panel_size(self, width, height):
+        self._audience_resize_job = None
+        # 4:3 비율 유지, 원래 크기(300x225)보다 크게 늘리지는 않음
+        w = max(80, min(300, width - 10, int((height - 10) * 4 / 3)))
+        size = (w, w * 3 // 4)
+        if abs(size[0] - self.audience_sprites.size[0]) < 10: return
+        self.audience_sprites.request_size(size)
+        self._wait_audience_size(size)
+
+    def _wait_audience_size(self, size):
+        if not self.winfo_exists() or not self.aud_labels[0].winfo_exists(): return
+        if not self.audience_sprites.is_ready(size):
+            self.after(50, self._wait_audience_size, size); return
+        self.audience_sprites.set_size(size)
+        self.update_audience_images(*self.audience_states)
 
     # =========================================================================
     # 청중 행동 루프
     # =========================================================================
     def audience_loop(self):
-        if not is_recording: return
-        if self.is_anxious:
-            s1, s2 = 'distracted', 'distracted'
-        else:
-            states = ['default']*6 + ['focused']*2 + ['distracted']*1 + ['question']*1
-            s1 = random.choice(states)
-            s2 = random.choice(states)
+        if not self.is_recording: return
+        s1, s2 = choose_audience_states(self.is_anxious)
         self.update_audience_images(s1, s2)
         if self.winfo_exists(): self.after(4000, self.audience_loop)
 
@@ -561,34 +729,16 @@ class App(tk.Tk):
         else: self.update_audience_images('focused', 'question')
         
         self.update()
-        threading.Thread(target=self._trigger_question_thread, args=(self.script_text.get("1.0", tk.END).strip(), self.user_settings.get('atmosphere', '정보')), daemon=True).start()
-
-    def _trigger_question_thread(self, script, mode):
-        ai_question = None
-        possible_questions = []
-        if 'app_config' in globals() and hasattr(app_config, 'BACKUP_QUESTIONS'):
-            possible_questions.extend(app_config.BACKUP_QUESTIONS)
-        else:
-            possible_questions.append("가장 중요하다고 생각하는 점은 무엇인가요?")
-
-        if self.AI_AVAILABLE:
-            try:
-                if '정보' in mode: ai_question = self.imrad_validator.generate_imrad_question(script)
-                elif '설득' in mode: ai_question = self.dynamic_generator.generate_question(script, 'B')
-                elif '공감' in mode: ai_question = self.dynamic_generator.generate_question(script, 'C')
-                if ai_question: possible_questions.append(ai_question)
-            except: pass
-
-        final_question = random.choice(possible_questions)
-        if self.winfo_exists(): self.after(0, self._show_question_popup, final_question)
+        # 녹화 시작 때 미리 채워둔 질문 풀에서 즉시 꺼냄 (대본이 바뀌었으면 풀 갱신 + AI 보충)
+        final_question = self.question_pool.pop(self.script_text.get("1.0", tk.END).strip(), self.user_settings.get('atmosphere', '정보'))
+        self._show_question_popup(final_question)
 
     def _show_question_popup(self, final_question):
         if not self.winfo_exists(): return
-        self.add_marker(time.time() - start_time, '❓')
+        if self.session: self.session.add_marker(self.session.elapsed(), '❓')
         messagebox.showinfo("💡 돌발 질문", final_question)
     
     def start_recording(self):
-        global is_recording, start_time, out, speech_data, timeline_markers, gaze_data, audio_data
         if len(self.script_text.get("1.0", tk.END).strip()) < 10:
             messagebox.showwarning("경고", "대본을 10자 이상 입력해주세요.")
             return
@@ -597,23 +747,36 @@ class App(tk.Tk):
             if not messagebox.askyesno("경고", "음성 인식 모델(Vosk)이 없습니다. 소리 없이 녹화만 하시겠습니까?"):
                 return
 
-        is_recording = True; start_time = time.time()
-        speech_data = {"full_transcript": "", "word_count": 0, "filler_count": 0}
-        # 데이터 초기화 (script_frames 포함)
-        gaze_data = {"total_frames": 0, "looking_frames": 0, "script_frames": 0}
-        audio_data = {"volumes": [], "tremble_count": 0}
-        timeline_markers = []
-        self.raw_audio_frames = [] 
+        # 돌발 질문 미리 채우기 (규칙 기반은 즉시, AI 질문은 백그라운드)
+        self.question_pool.reset()
+        self.question_pool.prepare(self.script_text.get("1.0", tk.END).strip(), self.user_settings.get('atmosphere', '정보'))
         
         try:
+            # 세션마다 별도 폴더에 저장 (지난 세션 다시 보기용)
+            session_id = self.session_archive.new_session() if self.session_archive else None
+            video_path = self.session_archive.path(session_id, VIDEO_FILE) if session_id else 'output.avi'
+            import cv2
             fourcc = cv2.VideoWriter_fourcc(*'XVID')
-            out = cv2.VideoWriter('output.avi', fourcc, 20.0, (640, 360)) # 해상도 맞춤
+            writer = cv2.VideoWriter(video_path, fourcc, 20.0, (640, 360)) # 해상도 맞춤
         except Exception as e:
             messagebox.showerror("오류", f"비디오 파일 생성 실패: {e}")
-            is_recording = False
             return
-            
-        threading.Thread(target=self.speech_recognition_thread, daemon=True).start()
+
+        # 이전 녹화의 분석이 아직 돌고 있으면 취소 (새 녹화와 CPU를 다투지 않게)
+        self.executor.cancel_group('session')
+        # 녹화마다 새 세션 객체 (이전 녹화의 스레드는 이전 객체에만 씀)
+        self.session = RecordingSession(session_id, self.script_text.get("1.0", tk.END).strip(), self.user_settings.get('atmosphere', '정보'))
+        if getattr(app_config, 'TRACE_ENABLED', False):
+            # 녹화 1회분의 구간별 소요 시간 기록 (분석이 끝나면 세션 폴더에 trace.json으로 저장)
+            tracing.start(session_id=session_id, mode=self.session.mode)
+            self.last_frame_time, self.dropped_frames = None, 0
+        tracing.instant("recording_start")
+        self.session.start(writer)
+        self.live_metrics = LiveMetrics(self.session.clock)
+        self.session.start_worker(self.speech_recognition_thread, self.session, self.live_metrics)
+        if self.hud is not None and self.hud.winfo_exists():
+            self.hud.place(relx=1.0, rely=0.0, anchor='ne', x=-8, y=8)
+            self._hud_tick(self.session, self.live_metrics)
         
         self.btn_start['state'] = 'disabled'; self.btn_stop['state'] = 'normal'; self.btn_question['state'] = 'normal'
         self.script_text['state'] = 'normal' # 녹화 중에도 스크롤 해야 하므로 normal
@@ -621,176 +784,230 @@ class App(tk.Tk):
         self.audience_loop()
 
     # [수정됨] Vosk 기반 실시간 SPM(음절) 측정 스레드
-    def speech_recognition_thread(self):
-        global speech_data, audio_data, pa, vosk_model
-        
-        SENSITIVITY = 5.0  
-        RATE = 16000
-        CHUNK = 4096
-        
+    def speech_recognition_thread(self, session, live=None):
         if not vosk_model: return
 
-        rec = KaldiRecognizer(vosk_model, RATE)
+        rec = KaldiRecognizer(vosk_model, AUDIO_RATE)
         
         try:
-            stream = pa.open(format=pyaudio.paInt16, channels=1, rate=RATE, input=True, frames_per_buffer=CHUNK)
+            if self.replay.get('audio'):
+                source = WavFileSource(self.replay['audio'], realtime=True).open() # 재생 모드
+            else:
+                source = MicrophoneSource(pa, AUDIO_RATE, AUDIO_CHUNK).open()
         except Exception as e:
             print(f"마이크 오류: {e}")
             return
 
-        last_speech_end = time.time()
-        last_vol = 0
+        # 볼륨/떨림/음절/필러/속도 마커 처리는 파일 재생(replay.py)과 공용
+        filler_words = app_config.FILLER_WORDS if 'app_config' in globals() and hasattr(app_config, 'FILLER_WORDS') else ()
+        analyzer = SpeechChunkAnalyzer(session, rec, filler_words, source.sensitivity, session.clock, live)
 
-        print(f"🎤 마이크 민감도 {SENSITIVITY}배 / SPM 모드로 시작")
+        print(f"🎤 마이크 민감도 {source.sensitivity}배 / SPM 모드로 시작")
 
-        while is_recording:
+        while session.is_recording:
             try:
-                if stream.get_read_available() < CHUNK:
+                data = source.read()
+                if data is None: break # 재생 파일 끝
+                if not data:
                     time.sleep(0.01)
                     continue
-                
-                data = stream.read(CHUNK, exception_on_overflow=False)
-                
-                # --- [민감도 조절] ---
-                audio_array = np.frombuffer(data, dtype=np.int16)
-                audio_array = audio_array * SENSITIVITY
-                audio_array = np.clip(audio_array, -32768, 32767)
-                data = audio_array.astype(np.int16).tobytes()
-                # ---------------------
-
-                self.raw_audio_frames.append(data)
-
-                # 볼륨/떨림 분석
-                rms = audioop.rms(data, 2)
-                if abs(rms - last_vol) > 2000 and rms > 500: 
-                    audio_data['tremble_count'] += 1
-                last_vol = rms
-                audio_data['volumes'].append(rms)
-
-                #vosk 음성 인식
-                if rec.AcceptWaveform(data):
-                    result = json.loads(rec.Result())
-                    text = result.get('text', '')
-                    
-                    if text:
-                        print(f"🎤 인식됨: {text}") # 디버깅용
-                        timestamp = time.time() - start_time
-                        
-                        # SPM(Syllables Per Minute) 로직
-                         # 공백 제거 후 순수 글자 수(음절)만 셉니다.
-                        syllable_count = len(text.replace(" ", "")) 
-                        speech_data['full_transcript'] += text + " "
 
-                        # 변수 이름은 word_count지만, 실제로는 이제 '음절 수'가 저장됩니다.
-                        speech_data['word_count'] += syllable_count 
-                        
-                        # 순간 속도(Instant SPM) 계산
-                        segment_duration = time.time() - last_speech_end
-                        if segment_duration > 0.5:
-                            # (글자수 / 시간초) * 60 = 분당 글자수
-                            instant_spm = (syllable_count / segment_duration) * 60
-                            
-                             # ⚡ SPM 기준 마커 찍기 (한국어 기준)
-                            # 450타 이상 = 말이 너무 빠름
-                            if instant_spm > 450: self.add_marker(timestamp, '⚡️') 
-                            # 200타 이하이고 글자가 좀 길면 = 말이 너무 느림
-                            elif instant_spm < 200 and syllable_count > 5: self.add_marker(timestamp, '🐢') 
-                            
-                        last_speech_end = time.time()
-
-                        if 'app_config' in globals() and hasattr(app_config, 'FILLER_WORDS'):
-                             words = text.split() 
-                             chunk_filler = sum(1 for w in words if w in app_config.FILLER_WORDS)
-                             speech_data['filler_count'] += chunk_filler
-                             if chunk_filler > 0: self.add_marker(timestamp, '💬')
+                with tracing.span("audio_chunk", "audio"):
+                    text = analyzer.process(data)
+                if text: print(f"🎤 인식됨: {text}") # 디버깅용
 
             except Exception as e:
                 print(f"오디오 스레드 오류: {e}")
                 continue
 
-        stream.stop_stream()
-        stream.close()
+        source.close()
         
         # 마지막 버퍼 처리 (FinalResult)
-        final_res = json.loads(rec.FinalResult())
-        final_text = final_res.get('text', '')
-        if final_text:
-            speech_data['full_transcript'] += final_text + " "
-            # 여기도 음절 수로 저장
-            speech_data['word_count'] += len(final_text.replace(" ", ""))
-
-    def add_marker(self, t, emoji):
-        if not timeline_markers or (t - timeline_markers[-1]['time'] > 1.5) or timeline_markers[-1]['label'] != emoji:
-            timeline_markers.append({'time': max(0.1, t), 'label': emoji})
+        analyzer.finish()
+
+    def _hud_tick(self, session, live):
+        """녹화 중 HUD를 HUD_REFRESH_MS마다 한 번 갱신 (음성/영상 스레드는 누적값만 갱신)"""
+        if self.hud is None or not self.hud.winfo_exists() or session is not self.session: return
+        with tracing.span("hud_render", "ui"):
+            self.hud.render(live.snapshot())
+        if session.is_recording:
+            self.after(HUD_REFRESH_MS, self._hud_tick, session, live)
+        else:
+            self.hud.place_forget()
 
     def stop_recording(self):
-        global is_recording
-        is_recording = False
+        if self.session: self.session.stop()
+        tracing.instant("recording_stop")
         self.original_script = self.script_text.get("1.0", tk.END).strip()
         self.btn_stop['state'] = 'disabled'
         self.btn_question['state'] = 'disabled'
         self.status_label.config(text="⏳ 저장 및 분석 중 (Whisper 구동)...", foreground="blue")
         self.update()
-        threading.Thread(target=self._finalize_and_analyze_thread, daemon=True).start()
-
-    def _finalize_and_analyze_thread(self):
-        global cap, out, speech_data 
-        
+        self.executor.submit(self._finalize_and_analyze_thread, self.session, kind='cpu', group='session',
+                             on_done=self._on_session_finalized)
+
+    def _finalize_and_analyze_thread(self, token, session):
+        """녹음 저장 + Whisper 정밀 전사 (CPU 풀). 완료되면 Tk 스레드에서 _on_session_finalized 호출"""
+        # 음성 스레드가 마지막 버퍼(FinalResult)까지 반영할 때까지 대기
+        with tracing.span("join_workers", "finalize"):
+            session.join_workers(timeout=5.0)
         try:
-            self.extracted_keywords = self.analysis_manager.extract_keywords_from_script(
-                self.original_script, self.AI_AVAILABLE, self.text_model 
-            )
+            # 키워드는 기본적으로 로컬 TF-IDF로 추출 (Gemini 호출 절약)
+            use_ai_keywords = self.AI_AVAILABLE and getattr(app_config, 'USE_AI_KEYWORDS', False)
+            with tracing.span("keywords", "finalize"):
+                self.extracted_keywords = self.analysis_manager.extract_keywords_from_script(
+                    self.original_script, use_ai_keywords, self.text_model 
+                )
         except: self.extracted_keywords = []
         
-        try:
-            if self.raw_audio_frames:
-                wf = wave.open("output.wav", 'wb')
-                wf.setnchannels(1) 
-                wf.setsampwidth(2) 
-                wf.setframerate(16000) 
-                wf.writeframes(b''.join(self.raw_audio_frames))
-                wf.close()
-                print("✅ output.wav 저장 완료.")
-            else:
-                print("❌ 저장할 오디오 데이터 없음")
-                return 
-        except Exception as e:
-            print(f"wav 저장 실패: {e}")
+        pcm = None
+        with tracing.span("save_audio", "finalize"):
+            try:
+                pcm = session.audio_pcm()
+                if pcm:
+                    session.duration_sec = len(pcm) / 2 / 16000 # 16bit 모노 16kHz
+                    if self.session_archive and session.session_id:
+                        session.audio_path = self.session_archive.save_audio(session.session_id, pcm, 16000)
+                    else:
+                        session.audio_path = "output.wav"
+                        with wave.open(session.audio_path, 'wb') as wf:
+                            wf.setnchannels(1); wf.setsampwidth(2); wf.setframerate(16000)
+                            wf.writeframes(pcm)
+                    print(f"✅ 음성 저장 완료: {session.audio_path}")
+                else:
+                    print("❌ 저장할 오디오 데이터 없음")
+                    return None
+            except Exception as e:
+                print(f"wav 저장 실패: {e}")
+        if token.cancelled: return None
+
+        # 억양/쉼 분석 (NumPy 일괄 계산, 30분 녹음도 몇 초)
+        if pcm:
+            with tracing.span("prosody", "finalize"):
+                try:
+                    session.prosody = analyze_prosody(pcm, 16000)
+                except Exception as e:
+                    print(f"억양 분석 실패: {e}")
 
         # Whisper 하이브리드 로직
         # Vosk가 대충 받아적은걸 Whisper가 '정밀 청취'하여 덮어씁니다.
         try:
             print("⏳ Whisper 정밀 분석 시작 (잠시만 기다리세요)...")
 
-            # 모델 로드 (tiny, base, small 중 선택. small이 한국어 성능/속도 밸런스 굿)
-            # device="cpu", compute_type="int8" -> CPU에서 빠르게 돌리기 위한 설정
-            model = WhisperModel("small", device="cpu", compute_type="int8")
+            # 앱 시작 시 백그라운드에서 한 번만 로드한 모델을 재사용 (아직 로드 중이면 대기)
+            model = startup_loader.get('whisper')
+            if model is None: raise RuntimeError("Whisper 모델을 불러오지 못했습니다.")
 
             # 변환 실행 (beam_size=5는 정확도를 높임)
-            segments, info = model.transcribe("output.wav", beam_size=5, language="ko")
-            
-            whisper_text = ""
-            for segment in segments:
-                whisper_text += segment.text + " "
+            with tracing.span("whisper", "finalize"):
+                whisper_text = transcribe(model, session.audio_path)
             
             print(f"✅ Whisper 변환 결과: {whisper_text}")
             # [핵심] Vosk가 작성한 엉성한 대본을 Whisper의 완벽한 대본으로 교체!
-            speech_data['full_transcript'] = whisper_text.strip()
+            session.set_transcript(whisper_text)
             
         except Exception as e:
             print(f"❌ Whisper 분석 실패 (Vosk 결과 유지): {e}")
      
-        time.sleep(1.0)
-        if out: out.release(); out = None
-        if cap: cap.release(); cap = None
-            
-        if self.winfo_exists(): 
-            self.after(0, self.show_analysis_page)
+        session.close_video()
+        return session
+
+    def _on_session_finalized(self, session):
+        if session is None: self._finish_trace(None) # 저장할 녹음이 없어 분석 화면 없이 끝난 세션
+        if session is None or not self.winfo_exists(): return
+        # 카메라는 Tk 스레드에서만 다룸
+        if self.cap: self.cap.release(); self.cap = None
+        self.show_analysis_page(session=session)
 
     # =========================================================================
     # [수정됨] 분석 페이지: 감점 로직 반영 & 유창성 설명 추가
     # =========================================================================
-    def show_analysis_page(self):
+    def compute_session_result(self, session):
+        """끝난 녹화의 점수/지표 계산 (화면 표시와 분리, 세션 보관함에 그대로 저장됨)"""
+        snapshot = session.snapshot()
+        speech_data, gaze_data, audio_data = snapshot['speech'], snapshot['gaze'], snapshot['audio']
+        
+        # 실제 오디오 길이 기반 시간 측정 (녹음된 PCM 길이로 계산)
+        if session.duration_sec:
+            duration_sec = max(0.6, session.duration_sec)
+            print(f"⏱️ 실제 녹음 시간: {session.duration_sec:.2f}초") # 디버깅용
+        else:
+            duration_sec = max(6.0, session.elapsed())
+
+        # 점수 계산은 배치 분석(batch_analyze.py)과 같은 함수 사용
+        result = compute_scores(self.original_script, speech_data['full_transcript'], speech_data['word_count'],
+                                speech_data['filler_count'], gaze_data, audio_data['tremble_count'], duration_sec, session.mode,
+                                prosody=session.prosody)
+        result.update({
+            "created": time.time(), "mode": session.mode, "script": self.original_script,
+            "transcript": speech_data['full_transcript'], "volumes": audio_data['volumes'],
+            "volume_stats": snapshot['stats']['volume'], "per_minute": snapshot['stats']['per_minute'],
+            "markers": snapshot['markers'], "keywords": list(self.extracted_keywords), "prosody": session.prosody
+        })
+        return result
+
+    def show_analysis_page(self, result=None, session_id=None, session=None):
+        """session(끝난 녹화)을 주면 분석/저장하고, result를 주면 보관된 세션을 재분석 없이 다시 표시"""
+        review_audio_path = None
+        if result is None:
+            with tracing.span("compute_scores", "analysis"):
+                result = self.compute_session_result(session)
+            session_id = session.session_id
+            review_audio_path = session.audio_path
+            with tracing.span("save_history", "analysis"):
+                result['personal_bests'] = self.save_history(result['total_score'], result['mode'], {
+                "spm": result['spm'], "score_speed": result['score_speed'], "match_rate": result['match_rate'],
+                "gaze": result['gaze'], "script_penalty": result['script_penalty'], "fluency": result['fluency'],
+                "filler_count": result['filler_count'], "tremble_count": result['tremble_count']
+            }, result['duration_sec'])
+            # AI 리포트는 LLM 대기열/재시도 때문에 오래 걸릴 수 있어 화면을 먼저 띄운 뒤 io 풀에서 작성
+            result['report'] = None
+            if self.session_archive and session_id:
+                try:
+                    self.session_archive.save_result(session_id, result)
+                    self.session_archive.apply_retention()
+                except Exception as e:
+                    print(f"세션 결과 저장 실패: {e}")
+
+        # 리뷰용 영상/음성/마커는 해당 세션 폴더의 파일을 사용
+        if self.session_archive and session_id:
+            self.review_video_path = self.session_archive.path(session_id, VIDEO_FILE)
+            self.review_audio_path = self.session_archive.audio_path(session_id)
+        else:
+            self.review_video_path, self.review_audio_path = 'output.avi', review_audio_path
+        self.review_markers = result.get('markers', [])
+        report_pending = result.get('report') is None and session is not None
+        self.render_analysis_page(result, report_pending)
+        if report_pending:
+            # render가 clear_window로 이전 화면 작업을 정리한 뒤 제출 (이 화면을 떠나면 'page' 그룹과 함께 취소)
+            # 성능 기록은 리포트(LLM 호출 구간 포함)가 끝나거나 실패/취소된 뒤에 저장하고 멈춤
+            self.executor.submit(self._feedback_report_task, result, kind='io', group='page',
+                                 on_done=lambda outcome: self._on_feedback_report(result, session_id, outcome),
+                                 on_error=lambda e: self._on_feedback_report_error(session_id, e),
+                                 on_cancel=lambda: self._finish_trace(session_id))
+
+    def _finish_trace(self, session_id):
+        """추적 중이면 기록을 멈추고, 세션 폴더가 있으면 trace.json 저장 (chrome://tracing, ui.perfetto.dev에서 열기)
+
+        보관함이 없거나 저장에 실패해도 세션이 끝나면 항상 멈추고 비움 (다음 녹화 전까지 이벤트가 쌓이지 않게)
+        """
+        if not tracing.enabled(): return
+        # 리포트가 늦게 끝나는 사이 새 녹화가 시작됐으면 그 녹화의 기록은 건드리지 않음
+        if session_id is not None and tracing.meta().get('session_id') not in (None, session_id): return
+        tracing.stop()
+        try:
+            if self.session_archive and session_id:
+                path = self.session_archive.path(session_id, TRACE_FILE)
+                count = tracing.export(path)
+                slowest = sorted(tracing.summary().items(), key=lambda item: -item[1]["total_ms"])[:5]
+                print(f"🧭 성능 기록 저장: {path} (이벤트 {count}개) / 오래 걸린 구간: " +
+                      ", ".join(f"{name} {s['total_ms']:.0f}ms" for name, s in slowest))
+        except Exception as e:
+            print(f"성능 기록 저장 실패: {e}")
+        finally:
+            tracing.clear()
+
+    def render_analysis_page(self, result, report_pending=False):
         self.clear_window()
         main_canvas = tk.Canvas(self)
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=main_canvas.yview)
@@ -805,90 +1022,22 @@ class App(tk.Tk):
         content = ttk.Frame(scrollable_frame, padding=30)
         content.pack(fill='both', expand=True)
 
-        global speech_data, gaze_data, audio_data, start_time
-        
-        # 실제 오디오 길이 기반 시간 측정
-        duration_min = max(0.1, (time.time() - start_time) / 60)
-        try:
-            # output.wav 파일의 헤더를 읽어서 정확한 녹음 시간(초)을 구함
-            with contextlib.closing(wave.open("output.wav", 'r')) as f:
-                frames = f.getnframes()
-                rate = f.getframerate()
-                duration_sec = frames / float(rate)
-                duration_min = max(0.01, duration_sec / 60)
-                print(f"⏱️ 실제 녹음 시간: {duration_sec:.2f}초") # 디버깅용
-        except Exception as e:
-            print(f"시간 계산 오류(백업 로직 사용): {e}")
-            duration_min = max(0.1, (time.time() - start_time) / 60)
-
-        # Whisper 텍스트 가져오기
-        current_transcript = speech_data['full_transcript']
-        
-        # 공백 제외 순수 글자 수 (음절)
-        char_count = len(current_transcript.replace(" ", ""))   
-
-        # 속도 점수
-        spm = int(speech_data['word_count'] / duration_min) if speech_data['word_count'] > 0 else 0 
-        score_speed = max(0, 100 - int(abs(350 - spm) * 0.4))
-        speed_eval = "적정"
-        if spm < 280: speed_eval = "느림 🐢"
-        elif spm > 420: speed_eval = "빠름 ⚡"
-        
-        # 시선 처리 점수 (감점 로직 적용)
-        total_frames = max(1, gaze_data['total_frames'])
-        
-        # 1. 정면 응시율 (기본 점수)
-        base_gaze_score = (gaze_data['looking_frames'] / total_frames) * 100
-        
-        # 2. 대본 응시(Looking Down) 감점
-        script_penalty = (gaze_data['script_frames'] / total_frames) * 150 # 감점 가중치
-        
-        # 3. 최종 시선 점수
-        final_gaze_score = max(0, min(100, int(base_gaze_score - script_penalty)))
-        
-        # 전달률 점수(Whisper 기반)
-        import difflib
-        script = self.original_script
-        if len(current_transcript.strip()) > 5:
-            def clean_text(text):
-                return re.sub(r'[^가-힣a-zA-Z0-9]', '', text)
-            clean_script = clean_text(script)
-            clean_trans = clean_text(current_transcript)
-            matcher = difflib.SequenceMatcher(None, clean_script, clean_trans)
-            raw_score = matcher.ratio() * 100
-            match_rate = int(raw_score * 1.05) # 약간의 보정
-            if match_rate > 100: match_rate = 100
-            match_label_text = "전달률"
-        else:
-            match_rate = 0
-            match_label_text = "데이터 부족"
-
-        # 유창성 점수
-        filler_deduction = speech_data['filler_count'] * 3
-        tremble_score = max(0, 100 - int(audio_data['tremble_count'] / duration_min * 2))
-        score_fluency = int((max(0, 100 - filler_deduction) + tremble_score) / 2)
-        
-        # 종합 점수
-        mode = self.user_settings.get('atmosphere', '정보')
-        if '정보' in mode: total_score = int(match_rate * 0.4 + score_fluency * 0.3 + final_gaze_score * 0.2 + score_speed * 0.1)
-        elif '설득' in mode: total_score = int(final_gaze_score * 0.4 + score_speed * 0.2 + score_fluency * 0.2 + match_rate * 0.2)
-        else: total_score = int(match_rate * 0.3 + final_gaze_score * 0.3 + score_fluency * 0.2 + score_speed * 0.2)
-        self.save_history(total_score)
-        
         # UI 표시
-        tk.Label(content, text=f"🏆 종합 점수: {total_score}점", font=("Arial", 36, "bold"), fg="#007aff").pack(pady=20)
+        tk.Label(content, text=f"🏆 종합 점수: {result['total_score']}점", font=("Arial", 36, "bold"), fg="#007aff").pack(pady=20)
+        tk.Label(content, text=time.strftime("%Y-%m-%d %H:%M", time.localtime(result['created'])) + f"  |  {result['mode']}", 
+                 font=("Arial", 11), fg="gray").pack()
         
-        if gaze_data['script_frames'] > total_frames * 0.2:
-            tk.Label(content, text=f"⚠️ 대본을 너무 자주 보셨습니다! (감점 -{int(script_penalty)}점)", font=("Arial", 12), fg="red").pack()
+        if result['script_warning']:
+            tk.Label(content, text=f"⚠️ 대본을 너무 자주 보셨습니다! (감점 -{int(result['script_penalty'])}점)", font=("Arial", 12), fg="red").pack()
 
         summary = ttk.Frame(content)
         summary.pack(pady=10, fill='x')
         for i in range(4): summary.columnconfigure(i, weight=1)
-        self.create_stat_card(summary, 0, f"🗣️ 속도 ({speed_eval})", f"{spm} SPM", score_speed)
-        self.create_stat_card(summary, 1, f"📝 {match_label_text}", f"{match_rate}%", match_rate)
-        self.create_stat_card(summary, 2, "👀 시선 처리", f"{final_gaze_score}점", final_gaze_score)
+        self.create_stat_card(summary, 0, f"🗣️ 속도 ({result['speed_eval']})", f"{result['spm']} SPM", result['score_speed'])
+        self.create_stat_card(summary, 1, f"📝 {result['match_label_text']}", f"{result['match_rate']}%", result['match_rate'])
+        self.create_stat_card(summary, 2, "👀 시선 처리", f"{result['gaze']}점", result['gaze'])
         # [수정됨] 유창성 설명 추가
-        self.create_stat_card(summary, 3, "🌊 유창성\n(필러워 횟수, 말 공백으로 평가)", f"{score_fluency}점", score_fluency)
+        self.create_stat_card(summary, 3, "🌊 유창성\n(필러워 횟수, 말 공백으로 평가)", f"{result['fluency']}점", result['fluency'])
         
         try:
             self.create_video_player(content)
@@ -898,9 +1047,11 @@ class App(tk.Tk):
             # 그래프 그리기 (가장 에러 많이 나는 곳 - 안전장치 추가)
         try:
             self.create_score_graph(content)
+            if result.get('per_minute'): self.create_minute_chart(content, result['per_minute'])
         except Exception as e:
                 tk.Label(content, text=f"그래프 생성 실패: {e}", fg="red").pack()
-        self.create_feedback_section(content, mode, match_rate, final_gaze_score, score_fluency, spm, speech_data['full_transcript'], audio_data['volumes'])
+        self.create_progress_panel(content, result)
+        self.create_feedback_section(content, result.get('report'), report_pending)
         
         ttk.Button(content, text="처음으로 돌아가기", command=self.show_setup_page).pack(pady=30)
         self.load_video()
@@ -928,77 +1079,112 @@ class App(tk.Tk):
         graph_frame = ttk.Frame(parent)
         graph_frame.pack(fill='x', pady=20, padx=20)
 
-        fig, ax = plt.subplots(figsize=(8, 2.5))
-        history_len = len(self.history)
-
-        if history_len > 0:
-            # X축 데이터 생성 (1, 2, 3...)
-            x_ticks = range(1, history_len + 1)
-            
-            # 그래프 그리기
-            ax.plot(x_ticks, self.history, marker='o', linestyle='-', color='#007aff', linewidth=2)
-            ax.fill_between(x_ticks, self.history, color='#007aff', alpha=0.1)
-            ax.set_title("연습 점수 트렌드")
-            ax.set_ylim(0, 105)
-            ax.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
- 
-            
-            ax.set_xlim(0.5, history_len + 0.5)
-            ax.grid(True, linestyle='--')
-            
-        else:
-            # 데이터가 없을 때 빈 그래프 처리
-            ax.set_title("아직 연습 기록이 없습니다")
-            ax.set_yticks([])
-            ax.set_xticks([])
-
-        canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both')
-
-    def create_feedback_section(self, parent, mode_raw, match_rate, gaze_ratio, fluency, spm, transcript, volume_data):
+        # Figure를 매번 만들지 않고 Canvas에 직접 그림 (기록이 많으면 자동 다운샘플링)
+        chart = TrendChart(graph_frame, width=800, height=250)
+        chart.pack(fill='both')
+        chart.set_data(self.history)
+
+    def create_minute_chart(self, parent, per_minute):
+        """분 단위 속도(막대)와 정면 응시 비율(점) - 녹화 중 누적된 구간 통계만 사용"""
+        frame = ttk.LabelFrame(parent, text=" ⏱️ 분 단위 흐름 (막대: 속도 SPM / 점: 정면 응시 비율) ")
+        frame.pack(fill='x', pady=10, padx=20)
+        width, height, pad = 800, 180, 30
+        canvas = tk.Canvas(frame, width=width, height=height, bg="white", highlightthickness=0)
+        canvas.pack(pady=5)
+
+        max_spm = max(600, max(row['spm'] for row in per_minute))
+        slot = (width - 2 * pad) / len(per_minute)
+        y_of = lambda ratio: height - pad - ratio * (height - 2 * pad)
+        # 적정 속도 구간(280~420 SPM) 배경
+        canvas.create_rectangle(pad, y_of(420 / max_spm), width - pad, y_of(280 / max_spm), fill="#eef7ee", outline="")
+        for i, row in enumerate(per_minute):
+            x0 = pad + i * slot + slot * 0.2
+            x1 = pad + (i + 1) * slot - slot * 0.2
+            color = "#ffb300" if row['spm'] > 420 else "#64b5f6" if row['spm'] < 280 else "#4caf50"
+            canvas.create_rectangle(x0, y_of(row['spm'] / max_spm), x1, y_of(0), fill=color, outline="")
+            if row['gaze_ratio'] is not None:
+                cx, cy = (x0 + x1) / 2, y_of(row['gaze_ratio'])
+                canvas.create_oval(cx - 4, cy - 4, cx + 4, cy + 4, fill="#007aff", outline="")
+            if len(per_minute) <= 30 or i % 5 == 0:
+                canvas.create_text((x0 + x1) / 2, height - pad / 2, text=f"{row['minute']}분", font=("Arial", 8), fill="gray")
+
+    def build_feedback_report(self, mode_raw, spm, transcript, volume_data, prosody=None, cancel_token=None):
+        """규칙 기반 + AI 코칭 리포트 텍스트 생성 -> (리포트, 통합 분석 dict 또는 None)
+
+        LLM 호출이 있으므로 Tk 스레드가 아닌 io 풀에서 호출 (_feedback_report_task)
+        """
+        text_model = self.text_model if self.AI_AVAILABLE else None
+        return self.analysis_manager.build_feedback_report(
+            text_model, mode_raw, self.original_script, spm, transcript, volume_data, prosody, cancel_token
+        )
+
+    def _feedback_report_task(self, token, result):
+        with tracing.span("feedback_report", "analysis"):
+            return self.build_feedback_report(result['mode'], result['spm'], result['transcript'], result['volume_stats'],
+                                              result['prosody'], token)
+
+    def _on_feedback_report(self, result, session_id, outcome):
+        """리포트 완료 (Tk 스레드): 화면 갱신 + 세션 결과 다시 저장 (다시 보기 시 재사용)"""
+        report, combined = outcome
+        result['report'] = report
+        if combined:
+            # 키워드는 점수 계산(compute_scores)에 쓰이지 않는 표시/저장용이라 점수를 낸 뒤 AI 결과로 바꿔도 점수와 어긋나지 않음
+            if combined['keywords']: self.extracted_keywords = result['keywords'] = combined['keywords']
+            # 예상 질문은 이번 세션이 아니라 같은 대본으로 다시 연습할 때의 돌발 질문으로 재사용 (추가 호출 없음)
+            if combined['question']: self.question_pool.seed(self.original_script, result['mode'], combined['question'])
+        self._set_feedback_text(report)
+        if self.session_archive and session_id:
+            try:
+                self.session_archive.save_result(session_id, result)
+            except Exception as e:
+                print(f"세션 결과 저장 실패: {e}")
+        self._finish_trace(session_id)
+
+    def _on_feedback_report_error(self, session_id, error):
+        self._set_feedback_text(f"AI 피드백 생성 실패: {error}")
+        self._finish_trace(session_id)
+
+    def create_progress_panel(self, parent, result):
+        """지표별 이번 기록 / 최근 이동 평균 / 전체 평균 / 개인 최고 (저장된 누적 통계만 사용하므로 기록 수와 무관)"""
+        if not self.progress: return
+        mode = result['mode']
+        summary = self.progress.summary(mode) or self.progress.summary()
+        if not summary: return
+        bests = set(result.get('personal_bests', []))
+
+        panel = tk.LabelFrame(parent, text=f"📈 나의 성장 기록 ({mode})", font=("Arial", 14, "bold"))
+        panel.pack(fill='x', pady=20, padx=20, ipady=5)
+        headers = ["지표", "이번", f"최근 {self.progress.window}회 평균", "전체 평균", "최고 기록", "연습 횟수"]
+        for col, text in enumerate(headers):
+            panel.columnconfigure(col, weight=1)
+            tk.Label(panel, text=text, font=("Arial", 11, "bold")).grid(row=0, column=col, pady=(5, 2))
+
+        def fmt(v): return "-" if v is None else f"{v:.0f}"
+        for row, (name, info) in enumerate(summary.items(), start=1):
+            current = result.get(name)
+            is_best = name in bests
+            cells = [info['label'], fmt(current), fmt(info['moving_avg']), f"{fmt(info['mean'])} ± {info['std']:.0f}",
+                     fmt(info['best']) + (" 🎉" if is_best else ""), str(info['count'])]
+            for col, text in enumerate(cells):
+                tk.Label(panel, text=text, font=("Arial", 11), fg="#d9480f" if is_best and col in (1, 4) else "black").grid(row=row, column=col)
+
+    def create_feedback_section(self, parent, report_text, pending=False):
         fb_frame = tk.LabelFrame(parent, text="🤖 AI 코치 피드백", font=("Arial", 14, "bold"))
         fb_frame.pack(fill='x', pady=20, ipady=10)
-        
-        if '정보' in mode_raw: mapped_mode = '논리적'; target_type_key = 'A'
-        elif '공감' in mode_raw: mapped_mode = '친화적'; target_type_key = 'C'
-        else: mapped_mode = '열정적'; target_type_key = 'B'
-        
-        final_report_text = ""
-        if spm == 0 and len(transcript.strip()) < 10:
-            final_report_text = "🚨 **데이터 부족:** 음성 데이터가 충분히 인식되지 않았습니다."
-        else:
-            final_report_text += "--- 📈 AI 코칭 리포트 (규칙 기반) ---\n"
-            style_feedback = self.analysis_manager.analyze_speech_style(transcript, mapped_mode)
-            energy_feedback = self.analysis_manager.analyze_vocal_energy(volume_data, mapped_mode)
-            delivery_metrics = {"spm": spm} 
-            
-            final_report_text += f"{style_feedback}\n{energy_feedback}\n\n"
-            
-            imrad_report = []
-            if target_type_key == 'A': imrad_report = self.imrad_validator.validate_imrad_sections(self.original_script)
-            if imrad_report: final_report_text += "--- [논리 구조 경고] ---\n" + "\n".join(imrad_report) + "\n\n"
-            
-            final_report_text += "--- 🤖 AI 심층 피드백 (Gemini) ---\n"
-            ai_generated_feedback = None 
-            if self.AI_AVAILABLE and self.text_model: 
-                try:
-                    ai_generated_feedback = self.analysis_manager.generate_ai_feedback(
-                        self.text_model, transcript, target_type_key, delivery_metrics, 
-                        style_feedback, energy_feedback, imrad_report
-                    )
-                except Exception as e:
-                    ai_generated_feedback = f"오류: {e}"
-            
-            if ai_generated_feedback: final_report_text += ai_generated_feedback
-            else: final_report_text += "Gemini API 미연결로 심층 피드백을 건너뜁니다."
-        
-        tk.Label(fb_frame, text=final_report_text, font=("Arial", 12), justify="left", wraplength=800, padx=20).pack(anchor='w', fill='x')
+        if pending: report_text = "⏳ AI 코치가 피드백을 작성하고 있습니다..."
+        elif report_text is None: report_text = "(저장된 AI 피드백이 없습니다)"
+        self.feedback_label = tk.Label(fb_frame, text=report_text, font=("Arial", 12), justify="left", wraplength=800, padx=20)
+        self.feedback_label.pack(anchor='w', fill='x')
+
+    def _set_feedback_text(self, text):
+        if self.feedback_label is not None and self.feedback_label.winfo_exists():
+            self.feedback_label.config(text=text)
 
     def load_video(self):
         try:
-            if not os.path.exists('output.avi'): return
-            self.vid_cap = cv2.VideoCapture('output.avi')
+            if not self.review_video_path or not os.path.exists(self.review_video_path): return
+            import cv2
+            self.vid_cap = cv2.VideoCapture(self.review_video_path)
             self.vid_duration = max(1, self.vid_cap.get(cv2.CAP_PROP_FRAME_COUNT) / self.vid_cap.get(cv2.CAP_PROP_FPS))
             self.is_playing = False
             self.draw_timeline()
@@ -1013,7 +1199,7 @@ class App(tk.Tk):
             w = self.timeline.winfo_width()
             if w < 2: w = 1100 
             self.timeline.create_line(0, 20, w, 20, fill="#ced4da", width=2)
-            for m in timeline_markers:
+            for m in self.review_markers:
                 if self.vid_duration > 0:
                     x = (m['time'] / self.vid_duration) * w
                     self.timeline.create_text(x, 20, text=m['label'], font=("Arial", 16), tags=(str(m['time']),))
@@ -1029,29 +1215,30 @@ class App(tk.Tk):
             
     def seek(self, sec):
         if hasattr(self, 'vid_cap') and self.vid_cap and self.vid_cap.isOpened():
+            import cv2
             self.vid_cap.set(cv2.CAP_PROP_POS_FRAMES, int(sec * self.vid_cap.get(cv2.CAP_PROP_FPS)))
             self.update_frame()
 
-    def audio_playback_thread(self):
-        global pa
+    def audio_playback_thread(self, token):
         CHUNK = 1024
         try:
-            if not os.path.exists("output.wav"): return
-            wf = wave.open("output.wav", 'rb')
-            stream = pa.open(format=pa.get_format_from_width(wf.getsampwidth()),
-                             channels=wf.getnchannels(), rate=wf.getframerate(), output=True)
-            data = wf.readframes(CHUNK)
-            while data and self.is_playing:
-                stream.write(data)
-                data = wf.readframes(CHUNK)
-            stream.stop_stream(); stream.close(); wf.close()
+            if not self.review_audio_path or not os.path.exists(self.review_audio_path): return
+            if startup_loader.get('pyaudio') is None: return
+            # FLAC/WAV 모두 16bit 모노 PCM으로 읽어서 재생
+            pcm, rate = SessionArchive.load_audio(self.review_audio_path)
+            stream = pa.open(format=pyaudio.paInt16, channels=1, rate=rate, output=True)
+            step = CHUNK * 2
+            for i in range(0, len(pcm), step):
+                if not self.is_playing or token.cancelled: break
+                stream.write(pcm[i:i + step])
+            stream.stop_stream(); stream.close()
         except Exception as e: print(f"오디오 재생 오류: {e}")
         self.is_playing = False
 
     def play_video_with_sound(self):
         if self.is_playing: return
         self.is_playing = True
-        threading.Thread(target=self.audio_playback_thread, daemon=True).start()
+        self.executor.submit(self.audio_playback_thread, group='page')
         self.play_video_loop()
 
     def stop_video(self):
@@ -1060,6 +1247,7 @@ class App(tk.Tk):
     def play_video_loop(self):
         if not self.winfo_exists() or not self.is_playing: return
         if self.vid_cap and self.vid_cap.isOpened():
+            import cv2
             ret, frame = self.vid_cap.read()
             if ret:
                 self.show_frame(frame)
@@ -1076,6 +1264,8 @@ class App(tk.Tk):
             if ret: self.show_frame(frame)
 
     def show_frame(self, frame):
+        import cv2
+        from PIL import Image, ImageTk
         try:
             if not hasattr(self, 'vid_player_label') or not self.vid_player_label.winfo_exists(): return
             w = self.vid_player_label.winfo_width()
@@ -1112,25 +1302,99 @@ class App(tk.Tk):
         action_frame = ttk.Frame(main_frame); action_frame.pack(fill='x', pady=10)
         self.rewrite_status_label = ttk.Label(action_frame, text="준비 완료", foreground="gray"); self.rewrite_status_label.pack(side='left', padx=10)
         self.rewrite_btn = ttk.Button(action_frame, text="🚀 변환 실행", command=self.run_rewriter); self.rewrite_btn.pack(side='right')
+        self.rewrite_cancel_btn = ttk.Button(action_frame, text="⏹ 취소", command=self.cancel_rewrite, state='disabled'); self.rewrite_cancel_btn.pack(side='right', padx=5)
+        self.rewrite_task = None
+        self.rewrite_queue = None
+        self.rewriter_win.protocol("WM_DELETE_WINDOW", self._close_rewriter_window)
+
+    def _close_rewriter_window(self):
+        self.cancel_rewrite()
+        self.rewriter_win.destroy()
 
     def run_rewriter(self):
         script = self.original_text.get("1.0", tk.END).strip()
         if len(script) < 20: return
+        self.cancel_rewrite() # 진행 중인 이전 변환은 중단
+        self.rewrite_queue = queue.Queue()
+        self.rewritten_text.config(state='normal'); self.rewritten_text.delete("1.0", tk.END); self.rewritten_text.config(state='disabled')
         self.rewrite_status_label.config(text="AI가 변환 중...", foreground="blue")
-        threading.Thread(target=self._rewrite_thread_target, args=(script, self.rewrite_mode.get()), daemon=True).start()
+        self.rewrite_cancel_btn.config(state='normal')
+        self.rewrite_task = self.executor.submit(self._rewrite_thread_target, script, self.rewrite_mode.get(), self.rewrite_queue, group='rewriter')
+        self.after(33, self._drain_rewrite_queue, self.rewrite_queue)
+
+    def cancel_rewrite(self):
+        if self.rewrite_task and not self.rewrite_task.done():
+            self.rewrite_task.cancel()
+            # 시작 전에 취소되면 작업이 큐에 아무것도 넣지 않으므로 여기서 종료를 알림
+            if self.rewrite_queue: self.rewrite_queue.put(('cancelled', None))
+        self.rewrite_task = None
+
+    def _rewrite_thread_target(self, cancel_event, script, mode, out_queue):
+        # 결과는 큐에만 넣고, 위젯 갱신은 _drain_rewrite_queue가 프레임 단위로 모아서 처리
+        if self.ai_announcer.find_previous_rewrite(script, mode) is not None:
+            # 이미 변환한 대본을 고친 경우: 이전 결과와 바뀐 구간만 보내 한 번에 갱신
+            try:
+                res = self.ai_announcer.rewrite_incremental(script, mode, cancel_event=cancel_event)
+                if res is None: out_queue.put(('cancelled', None))
+                elif res.startswith("❌"): out_queue.put(('error', res))
+                else: out_queue.put(('done', res))
+            except Exception as e:
+                out_queue.put(('error', f"오류: {e}"))
+            return
 
-    def _rewrite_thread_target(self, script, mode):
+        # 처음 변환하는 대본: 줄 수와 관계없이 전체를 한 번에 스트리밍
+        parts = []
         try:
-            res = self.ai_announcer.rewrite(script, mode)
-            if self.winfo_exists(): self.after(0, self.update_rewriter_ui, res)
+            for chunk in self.ai_announcer.rewrite_stream(script, mode, cancel_event):
+                parts.append(chunk)
+                out_queue.put(('chunk', chunk))
+            out_queue.put(('cancelled', None) if cancel_event.is_set() else ('done', ''.join(parts)))
         except Exception as e:
-            if self.winfo_exists(): self.after(0, self.update_rewriter_ui, f"오류: {e}")
+            out_queue.put(('error', f"오류: {e}"))
+
+    def _drain_rewrite_queue(self, out_queue):
+        """약 30fps 간격으로 쌓인 조각을 한 번에 Text 위젯에 덧붙임"""
+        if not (hasattr(self, 'rewriter_win') and self.rewriter_win.winfo_exists()): return
+        if out_queue is not self.rewrite_queue: return # 새 변환이 시작되어 버려진 큐
+
+        batch, final = [], None
+        while True:
+            try: kind, payload = out_queue.get_nowait()
+            except queue.Empty: break
+            if kind == 'chunk': batch.append(payload)
+            else: final = (kind, payload); break
+
+        if batch:
+            if self.rewrite_status_label.cget('text') == "AI가 변환 중...":
+                self.rewrite_status_label.config(text="AI가 작성 중... (실시간)", foreground="blue")
+            self.rewritten_text.config(state='normal'); self.rewritten_text.insert(tk.END, ''.join(batch)); self.rewritten_text.see(tk.END); self.rewritten_text.config(state='disabled')
+
+        if final is None:
+            self.after(33, self._drain_rewrite_queue, out_queue)
+            return
+
+        self.rewrite_cancel_btn.config(state='disabled')
+        kind, payload = final
+        if kind == 'cancelled':
+            self.rewrite_status_label.config(text="취소됨", foreground="gray")
+        else:
+            # 완료 시 전체 텍스트로 한 번 더 덮어써서 일반 호출 결과와 동일하게 맞춤
+            self.update_rewriter_ui(payload)
 
     def update_rewriter_ui(self, res):
         if hasattr(self, 'rewriter_win') and self.rewriter_win.winfo_exists():
             self.rewritten_text.config(state='normal'); self.rewritten_text.delete("1.0", tk.END); self.rewritten_text.insert("1.0", res); self.rewritten_text.config(state='disabled')
             self.rewrite_status_label.config(text="완료" if "오류" not in res else "실패", foreground="green" if "오류" not in res else "red")
 
+def parse_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="AI Presentation Pro")
+    parser.add_argument("--replay-audio", help="마이크 대신 재생할 녹음 파일 (wav/flac)")
+    parser.add_argument("--replay-video", help="카메라 대신 재생할 녹화 영상 (avi)")
+    parser.add_argument("--seed", type=int, help="청중 반응/돌발 질문 선택용 난수 시드")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    app = App()
+    args = parse_args()
+    app = App({"audio": args.replay_audio, "video": args.replay_video, "seed": args.seed})
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,152 @@
+import math
+from collections import deque
+
+# 지표 이름 -> (표시 이름, 최고 기록 방향: 'max' / 'min' / None(최고 기록 없음))
+PROGRESS_METRICS = {
+    "total_score": ("종합 점수", "max"),
+    "spm": ("속도(SPM)", None),
+    "score_speed": ("속도 점수", "max"),
+    "match_rate": ("전달률", "max"),
+    "gaze": ("시선 처리", "max"),
+    "fluency": ("유창성", "max"),
+    "filler_count": ("필러워 횟수", "min"),
+}
+ALL_MODES = "전체"
+STATE_KEY = "progress_analytics"
+
+class MetricAggregate:
+    """지표 하나의 누적 통계 (개수/합/제곱합 -> 평균·표준편차, 최고 기록, 최근 N회 이동 평균)
+
+    update()는 O(1)이며, 이동 평균도 창(deque)의 합을 유지해 매번 다시 더하지 않습니다.
+    """
+    def __init__(self, direction, window):
+        self.direction = direction
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.best = None
+        self.best_session = None
+        self.last = None
+        self.recent = deque(maxlen=window)
+        self.recent_sum = 0.0
+
+    def update(self, value, session_id=None):
+        """값 하나 추가. 최고 기록을 갱신했으면 True"""
+        value = float(value)
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        self.last = value
+        if len(self.recent) == self.recent.maxlen: self.recent_sum -= self.recent[0]
+        self.recent.append(value)
+        self.recent_sum += value
+
+        if self.direction is None: return False
+        improved = self.best is None or (value > self.best if self.direction == 'max' else value < self.best)
+        if improved:
+            self.best, self.best_session = value, session_id
+        # 첫 기록은 비교 대상이 없으므로 '최고 기록 갱신'으로 치지 않음
+        return improved and self.count > 1
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self):
+        if self.count < 2: return 0.0
+        var = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(0.0, var))
+
+    @property
+    def moving_avg(self):
+        return self.recent_sum / len(self.recent) if self.recent else None
+
+    def to_dict(self):
+        return {"count": self.count, "total": self.total, "total_sq": self.total_sq, "best": self.best,
+                "best_session": self.best_session, "last": self.last, "recent": list(self.recent)}
+
+    @classmethod
+    def from_dict(cls, data, direction, window):
+        agg = cls(direction, window)
+        agg.count, agg.total, agg.total_sq = data["count"], data["total"], data["total_sq"]
+        agg.best, agg.best_session, agg.last = data["best"], data["best_session"], data["last"]
+        agg.recent.extend(data["recent"])
+        agg.recent_sum = sum(agg.recent)
+        return agg
+
+class ProgressAnalytics:
+    """세션 저장소(SessionStore) 위의 진행 통계 (전체 + 발표 유형별)
+
+    - 통계 스냅샷은 저장소의 state 테이블에 보관하고, 시작 시에는 마지막으로 반영한 세션 이후만 읽어 보충합니다.
+    - 새 세션은 add_session()으로 O(지표 수) 만에 반영되므로 기록이 수백 개여도 패널 표시 비용이 같습니다.
+    """
+    def __init__(self, store, window=5, metrics=PROGRESS_METRICS):
+        self.store = store
+        self.window = window
+        self.metrics = metrics
+        self.scopes = {}
+        self.last_session_id = 0
+        self._load()
+
+    def _scope(self, mode):
+        scope = self.scopes.get(mode)
+        if scope is None:
+            scope = {name: MetricAggregate(direction, self.window) for name, (_, direction) in self.metrics.items()}
+            self.scopes[mode] = scope
+        return scope
+
+    def _load(self):
+        state = self.store.get_state(STATE_KEY) if self.store else None
+        if state and state.get("window") == self.window:
+            self.last_session_id = state["last_session_id"]
+            for mode, aggs in state["scopes"].items():
+                scope = self._scope(mode)
+                for name, data in aggs.items():
+                    if name in scope: scope[name] = MetricAggregate.from_dict(data, self.metrics[name][1], self.window)
+        if not self.store: return
+        # 스냅샷 이후에 저장된 세션(이전 버전에서 옮겨온 기록 등)만 반영
+        pending = self.store.query(after_id=self.last_session_id)
+        for session in pending:
+            self._apply(session)
+        if pending: self.save()
+
+    def save(self):
+        if not self.store: return
+        self.store.set_state(STATE_KEY, {
+            "window": self.window,
+            "last_session_id": self.last_session_id,
+            "scopes": {mode: {name: agg.to_dict() for name, agg in scope.items()} for mode, scope in self.scopes.items()}
+        })
+
+    def _apply(self, session):
+        values = dict(session.get("metrics") or {})
+        values["total_score"] = session["total_score"]
+        bests = set()
+        for mode in (ALL_MODES, session.get("mode")):
+            if mode is None: continue
+            scope = self._scope(mode)
+            for name, value in values.items():
+                if name in scope and value is not None and scope[name].update(value, session.get("id")):
+                    if mode == ALL_MODES: bests.add(name)
+        self.last_session_id = max(self.last_session_id, session.get("id") or 0)
+        return sorted(bests)
+
+    def add_session(self, session):
+        """새 세션을 반영하고 개인 최고 기록(전체 기준)을 갱신한 지표 이름 목록 반환
+
+        session: {"id", "mode", "total_score", "metrics": {...}}
+        """
+        bests = self._apply(session)
+        self.save()
+        return bests
+
+    def summary(self, mode=None):
+        """표시용 요약: {지표: {"label", "count", "mean", "std", "best", "last", "moving_avg"}}"""
+        scope = self.scopes.get(mode or ALL_MODES, {})
+        result = {}
+        for name, agg in scope.items():
+            if not agg.count: continue
+            result[name] = {"label": self.metrics[name][0], "count": agg.count, "mean": agg.mean, "std": agg.std,
+                            "best": agg.best, "last": agg.last, "moving_avg": agg.moving_avg}
+        return result
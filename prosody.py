@@ -0,0 +1,161 @@
+"""녹음 전체 PCM의 억양/쉼 분석 (YIN 음높이 추적, NumPy 일괄 계산)
+
+- 16kHz 녹음을 8kHz로 줄인 뒤 40ms 프레임(10ms 간격)을 복사 없이 stride 뷰로 만들고,
+  소리가 있는 프레임만 블록 단위 FFT로 YIN 차분 함수를 한 번에 계산합니다 (파이썬 루프는 블록 수만큼).
+- 30분 녹음(프레임 18만 개)도 한 코어에서 몇 초 안에 끝나므로 녹화 종료 후 Whisper와 함께 돌려도 됩니다.
+- 결과는 JSON으로 그대로 저장할 수 있는 요약 dict이며, 에너지 피드백(AnalysisManager)과
+  유창성 점수(긴 쉼 횟수, scoring)에서 사용합니다.
+"""
+import numpy as np
+
+from session_analysis import AUDIO_RATE
+
+PITCH_RATE = 8000 # 음높이 분석용 샘플레이트 (목소리 기본 주파수는 400Hz 이하)
+FRAME_SEC = 0.04
+HOP_SEC = 0.01
+F0_MIN, F0_MAX = 75.0, 400.0 # 추적할 기본 주파수 범위(Hz)
+YIN_THRESHOLD = 0.15 # 정규화 차분 값이 이보다 낮은 첫 골짜기를 주기로 봄
+SILENCE_RMS = 400 # 이 이하 프레임은 무음 (녹음 파일은 마이크 증폭이 적용된 값)
+MIN_PAUSE_SEC = 0.3 # 이보다 짧은 무음은 음절 사이 틈으로 보고 쉼으로 세지 않음
+LONG_PAUSE_SEC = 1.5 # 긴 쉼 (유창성 감점 대상)
+MIN_VOICED_FRAMES = 50 # 유성음 프레임이 이보다 적으면 억양 지표를 내지 않음
+BLOCK_FRAMES = 4096 # 한 번에 FFT할 프레임 수 (메모리 사용량 조절)
+
+MONOTONE_RANGE_ST = 4.0 # 억양 폭(반음)이 이보다 좁으면 단조로움
+WIDE_RANGE_ST = 12.0 # 이보다 넓으면 억양 변화가 큼
+JITTER_WARN_PCT = 3.0 # 프레임 간 주기 변동률(%)이 이보다 크면 목소리 흔들림
+
+def _downsample(samples, rate):
+    """정수 배율로 평균 내어 PITCH_RATE 근처로 줄임 (평균이 간단한 저역 통과 역할)"""
+    factor = max(1, int(rate // PITCH_RATE))
+    n = len(samples) // factor * factor
+    return samples[:n].reshape(-1, factor).mean(axis=1), rate / factor
+
+def _frame_rms(x, frame, hop):
+    """프레임별 RMS (제곱 누적합으로 O(N))"""
+    cs = np.concatenate(([0.0], np.cumsum(x.astype(np.float64) ** 2)))
+    starts = np.arange(0, len(x) - frame + 1, hop)
+    return np.sqrt(np.maximum(0.0, cs[starts + frame] - cs[starts]) / frame)
+
+def _yin_block(frames, rate):
+    """프레임 (B, W) -> 기본 주파수 (B,) Hz, 주기를 못 찾으면 NaN"""
+    n_frames, width = frames.shape
+    tau_min, tau_max = int(rate / F0_MAX), int(rate / F0_MIN)
+    window = width - tau_max - 1
+    nfft = 1 << (width - 1).bit_length()
+
+    frames = frames - frames.mean(axis=1, keepdims=True)
+    # r(τ) = Σ x[j]·x[j+τ] (j < window): 앞부분과 전체의 상호상관 (τ <= tau_max에서는 순환이 없음)
+    spectrum = np.fft.rfft(frames, nfft)
+    head = np.fft.rfft(frames[:, :window], nfft)
+    r = np.fft.irfft(np.conj(head) * spectrum, nfft)[:, :tau_max + 2]
+    # d(τ) = Σ (x[j] - x[j+τ])² = E(0) + E(τ) - 2r(τ)
+    cs = np.concatenate((np.zeros((n_frames, 1)), np.cumsum(frames ** 2, axis=1)), axis=1)
+    taus = np.arange(tau_max + 2)
+    energy = cs[:, taus + window] - cs[:, taus]
+    d = np.maximum(0.0, energy[:, :1] + energy - 2 * r)
+    d[:, 0] = 0.0
+    # 누적 평균 정규화 차분 (CMND)
+    running = np.cumsum(d[:, 1:], axis=1)
+    cmnd = np.ones_like(d)
+    cmnd[:, 1:] = d[:, 1:] * taus[1:] / np.where(running > 0, running, np.inf)
+    cmnd[:, 1:][running <= 0] = 1.0
+
+    # 기준값 아래의 첫 골짜기(지역 최소) 찾기
+    mid = cmnd[:, tau_min:tau_max + 1]
+    is_dip = (mid < YIN_THRESHOLD) & (mid <= cmnd[:, tau_min - 1:tau_max]) & (mid <= cmnd[:, tau_min + 1:tau_max + 2])
+    found = is_dip.any(axis=1)
+    tau = is_dip.argmax(axis=1) + tau_min
+
+    # 포물선 보간으로 소수점 주기
+    rows = np.arange(n_frames)
+    a, b, c = cmnd[rows, tau - 1], cmnd[rows, tau], cmnd[rows, tau + 1]
+    denom = a - 2 * b + c
+    shift = np.where(np.abs(denom) > 1e-12, 0.5 * (a - c) / np.where(denom == 0, 1, denom), 0.0)
+    period = tau + np.clip(shift, -1, 1)
+    return np.where(found, rate / period, np.nan)
+
+def pitch_track(pcm, rate=AUDIO_RATE):
+    """16bit 모노 PCM -> (프레임 시각(초), 기본 주파수(Hz, 무성/무음은 NaN), 프레임 RMS)"""
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+    x, pitch_rate = _downsample(samples, rate)
+    frame, hop = int(FRAME_SEC * pitch_rate), int(HOP_SEC * pitch_rate)
+    if len(x) < frame: return np.zeros(0), np.zeros(0), np.zeros(0)
+
+    rms = _frame_rms(x, frame, hop)
+    frames = np.lib.stride_tricks.sliding_window_view(x, frame)[::hop][:len(rms)]
+    f0 = np.full(len(rms), np.nan)
+    loud = np.flatnonzero(rms > SILENCE_RMS) # 무음 프레임은 계산하지 않음
+    for i in range(0, len(loud), BLOCK_FRAMES):
+        index = loud[i:i + BLOCK_FRAMES]
+        f0[index] = _yin_block(frames[index].astype(np.float64), pitch_rate)
+    times = (np.arange(len(rms)) * hop + frame / 2) / pitch_rate
+    return times, f0, rms
+
+def _runs(mask):
+    """불리언 배열에서 True 구간의 (시작, 길이) 배열"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    return starts, ends - starts
+
+def _pause_stats(rms, duration_sec):
+    silent = rms <= SILENCE_RMS
+    spoken = np.flatnonzero(~silent)
+    empty = {"count": 0, "long_count": 0, "mean_sec": 0.0, "max_sec": 0.0, "per_min": 0.0, "ratio": 0.0}
+    if len(spoken) == 0: return empty, 0.0
+    # 말 시작 전/끝난 뒤의 무음은 쉼이 아님
+    inner = silent[spoken[0]:spoken[-1] + 1]
+    _, lengths = _runs(inner)
+    pauses = lengths * HOP_SEC
+    pauses = pauses[pauses >= MIN_PAUSE_SEC]
+    speech_sec = float((~inner).sum() * HOP_SEC)
+    if len(pauses) == 0: return empty, speech_sec
+    return {
+        "count": int(len(pauses)), "long_count": int((pauses >= LONG_PAUSE_SEC).sum()),
+        "mean_sec": float(pauses.mean()), "max_sec": float(pauses.max()),
+        "per_min": float(len(pauses) / max(duration_sec / 60, 0.01)),
+        "ratio": float(pauses.sum() / max(len(inner) * HOP_SEC, HOP_SEC)),
+    }, speech_sec
+
+def analyze_prosody(pcm, rate=AUDIO_RATE):
+    """녹음 전체의 억양/떨림/쉼/음량 폭 요약
+
+    - intonation_range_st: 기본 주파수 p10~p90 폭 (반음). 좁을수록 단조로운 억양
+    - jitter_pct: 이어진 유성음 프레임 사이 주기 변화율 평균 (%). 프레임 단위 근사라 주기별 지터보다 큼
+    - pauses: 말 사이 MIN_PAUSE_SEC 이상 무음 통계 (long_count는 LONG_PAUSE_SEC 이상)
+    - loudness_range_db: 말하는 구간 음량 p10~p90 폭 (dB)
+    """
+    duration_sec = len(pcm) / 2 / rate
+    _, f0, rms = pitch_track(pcm, rate)
+    pauses, speech_sec = _pause_stats(rms, duration_sec)
+    result = {"duration_sec": duration_sec, "speech_sec": speech_sec, "frames": int(len(f0)),
+              "voiced_ratio": 0.0, "f0_median": None, "f0_p10": None, "f0_p90": None,
+              "intonation_range_st": None, "intonation_std_st": None, "jitter_pct": None,
+              "pauses": pauses, "loudness_range_db": None}
+
+    loud = rms[rms > SILENCE_RMS]
+    if len(loud) >= 2:
+        db = 20 * np.log10(loud)
+        result["loudness_range_db"] = float(np.percentile(db, 90) - np.percentile(db, 10))
+
+    voiced = ~np.isnan(f0)
+    if len(f0): result["voiced_ratio"] = float(voiced.sum() / max(1, (rms > SILENCE_RMS).sum()))
+    if voiced.sum() < MIN_VOICED_FRAMES: return result
+
+    values = f0[voiced]
+    median = float(np.median(values))
+    semitones = 12 * np.log2(values / median)
+    p10, p90 = np.percentile(values, [10, 90])
+    result.update({"f0_median": median, "f0_p10": float(p10), "f0_p90": float(p90),
+                   "intonation_range_st": float(12 * np.log2(p90 / p10)),
+                   "intonation_std_st": float(semitones.std())})
+
+    # 연속한 유성음 프레임 쌍의 주기 변화율 (2반음 넘게 튀는 쌍은 옥타브 오류/구절 경계로 보고 제외)
+    pair = voiced[1:] & voiced[:-1]
+    if pair.any():
+        periods = 1.0 / f0
+        a, b = periods[:-1][pair], periods[1:][pair]
+        steady = np.abs(12 * np.log2(a / b)) < 2
+        if steady.any():
+            result["jitter_pct"] = float(np.mean(np.abs(a - b)[steady]) / np.mean(a[steady]) * 100)
+    return result
@@ -1,5 +1,15 @@
 import random
-import google.generativeai as genai
+from llm_scheduler import PRIORITY_QUESTION
+from text_chunker import fit_to_budget
+
+def with_exclude(prompt, exclude):
+    """이미 나온 질문 목록을 프롬프트의 마지막 [질문] 앞에 넣어 겹치지 않는 새 질문을 요청"""
+    exclude = [q for q in exclude if q]
+    if not exclude: return prompt
+    clause = "[이미 나온 질문 - 아래와 겹치지 않는 새로운 관점의 질문을 만드세요]\n" + "\n".join(f"- {q}" for q in exclude)
+    index = prompt.rfind("[질문]")
+    if index < 0: return prompt + "\n\n" + clause
+    return prompt[:index] + clause + "\n\n" + prompt[index:]
 
 class IMRADValidator:
     """[수정] 정보 전달형 대본의 논리적 허점을 찾는 Validator (50% 확률로 AI 사용)"""
@@ -84,38 +94,45 @@ class IMRADValidator:
                 report.append(rule_results['question'])
         return report
 
-    def _get_rule_based_imrad_question(self, script):
-        """기존의 규칙 기반 질문 생성 로직"""
+    def get_rule_based_imrad_questions(self, script):
+        """규칙에 걸리는 모든 IMRAD 질문을 우선순위(서론-방법-결과-고찰) 순서대로 반환"""
+        questions = []
         rule_intro = self.rules['서론']
         if not self._check_keywords(script, rule_intro['triggers']):
-            return self.imrad_templates[rule_intro['template_key']]
+            questions.append(self.imrad_templates[rule_intro['template_key']])
 
         rule_methods = self.rules['방법']
         if not self._check_keywords(script, rule_methods['triggers']):
-            return self.imrad_templates[rule_methods['template_key']]
+            questions.append(self.imrad_templates[rule_methods['template_key']])
 
         rule_results = self.rules['결과']
         needs_check = self._check_keywords(script, rule_results['required_if'])
         has_defense = self._check_keywords(script, rule_results['defense_triggers'])
         if needs_check and not has_defense:
-            return self.imrad_templates[rule_results['template_key']]
+            questions.append(self.imrad_templates[rule_results['template_key']])
 
         rule_discussion = self.rules['고찰']
         if not self._check_keywords(script, rule_discussion['triggers']):
-            return self.imrad_templates[rule_discussion['template_key']]
-            
-        return None 
+            questions.append(self.imrad_templates[rule_discussion['template_key']])
+        return questions
+
+    def _get_rule_based_imrad_question(self, script):
+        """기존의 규칙 기반 질문 생성 로직"""
+        questions = self.get_rule_based_imrad_questions(script)
+        return questions[0] if questions else None
 
-    def _generate_ai_imrad_question(self, script):
-        """AI를 사용하여 실시간으로 질문 생성 (강화된 프롬프트 사용)"""
+    def _generate_ai_imrad_question(self, script, exclude=()):
+        """AI를 사용하여 실시간으로 질문 생성 (강화된 프롬프트 사용, exclude: 이미 나온 질문)"""
         if not self.text_model: return None
         
         try:
-            full_prompt = self.ai_prompt_template.format(script=script)
+            # 긴 대본은 앞부분만 자르지 않고 전체에서 고르게 문장을 뽑아 예산에 맞춤
+            full_prompt = with_exclude(self.ai_prompt_template.format(script=fit_to_budget(script)), exclude)
             # temperature를 높여서 창의적인 비판 유도
             response = self.text_model.generate_content(
                 full_prompt,
-                generation_config=genai.types.GenerationConfig(temperature=0.7)
+                generation_config={"temperature": 0.7},
+                priority=PRIORITY_QUESTION
             )
             return response.text.strip()
         except Exception as e:
@@ -237,10 +254,10 @@ class DynamicQuestionGenerator:
             """
         }
 
-    def _get_rule_based_dynamic_question(self, script, target_type):
-        """기존 규칙 기반 질문 생성 로직"""
+    def get_rule_based_dynamic_questions(self, script, target_type):
+        """규칙에 걸리는 모든 후보 질문 반환 (걸리는 규칙이 없으면 유형별 기본 질문)"""
         type_db = self.question_db.get(target_type.upper())
-        if not type_db: return None
+        if not type_db: return []
         
         possible_questions = []
         for check_point, data in type_db.items():
@@ -248,25 +265,30 @@ class DynamicQuestionGenerator:
                 possible_questions.extend(data['questions'])
                 
         if not possible_questions:
-            if target_type.upper() == "B": return "이 제안을 한 문장으로 요약했을 때, 청중이 꼭 기억해야 할 핵심 메시지는 무엇입니까?"
-            elif target_type.upper() == "C": return "이 이야기를 통해 청중들이 어떤 감정을 느끼고 돌아가기를 가장 원하십니까?"
-            else: return None
+            if target_type.upper() == "B": return ["이 제안을 한 문장으로 요약했을 때, 청중이 꼭 기억해야 할 핵심 메시지는 무엇입니까?"]
+            elif target_type.upper() == "C": return ["이 이야기를 통해 청중들이 어떤 감정을 느끼고 돌아가기를 가장 원하십니까?"]
             
-        return random.choice(possible_questions)
+        return possible_questions
+
+    def _get_rule_based_dynamic_question(self, script, target_type):
+        """기존 규칙 기반 질문 생성 로직"""
+        possible_questions = self.get_rule_based_dynamic_questions(script, target_type)
+        return random.choice(possible_questions) if possible_questions else None
 
-    def _generate_ai_dynamic_question(self, script, target_type):
-        """AI를 사용하여 실시간으로 질문 생성 (강화된 프롬프트 사용)"""
+    def _generate_ai_dynamic_question(self, script, target_type, exclude=()):
+        """AI를 사용하여 실시간으로 질문 생성 (강화된 프롬프트 사용, exclude: 이미 나온 질문)"""
         if not self.text_model: return None
             
         prompt_template = self.ai_prompt_templates.get(target_type.upper())
         if not prompt_template: return None 
         
         try:
-            full_prompt = prompt_template.format(script=script)
+            full_prompt = with_exclude(prompt_template.format(script=fit_to_budget(script)), exclude)
             # temperature를 높여서 다양한 관점 유도
             response = self.text_model.generate_content(
                 full_prompt,
-                generation_config=genai.types.GenerationConfig(temperature=0.8)
+                generation_config={"temperature": 0.8},
+                priority=PRIORITY_QUESTION
             )
             return response.text.strip()
         except Exception as e:
@@ -0,0 +1,128 @@
+import random
+import hashlib
+import threading
+from collections import deque
+
+class QuestionPool:
+    """'⚡️ 돌발 질문'용 미리 채워두는 질문 풀
+
+    - 녹화 시작(또는 대본 변경) 시 규칙 기반/백업 질문은 즉시 채우고,
+      AI 질문은 백그라운드에서 max_ai_questions개까지만 미리 받아둡니다.
+    - pop()은 준비된 질문을 O(1)로 꺼내고, 한도 안에서 다음 AI 질문을 보충합니다.
+    - AI 질문은 이미 나온/받아둔 질문을 프롬프트에서 제외시켜 매번 다른 질문을 요청합니다.
+    - executor(TaskExecutor)를 주면 AI 요청을 공유 풀의 'question' 그룹으로 실행하고, reset() 시 취소합니다.
+    """
+    def __init__(self, imrad_validator, dynamic_generator, backup_questions, max_ai_questions=2, executor=None):
+        self.imrad_validator = imrad_validator
+        self.dynamic_generator = dynamic_generator
+        self.backup_questions = list(backup_questions) or ["가장 중요하다고 생각하는 점은 무엇인가요?"]
+        self.max_ai_questions = max_ai_questions
+        self.executor = executor
+        self.lock = threading.Lock()
+        self.pool = deque()
+        self.asked = set()
+        self.script_hash = None
+        self.script = ""
+        self.mode = ""
+        self.ai_requested = 0
+        self.ai_inflight = False
+        self.ai_questions = [] # 현재 대본용으로 받은 AI 질문 (다음 요청에서 제외)
+        self.seeded = {} # 통합 분석 응답으로 미리 받아둔 대본별 AI 질문
+
+    @staticmethod
+    def _target_type(mode):
+        if '정보' in mode: return 'A'
+        elif '설득' in mode: return 'B'
+        elif '공감' in mode: return 'C'
+        return None
+
+    def _rule_questions(self, script, target_type):
+        if target_type == 'A':
+            if not hasattr(self.imrad_validator, 'get_rule_based_imrad_questions'): return []
+            return self.imrad_validator.get_rule_based_imrad_questions(script)
+        if target_type in ('B', 'C'):
+            if not hasattr(self.dynamic_generator, 'get_rule_based_dynamic_questions'): return []
+            return self.dynamic_generator.get_rule_based_dynamic_questions(script, target_type)
+        return []
+
+    @staticmethod
+    def _hash(script, mode):
+        return hashlib.sha1(f"{mode}\n{script}".encode('utf-8')).hexdigest()
+
+    def seed(self, script, mode, question):
+        """다른 요청(통합 분석 등)에서 이미 받은 AI 질문을 다음 연습용으로 저장 (AI 한도에서 차감)"""
+        if not question: return
+        with self.lock:
+            self.seeded[self._hash(script, mode)] = question
+
+    def prepare(self, script, mode):
+        """대본/모드가 바뀌었으면 풀을 다시 채움 (규칙 기반은 즉시, AI는 백그라운드)"""
+        script_hash = self._hash(script, mode)
+        with self.lock:
+            if script_hash == self.script_hash: return
+            self.script_hash = script_hash
+            self.script = script
+            self.mode = mode
+            self.ai_requested = 0
+            self.ai_questions = []
+
+            candidates = self._rule_questions(script, self._target_type(mode)) + self.backup_questions
+            candidates = [q for q in dict.fromkeys(candidates) if q not in self.asked]
+            random.shuffle(candidates)
+            self.pool = deque(candidates)
+
+            seeded = self.seeded.get(script_hash)
+            if seeded and seeded not in self.asked:
+                self.pool.appendleft(seeded)
+                self.ai_questions.append(seeded)
+                self.ai_requested += 1
+        self._request_ai_question()
+
+    def _request_ai_question(self):
+        """한도(max_ai_questions) 안에서 AI 질문 하나를 백그라운드로 요청"""
+        with self.lock:
+            if self.ai_inflight or self.ai_requested >= self.max_ai_questions: return
+            self.ai_inflight = True
+            self.ai_requested += 1
+            script_hash, script, mode = self.script_hash, self.script, self.mode
+            exclude = list(dict.fromkeys(self.ai_questions + [q for q in self.asked if q not in self.backup_questions]))
+        if self.executor:
+            self.executor.submit(self._ai_worker, script_hash, script, mode, exclude, group='question')
+        else:
+            threading.Thread(target=self._ai_worker, args=(None, script_hash, script, mode, exclude), daemon=True).start()
+
+    def _ai_worker(self, token, script_hash, script, mode, exclude=()):
+        if token is not None and token.cancelled: return # reset()으로 취소된 이전 대본용 요청
+        question = None
+        try:
+            target_type = self._target_type(mode)
+            if target_type == 'A':
+                question = self.imrad_validator._generate_ai_imrad_question(script, exclude)
+            elif target_type in ('B', 'C'):
+                question = self.dynamic_generator._generate_ai_dynamic_question(script, target_type, exclude)
+        except Exception as e:
+            print(f"AI 질문 미리 받기 실패: {e}")
+        with self.lock:
+            self.ai_inflight = False
+            # 그 사이 대본이 바뀌었으면 버림
+            if question and script_hash == self.script_hash and question not in self.asked and question not in self.pool:
+                self.pool.appendleft(question) # AI 질문이 있으면 가장 먼저 사용
+                self.ai_questions.append(question)
+                print("⚡️ [질문 풀] AI 질문 준비 완료")
+
+    def pop(self, script=None, mode=None):
+        """준비된 질문 하나를 즉시 꺼냄 (풀이 비면 백업 질문 사용)"""
+        if script is not None: self.prepare(script, mode or self.mode)
+        with self.lock:
+            question = self.pool.popleft() if self.pool else random.choice(self.backup_questions)
+            self.asked.add(question)
+        self._request_ai_question()
+        return question
+
+    def reset(self):
+        """새 연습 세션 시작 시 이미 나온 질문 기록 초기화"""
+        if self.executor: self.executor.cancel_group('question') # 이전 대본용 요청은 더 기다리지 않음
+        with self.lock:
+            self.asked.clear()
+            self.script_hash = None
+            self.ai_inflight = False
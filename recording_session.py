@@ -0,0 +1,140 @@
+import time
+import threading
+from streaming_stats import SessionStats
+
+MARKER_MIN_GAP_SEC = 1.5 # 같은 마커가 이 간격 안에 연속으로 찍히지 않게 함
+
+class RecordingSession:
+    """녹화 1회분의 상태와 수집 데이터 (녹화마다 새 객체를 만듦)
+
+    - 모든 갱신은 lock 안에서 이루어지므로 Tk 루프(시선/영상), Vosk 스레드(음성),
+      질문 스레드(마커)가 동시에 써도 값이 유실되지 않습니다.
+    - 각 스레드는 시작할 때 받은 세션 객체에만 쓰므로, 이전 녹화의 스레드가 늦게 끝나도
+      새 녹화의 데이터를 건드리지 않습니다.
+    - snapshot()은 일관된 시점의 복사본을 돌려주므로 분석 코드는 lock 없이 사용하면 됩니다.
+    - 볼륨 평균/표준편차/분위수와 분 단위 구간 통계는 add_*() 때 stats(SessionStats)에 함께 누적되므로
+      녹화가 끝난 뒤 전체 데이터를 다시 훑지 않습니다.
+    - clock: 시각 함수 (기본 time.time, 파일 재생 시에는 가상 시계 capture_sources.ReplayClock)
+    """
+    def __init__(self, session_id=None, script="", mode="", clock=time.time):
+        self.session_id = session_id
+        self.script = script
+        self.mode = mode
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.recording = threading.Event()
+        self.start_time = None
+        self.stop_time = None
+        self.video_writer = None
+        self.audio_path = None
+        self.duration_sec = None
+        self.prosody = None # 녹화 종료 후 prosody.analyze_prosody() 결과
+
+        self.transcript = ""
+        self.word_count = 0 # 이름은 word_count지만 실제로는 음절 수
+        self.filler_count = 0
+        self.gaze = {"total_frames": 0, "looking_frames": 0, "script_frames": 0}
+        self.volumes = []
+        self.tremble_count = 0
+        self.markers = []
+        self.stats = SessionStats()
+        self.audio_frames = []
+        self.workers = [] # 이 세션에 데이터를 쓰는 백그라운드 스레드
+
+    # --- 수명 주기 ---
+    def start(self, video_writer=None):
+        self.video_writer = video_writer
+        self.start_time = self.clock()
+        self.recording.set()
+
+    def stop(self):
+        self.recording.clear()
+        self.stop_time = self.clock()
+
+    def start_worker(self, target, *args):
+        """이 세션에 속한 백그라운드 스레드 시작 (stop 후 join_workers로 종료를 기다릴 수 있음)"""
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        self.workers.append(thread)
+        thread.start()
+        return thread
+
+    def join_workers(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        for thread in self.workers:
+            thread.join(None if deadline is None else max(0.0, deadline - time.time()))
+
+    @property
+    def is_recording(self):
+        return self.recording.is_set()
+
+    def elapsed(self):
+        if self.start_time is None: return 0.0
+        return (self.stop_time if self.stop_time is not None else self.clock()) - self.start_time
+
+    # --- 영상 (Tk 루프에서 쓰고, 분석 스레드에서 닫음) ---
+    def write_frame(self, frame):
+        with self.lock:
+            if self.video_writer is None or not self.recording.is_set(): return False
+            self.video_writer.write(frame)
+            return True
+
+    def close_video(self):
+        with self.lock:
+            if self.video_writer is not None:
+                self.video_writer.release()
+                self.video_writer = None
+
+    # --- 수집 데이터 ---
+    def _offset(self):
+        """녹화 시작 후 경과 시간 (분 단위 구간 통계용, lock 안에서 호출)"""
+        return self.clock() - self.start_time if self.start_time is not None else 0.0
+
+    def add_gaze(self, face_detected, looking_down):
+        with self.lock:
+            self.gaze["total_frames"] += 1
+            if looking_down: self.gaze["script_frames"] += 1 # 감점 요인
+            elif face_detected: self.gaze["looking_frames"] += 1 # 득점 요인 (정면 응시)
+            self.stats.add_gaze(self._offset(), face_detected, looking_down)
+
+    def add_audio(self, data, rms, trembled):
+        with self.lock:
+            self.audio_frames.append(data)
+            self.volumes.append(rms)
+            if trembled: self.tremble_count += 1
+            self.stats.add_volume(self._offset(), rms, trembled)
+
+    def add_speech(self, text, filler_count=0):
+        """인식된 문장 추가 (음절 수는 공백을 뺀 글자 수)"""
+        with self.lock:
+            syllables = len(text.replace(" ", ""))
+            self.transcript += text + " "
+            self.word_count += syllables
+            self.filler_count += filler_count
+            self.stats.add_speech(self._offset(), syllables, filler_count)
+
+    def set_transcript(self, text):
+        """Whisper 정밀 전사 결과로 전체 대본 교체"""
+        with self.lock:
+            self.transcript = text
+
+    def add_marker(self, t, label):
+        with self.lock:
+            last = self.markers[-1] if self.markers else None
+            if not last or (t - last['time'] > MARKER_MIN_GAP_SEC) or last['label'] != label:
+                self.markers.append({'time': max(0.1, t), 'label': label})
+
+    def audio_pcm(self):
+        with self.lock:
+            return b''.join(self.audio_frames)
+
+    def snapshot(self):
+        """분석용 복사본 (speech / gaze / audio / markers / stats)"""
+        duration_sec = self.duration_sec or self.elapsed()
+        with self.lock:
+            return {
+                "speech": {"full_transcript": self.transcript, "word_count": self.word_count, "filler_count": self.filler_count},
+                "gaze": dict(self.gaze),
+                "audio": {"volumes": list(self.volumes), "tremble_count": self.tremble_count},
+                "markers": list(self.markers),
+                "stats": self.stats.summary(duration_sec)
+            }
@@ -0,0 +1,149 @@
+"""녹음/영상 파일을 실시간 분석 경로(Vosk, 볼륨/떨림, 시선, 마커)에 그대로 흘려보내는 재생 모드
+
+마이크/카메라 없이 실행되며, 가상 시계(ReplayClock)를 쓰므로 CPU가 허용하는 만큼 빠르게 재생합니다.
+청중 반응/돌발 질문 선택은 --seed로 고정되어 같은 입력이면 같은 결과(회귀 테스트)가 나옵니다.
+앱 화면에서 실시간 속도로 재생하려면: python main.py --replay-audio audio.wav --replay-video video.avi --seed 7
+
+예)
+  python replay.py --audio sessions/<id>/audio.flac --video sessions/<id>/video.avi --script script.txt --seed 7
+  python replay.py --audio audio.wav --synthetic-video --no-vosk --json replay.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import numpy as np
+
+import app_config
+from capture_sources import ReplayClock, WavFileSource, VideoFileSource, SyntheticVideoSource
+from recording_session import RecordingSession
+from session_analysis import SpeechChunkAnalyzer, analyze_frame_gaze, create_face_mesh, GAZE_FRAME_STEP
+from sprite_cache import choose_audience_states
+from scoring import compute_scores
+from prosody import analyze_prosody
+
+AUDIENCE_INTERVAL_SEC = 4.0 # App.audience_loop 주기
+
+def load_recognizer(model_dir="model", rate=16000):
+    from vosk import Model, KaldiRecognizer
+    return KaldiRecognizer(Model(model_dir), rate)
+
+def replay_session(audio_path, video=None, script="", mode="📘 정보 전달형", seed=0, recognizer=None,
+                   face_mesh=None, question_every=0.0, question_pool=None):
+    """파일 입력으로 녹화 1회를 재생하고 (RecordingSession, 재생 통계) 반환
+
+    video: 비디오 소스(VideoFileSource/SyntheticVideoSource) 또는 None
+    오디오 구간과 영상 프레임을 가상 시각 순서대로 번갈아 처리하므로 스레드 없이 결정적으로 동작합니다.
+    """
+    random.seed(seed); np.random.seed(seed)
+    if question_pool is not None: question_pool.prepare(script, mode) # 질문 섞기도 시드 이후에
+    clock = ReplayClock()
+    audio = WavFileSource(audio_path, clock=clock).open()
+    session = RecordingSession(None, script, mode, clock=clock)
+    session.start()
+    analyzer = SpeechChunkAnalyzer(session, recognizer, app_config.FILLER_WORDS, audio.sensitivity, clock)
+
+    fps = getattr(video, "fps", 20.0)
+    stats = {"chunks": 0, "frames": 0, "gaze_frames": 0, "recognized": 0}
+    audience, next_audience = [], AUDIENCE_INTERVAL_SEC
+    next_question = question_every or None
+    t0 = time.perf_counter()
+
+    while True:
+        # 영상 프레임: 현재 가상 시각까지 밀린 프레임을 처리 (App.update_video_stream과 같은 2프레임 간격)
+        while video is not None and stats["frames"] / fps <= clock():
+            ret, frame = video.read()
+            if not ret: video = None; break
+            stats["frames"] += 1
+            if face_mesh is not None and stats["frames"] % GAZE_FRAME_STEP == 0:
+                analyze_frame_gaze(frame, face_mesh, session)
+                stats["gaze_frames"] += 1
+
+        data = audio.read()
+        if data is None: break
+        stats["chunks"] += 1
+        if analyzer.process(data): stats["recognized"] += 1
+
+        # 청중 반응 / 돌발 질문 (App.audience_loop, trigger_question_event와 같은 선택 로직)
+        if clock() >= next_audience:
+            audience.append({"time": round(next_audience, 2), "states": choose_audience_states()})
+            next_audience += AUDIENCE_INTERVAL_SEC
+        if next_question and clock() >= next_question:
+            asker = random.randint(0, 1)
+            question = question_pool.pop(script, mode) if question_pool else None
+            session.add_marker(session.elapsed(), '❓')
+            audience.append({"time": round(next_question, 2), "asker": asker, "question": question})
+            next_question += question_every
+
+    session.stop()
+    analyzer.finish()
+    session.duration_sec = audio.duration_sec
+    session.prosody = analyze_prosody(audio.pcm, audio.rate)
+    audio.close()
+
+    wall_sec = time.perf_counter() - t0
+    stats.update({
+        "audio_sec": session.duration_sec, "wall_sec": wall_sec,
+        "realtime_factor": session.duration_sec / wall_sec if wall_sec > 0 else None,
+        "chunks_per_sec": stats["chunks"] / wall_sec if wall_sec > 0 else None,
+        "frames_per_sec": stats["frames"] / wall_sec if wall_sec > 0 else None,
+        "audience": audience
+    })
+    return session, stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="녹음/영상 파일로 실시간 분석 경로 재생 (장치 없이, 실시간보다 빠르게)")
+    parser.add_argument("--audio", required=True, help="녹음 파일 (wav/flac)")
+    parser.add_argument("--video", help="녹화 영상 (avi)")
+    parser.add_argument("--synthetic-video", action="store_true", help="영상 대신 합성 프레임 사용")
+    parser.add_argument("--script", help="대본 텍스트 파일")
+    parser.add_argument("--mode", default="📘 정보 전달형")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model", default="model", help="Vosk 모델 폴더")
+    parser.add_argument("--no-vosk", action="store_true", help="음성 인식 생략 (볼륨/떨림만)")
+    parser.add_argument("--no-gaze", action="store_true", help="시선 분석 생략")
+    parser.add_argument("--question-every", type=float, default=0.0, help="돌발 질문 간격(초, 0이면 없음)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    script = ""
+    if args.script:
+        with open(args.script, "r", encoding='utf-8') as f:
+            script = f.read().strip()
+
+    recognizer = None if args.no_vosk else load_recognizer(args.model)
+    face_mesh = None if args.no_gaze else create_face_mesh()
+    if args.synthetic_video: video = SyntheticVideoSource(seed=args.seed)
+    elif args.video: video = VideoFileSource(args.video)
+    else: video = None
+
+    question_pool = None
+    if args.question_every > 0:
+        from question_pool import QuestionPool
+        from question_generator import IMRADValidator, DynamicQuestionGenerator
+        question_pool = QuestionPool(IMRADValidator(None), DynamicQuestionGenerator(None), app_config.BACKUP_QUESTIONS, 0)
+
+    session, stats = replay_session(args.audio, video, script, args.mode, args.seed, recognizer, face_mesh,
+                                    args.question_every, question_pool)
+    if video is not None: video.release()
+
+    snapshot = session.snapshot()
+    speech = snapshot["speech"]
+    result = compute_scores(script, speech["full_transcript"], speech["word_count"], speech["filler_count"],
+                            snapshot["gaze"], snapshot["audio"]["tremble_count"], session.duration_sec, args.mode,
+                            prosody=session.prosody)
+    result.update({"seed": args.seed, "audio": os.path.abspath(args.audio), "transcript": speech["full_transcript"],
+                   "markers": snapshot["markers"], "volume_stats": snapshot["stats"]["volume"],
+                   "per_minute": snapshot["stats"]["per_minute"], "prosody": session.prosody, "replay": stats})
+
+    print(f"▶️ 재생 완료: 음성 {stats['audio_sec']:.1f}초를 {stats['wall_sec']:.2f}초에 처리 "
+          f"(x{stats['realtime_factor'] or 0:.1f}, 프레임 {stats['frames']}개) / 종합 {result['total_score']}점")
+    if args.json:
+        with open(args.json, "w", encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
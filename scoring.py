@@ -0,0 +1,179 @@
+"""발표 점수 계산 엔진 (화면/전사/영상과 무관한 순수 계산)
+
+- 입력은 세션별 집계값(음절 수, 길이, 시선 프레임 수, 전달률 원점수, 필러/떨림/긴 쉼 횟수, 발표 유형)뿐이라
+  보관된 result.json만으로 다시 채점할 수 있습니다.
+- score_batch()는 세션 N개를 NumPy 배열로 한 번에 계산하고, score_session()도 같은 함수(N=1)를 거치므로
+  앱(UI)과 batch_analyze.py의 점수가 항상 같습니다.
+- 기준(가중치/감점 계수)은 app_config.COACHING_CONFIG에서 읽으며, 결과에 rubric_version을 남깁니다.
+"""
+import re
+import difflib
+import numpy as np
+
+# 세션 집계값 이름 (score_batch 입력 배열)
+FEATURES = ("word_count", "duration_sec", "total_frames", "looking_frames", "script_frames",
+            "match_ratio", "filler_count", "tremble_count", "long_pause_count", "mode_index")
+OPTIONAL_FEATURES = ("match_ratio", "long_pause_count") # 값이 없을 수 있는 집계값 (배열에서는 NaN)
+MODE_KEYS = ("A", "B", "C") # 정보 전달형 / 설득·동기부여형 / 공감·소통형 (그 외 유형은 C 가중치)
+
+def mode_key(mode):
+    """발표 유형 문자열 -> 가중치 키"""
+    mode = mode or ""
+    if '정보' in mode: return "A"
+    if '설득' in mode: return "B"
+    return "C"
+
+def _clean_text(text):
+    return re.sub(r'[^가-힣a-zA-Z0-9]', '', text)
+
+def match_ratio(script, transcript, min_chars=5):
+    """대본-전사 유사도 원점수 (0~1). 전사가 너무 짧으면 None"""
+    if len(transcript.strip()) <= min_chars: return None
+    return difflib.SequenceMatcher(None, _clean_text(script), _clean_text(transcript)).ratio()
+
+class Rubric:
+    """버전이 붙은 채점 기준 (세부 점수 계수 + 유형별 종합 점수 가중치)"""
+    def __init__(self, version, speed, gaze, match, fluency, weights):
+        self.version = version
+        self.speed = speed
+        self.gaze = gaze
+        self.match = match
+        self.fluency = fluency
+        self.weights = weights # {"A": {세부 점수 이름: 가중치, ...}, ...} (더하는 순서 유지)
+
+    @classmethod
+    def from_config(cls, coaching_config):
+        scoring = coaching_config["scoring"]
+        weights = {key: dict(coaching_config["rubrics"][key]["score_weights"]) for key in MODE_KEYS}
+        return cls(scoring["version"], scoring["speed"], scoring["gaze"], scoring["match"], scoring["fluency"], weights)
+
+_default_rubric = None
+
+def default_rubric():
+    global _default_rubric
+    if _default_rubric is None:
+        import app_config
+        _default_rubric = Rubric.from_config(app_config.COACHING_CONFIG)
+    return _default_rubric
+
+def features_from_result(result):
+    """result.json(또는 compute_scores 결과) -> 세션 집계값 dict"""
+    gaze = result.get("gaze_frames") or {}
+    ratio = result.get("match_ratio")
+    if ratio is None and "match_ratio" not in result and result.get("transcript") is not None:
+        ratio = match_ratio(result.get("script", ""), result["transcript"]) # 예전 결과는 텍스트로 다시 계산
+    return {
+        "word_count": result.get("word_count", 0), "duration_sec": result.get("duration_sec", 0.0),
+        "total_frames": gaze.get("total_frames", 0), "looking_frames": gaze.get("looking_frames", 0),
+        "script_frames": gaze.get("script_frames", 0), "match_ratio": ratio,
+        "filler_count": result.get("filler_count", 0), "tremble_count": result.get("tremble_count", 0),
+        "long_pause_count": result.get("long_pause_count"), "mode": result.get("mode", "")
+    }
+
+def stack_features(sessions):
+    """세션 집계값 dict 목록 -> score_batch 입력 배열 (전달률/긴 쉼 없음은 NaN)"""
+    arrays = {name: np.array([s.get(name, 0) for s in sessions], dtype=np.float64)
+              for name in FEATURES[:-1] if name not in OPTIONAL_FEATURES}
+    for name in OPTIONAL_FEATURES:
+        arrays[name] = np.array([np.nan if s.get(name) is None else s[name] for s in sessions], dtype=np.float64)
+    arrays["mode_index"] = np.array([MODE_KEYS.index(mode_key(s.get("mode"))) for s in sessions], dtype=np.int64)
+    return arrays
+
+def score_batch(arrays, rubric=None):
+    """세션 N개를 한 번에 채점 -> {점수 이름: 길이 N 배열}
+
+    int() 내림(0 방향 절사)과 더하는 순서를 예전 한 세션 계산식과 똑같이 맞춰 결과가 달라지지 않습니다.
+    """
+    rubric = rubric or default_rubric()
+    duration_min = np.maximum(0.01, arrays["duration_sec"] / 60)
+    word_count = arrays["word_count"]
+
+    # 속도 점수
+    spm = np.where(word_count > 0, np.trunc(word_count / duration_min), 0)
+    score_speed = np.maximum(0, 100 - np.trunc(np.abs(rubric.speed["target_spm"] - spm) * rubric.speed["slope"]))
+
+    # 시선 처리 점수: 정면 응시율 - 대본 응시(Looking Down) 감점
+    total_frames = np.maximum(1, arrays["total_frames"])
+    base_gaze_score = (arrays["looking_frames"] / total_frames) * 100
+    script_penalty = (arrays["script_frames"] / total_frames) * rubric.gaze["script_penalty"]
+    gaze = np.maximum(0, np.minimum(100, np.trunc(base_gaze_score - script_penalty)))
+
+    # 전달률 점수 (전사 부족은 0점)
+    ratio = arrays["match_ratio"]
+    has_match = ~np.isnan(ratio)
+    match_rate = np.where(has_match, np.minimum(100, np.trunc(np.nan_to_num(ratio) * 100 * rubric.match["boost"])), 0)
+
+    # 유창성 점수
+    filler_score = np.maximum(0, 100 - arrays["filler_count"] * rubric.fluency["filler_penalty"])
+    tremble_score = np.maximum(0, 100 - np.trunc(arrays["tremble_count"] / duration_min * rubric.fluency["tremble_per_min_penalty"]))
+    fluency = np.trunc((filler_score + tremble_score) / 2)
+    # 억양/쉼 분석이 있는 세션은 긴 쉼 점수를 함께 평균 (v2)
+    pause_penalty = rubric.fluency.get("long_pause_per_min_penalty", 0)
+    has_pauses = ~np.isnan(arrays["long_pause_count"])
+    if pause_penalty and has_pauses.any():
+        pause_score = np.maximum(0, 100 - np.trunc(np.nan_to_num(arrays["long_pause_count"]) / duration_min * pause_penalty))
+        fluency = np.where(has_pauses, np.trunc((filler_score + tremble_score + pause_score) / 3), fluency)
+
+    # 종합 점수 (유형별 가중치)
+    parts = {"score_speed": score_speed, "gaze": gaze, "match_rate": match_rate, "fluency": fluency}
+    total = np.zeros_like(spm, dtype=np.float64)
+    mode_index = arrays["mode_index"]
+    for key_idx, key in enumerate(MODE_KEYS):
+        mask = mode_index == key_idx
+        if not mask.any(): continue
+        acc = np.zeros(int(mask.sum()))
+        for name in rubric.weights[key]:
+            acc = acc + parts[name][mask] * rubric.weights[key][name]
+        total[mask] = acc
+
+    return {
+        "total_score": np.trunc(total).astype(np.int64), "spm": spm.astype(np.int64),
+        "score_speed": score_speed.astype(np.int64), "gaze": gaze.astype(np.int64),
+        "script_penalty": script_penalty, "script_warning": arrays["script_frames"] > total_frames * rubric.gaze["warning_ratio"],
+        "match_rate": match_rate.astype(np.int64), "has_match": has_match,
+        "fluency": fluency.astype(np.int64), "duration_sec": duration_min * 60
+    }
+
+def _row(scores, i, rubric):
+    """score_batch 결과의 i번째 세션 -> 파이썬 값 dict (표시용 라벨 포함)"""
+    result = {name: values[i].item() for name, values in scores.items()}
+    spm = result["spm"]
+    result["speed_eval"] = "느림 🐢" if spm < rubric.speed["slow_spm"] else "빠름 ⚡" if spm > rubric.speed["fast_spm"] else "적정"
+    result["match_label_text"] = "전달률" if result.pop("has_match") else "데이터 부족"
+    result["rubric_version"] = rubric.version
+    return result
+
+def score_session(features, rubric=None):
+    """세션 하나 채점 (score_batch와 같은 계산) -> 결과 화면/보관용 dict"""
+    rubric = rubric or default_rubric()
+    result = _row(score_batch(stack_features([features]), rubric), 0, rubric)
+    # 원본 집계값 (배치 재채점 시 영상/음성 없이 다시 계산할 수 있도록 결과에 함께 저장)
+    result.update({
+        "word_count": features.get("word_count", 0), "filler_count": features.get("filler_count", 0),
+        "tremble_count": features.get("tremble_count", 0), "match_ratio": features.get("match_ratio"),
+        "long_pause_count": features.get("long_pause_count"),
+        "gaze_frames": {name: features.get(name, 0) for name in ("total_frames", "looking_frames", "script_frames")}
+    })
+    return result
+
+def compute_scores(script, transcript, word_count, filler_count, gaze, tremble_count, duration_sec, mode, rubric=None,
+                   prosody=None):
+    """세션 지표로 세부 점수와 종합 점수 계산 (앱 결과 화면/batch_analyze.py 공용)
+
+    gaze: {"total_frames", "looking_frames", "script_frames"}
+    prosody: prosody.analyze_prosody() 결과 (있으면 긴 쉼 횟수를 유창성에 반영)
+    """
+    rubric = rubric or default_rubric()
+    features = {"word_count": word_count, "duration_sec": duration_sec, "match_ratio": match_ratio(
+                    script, transcript, rubric.match["min_transcript_chars"]),
+                "filler_count": filler_count, "tremble_count": tremble_count, "mode": mode,
+                "long_pause_count": prosody["pauses"]["long_count"] if prosody else None}
+    features.update({name: gaze.get(name, 0) for name in ("total_frames", "looking_frames", "script_frames")})
+    return score_session(features, rubric)
+
+def rescore_results(results, rubric=None):
+    """보관된 결과 목록을 새 기준으로 한 번에 재채점 -> 결과마다 갱신된 점수 dict 목록"""
+    if not results: return []
+    rubric = rubric or default_rubric()
+    scores = score_batch(stack_features([features_from_result(r) for r in results]), rubric)
+    return [_row(scores, i, rubric) for i in range(len(results))]
@@ -0,0 +1,191 @@
+"""화면(Tk) 없이 쓸 수 있는 세션 분석 함수 모음 (앱과 batch_analyze.py 공용, 점수 계산은 scoring.py)
+
+- classify_gaze() / analyze_frame_gaze(): FaceMesh 랜드마크로 정면 응시 / 대본 응시(아래) 판정
+- SpeechChunkAnalyzer: 실시간 음성 구간 처리 (마이크/파일 재생 공용)
+- analyze_video_gaze(): 녹화 영상(avi)에서 시선 지표 재계산
+- audio_features(): 16bit PCM에서 볼륨(RMS)/떨림 횟수 계산
+- transcribe(): Whisper 정밀 전사
+"""
+import json
+import time
+import wave
+import audioop
+import numpy as np
+import tracing
+from streaming_stats import SessionStats
+
+AUDIO_RATE = 16000
+AUDIO_CHUNK = 4096 # 실시간 분석(Vosk 스레드)과 같은 구간 크기
+GAZE_DOWN_THRESHOLD = 0.57 # 눈동자 수직 비율이 이보다 크면 대본(아래)을 보는 것으로 판정
+GAZE_FRAME_STEP = 2 # 실시간과 동일하게 2프레임마다 분석
+FAST_SPM = 450 # 순간 속도가 이보다 빠르면 ⚡️ 마커
+SLOW_SPM = 200 # 이보다 느리고 음절이 충분하면 🐢 마커
+
+# 눈 윗꺼풀 / 아랫꺼풀 / 눈동자 랜드마크 (왼쪽, 오른쪽)
+LEFT_EYE = (159, 145, 468)
+RIGHT_EYE = (386, 374, 473)
+
+def count_syllables(text):
+    """공백을 뺀 글자 수 (SPM 계산용 음절 수)"""
+    return len(text.replace(" ", ""))
+
+def count_fillers(text, filler_words):
+    return sum(1 for w in text.split() if w in filler_words)
+
+def classify_gaze(landmarks, width, height):
+    """FaceMesh 랜드마크 -> (눈동자 수직 비율, 대본 응시 여부)"""
+    def point(idx):
+        p = landmarks[idx]
+        return (int(p.x * width), int(p.y * height))
+
+    def ratio(top_idx, bottom_idx, iris_idx):
+        (tx, ty), (bx, by), (ix, iy) = point(top_idx), point(bottom_idx), point(iris_idx)
+        eye_height = ((tx - bx) ** 2 + (ty - by) ** 2) ** 0.5
+        # 눈을 감았거나 인식이 불안정하면 0.5(정면) 반환
+        if eye_height < 3: return 0.5
+        return ((tx - ix) ** 2 + (ty - iy) ** 2) ** 0.5 / eye_height
+
+    avg_ratio = (ratio(*LEFT_EYE) + ratio(*RIGHT_EYE)) / 2
+    return avg_ratio, avg_ratio > GAZE_DOWN_THRESHOLD
+
+def analyze_frame_gaze(frame, face_mesh, session=None):
+    """BGR 프레임 하나의 시선 판정 (녹화 중인 세션이 있으면 집계) -> (얼굴 검출 여부, 대본 응시 여부)"""
+    import cv2
+    h, w = frame.shape[:2]
+    results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    face_detected = bool(results.multi_face_landmarks)
+    looking_down = face_detected and classify_gaze(results.multi_face_landmarks[0].landmark, w, h)[1]
+    if session is not None and session.is_recording:
+        session.add_gaze(face_detected, looking_down)
+    return face_detected, looking_down
+
+def create_face_mesh():
+    import mediapipe as mp
+    return mp.solutions.face_mesh.FaceMesh(
+        max_num_faces=1,
+        refine_landmarks=True, # 눈동자(Iris) 추적을 위해 필수
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+def analyze_video_gaze(video_path, face_mesh=None, frame_step=GAZE_FRAME_STEP):
+    """녹화 영상에서 시선 지표를 다시 계산 (실시간과 같은 판정 기준)"""
+    import cv2
+    face_mesh = face_mesh or create_face_mesh()
+    gaze = {"total_frames": 0, "looking_frames": 0, "script_frames": 0}
+    cap = cv2.VideoCapture(video_path)
+    try:
+        frame_idx = 0
+        while True:
+            ret, frame = cap.read()
+            if not ret: break
+            frame_idx += 1
+            if frame_idx % frame_step: continue
+            face_detected, looking_down = analyze_frame_gaze(frame, face_mesh)
+            gaze["total_frames"] += 1
+            if looking_down: gaze["script_frames"] += 1
+            elif face_detected: gaze["looking_frames"] += 1
+    finally:
+        cap.release()
+    return gaze
+
+def read_pcm(audio_path):
+    """WAV/FLAC -> (16bit 모노 PCM bytes, 샘플레이트)"""
+    if audio_path.endswith(".flac"):
+        import soundfile as sf
+        data, rate = sf.read(audio_path, dtype='int16')
+        return data.tobytes(), rate
+    with wave.open(audio_path, 'rb') as wf:
+        return wf.readframes(wf.getnframes()), wf.getframerate()
+
+def audio_features(pcm, rate=AUDIO_RATE, chunk=AUDIO_CHUNK):
+    """실시간 분석과 같은 규칙으로 구간별 볼륨(RMS)과 떨림 횟수 계산 (누적 통계도 같은 루프에서 갱신)"""
+    volumes, tremble_count, last_vol = [], 0, 0
+    stats = SessionStats()
+    step = chunk * 2
+    for i in range(0, len(pcm) - step + 1, step):
+        rms = audioop.rms(pcm[i:i + step], 2)
+        trembled = abs(rms - last_vol) > 2000 and rms > 500
+        if trembled: tremble_count += 1
+        last_vol = rms
+        volumes.append(rms)
+        stats.add_volume(i / 2 / rate, rms, trembled)
+    duration_sec = len(pcm) / 2 / rate
+    summary = stats.summary(duration_sec)
+    return {"volumes": volumes, "tremble_count": tremble_count, "duration_sec": duration_sec,
+            "volume_stats": summary["volume"], "per_minute": summary["per_minute"]}
+
+def create_whisper_model(size="small"):
+    # small이 한국어 성능/속도 밸런스 굿, int8 -> CPU에서 빠르게 돌리기 위한 설정
+    from faster_whisper import WhisperModel
+    return WhisperModel(size, device="cpu", compute_type="int8")
+
+def transcribe(model, audio_path):
+    """Whisper 정밀 전사 (beam_size=5는 정확도를 높임)"""
+    segments, info = model.transcribe(audio_path, beam_size=5, language="ko")
+    return " ".join(segment.text for segment in segments).strip()
+
+class SpeechChunkAnalyzer:
+    """실시간 음성 구간(CHUNK) 처리: 민감도 증폭 -> 볼륨/떨림 -> Vosk 인식 -> 음절/필러 집계 + 속도 마커
+
+    마이크(실시간)와 파일 재생(replay.py)이 같은 처리를 거치도록 speech_recognition_thread에서 분리했습니다.
+    clock은 순간 속도 계산용 시계로, 재생 시에는 세션과 같은 가상 시계(ReplayClock)를 넘깁니다.
+    live를 주면 HUD용 누적값만 갱신하며, 화면 갱신은 App의 타이머가 따로 합니다.
+    """
+    def __init__(self, session, recognizer=None, filler_words=(), sensitivity=1.0, clock=None, live=None):
+        self.session = session
+        self.live = live # live_metrics.LiveMetrics (화면 HUD용, 없으면 생략)
+        self.recognizer = recognizer
+        self.filler_words = set(filler_words)
+        self.sensitivity = sensitivity
+        self.clock = clock or time.time
+        self.last_speech_end = self.clock()
+        self.last_vol = 0
+
+    def process(self, data):
+        """구간 하나 처리. 인식된 문장이 있으면 반환"""
+        # --- [민감도 조절] ---
+        if self.sensitivity != 1.0:
+            audio_array = np.frombuffer(data, dtype=np.int16) * self.sensitivity
+            data = np.clip(audio_array, -32768, 32767).astype(np.int16).tobytes()
+
+        # 볼륨/떨림 분석
+        rms = audioop.rms(data, 2)
+        self.session.add_audio(data, rms, abs(rms - self.last_vol) > 2000 and rms > 500)
+        self.last_vol = rms
+        if self.live is not None: self.live.add_volume(rms)
+
+        # vosk 음성 인식
+        if self.recognizer is None: return None
+        with tracing.span("vosk_decode", "audio"):
+            if not self.recognizer.AcceptWaveform(data): return None
+        text = json.loads(self.recognizer.Result()).get('text', '')
+        if text: self._on_text(text)
+        return text or None
+
+    def _on_text(self, text):
+        timestamp = self.session.elapsed()
+        # SPM(Syllables Per Minute): 공백 제거 후 순수 글자 수(음절)
+        syllable_count = count_syllables(text)
+        chunk_filler = count_fillers(text, self.filler_words)
+        # 전사/음절 수(word_count)/필러워 수를 한 번에 반영
+        self.session.add_speech(text, chunk_filler)
+        if self.live is not None: self.live.add_speech(syllable_count, chunk_filler)
+
+        # 순간 속도(Instant SPM) = (글자수 / 시간초) * 60
+        now = self.clock()
+        segment_duration = now - self.last_speech_end
+        if segment_duration > 0.5:
+            instant_spm = (syllable_count / segment_duration) * 60
+            # ⚡ SPM 기준 마커 찍기 (한국어 기준): 너무 빠름 / 글자가 좀 긴데 너무 느림
+            if instant_spm > FAST_SPM: self.session.add_marker(timestamp, '⚡️')
+            elif instant_spm < SLOW_SPM and syllable_count > 5: self.session.add_marker(timestamp, '🐢')
+        self.last_speech_end = now
+        if chunk_filler > 0: self.session.add_marker(timestamp, '💬')
+
+    def finish(self):
+        """마지막 버퍼 처리 (FinalResult, 음절 수만 반영)"""
+        if self.recognizer is None: return None
+        final_text = json.loads(self.recognizer.FinalResult()).get('text', '')
+        if final_text: self.session.add_speech(final_text)
+        return final_text or None
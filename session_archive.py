@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import wave
+import shutil
+import threading
+import numpy as np
+
+try:
+    import soundfile as sf # FLAC 저장용 (없으면 WAV로 저장)
+except ImportError:
+    sf = None
+
+MANIFEST_FILE = "manifest.json"
+RESULT_FILE = "result.json"
+VIDEO_FILE = "video.avi"
+TRACE_FILE = "trace.json" # 성능 기록 (Chrome Trace / Perfetto 형식, 추적을 켠 경우만)
+
+def _write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try: total += os.path.getsize(os.path.join(root, name))
+            except OSError: pass
+    return total
+
+class SessionArchive:
+    """연습 세션별 결과 폴더 관리
+
+    sessions/<세션 id>/ 에 영상(video.avi), 음성(audio.flac 또는 audio.wav),
+    분석 결과(result.json: 점수/대본/전사/마커/리포트)를 저장하고,
+    sessions/manifest.json 에 목록을 유지해 결과 화면에서 지난 세션을 재분석 없이 다시 열 수 있습니다.
+    오래되었거나(max_age_days) 전체 용량(max_bytes)을 넘으면 오래된 세션부터 삭제합니다 (최근 keep_min개는 유지).
+    """
+    def __init__(self, root_dir="sessions", max_bytes=2 * 1024 ** 3, max_age_days=30, keep_min=5):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.keep_min = keep_min
+        self.lock = threading.Lock()
+        os.makedirs(root_dir, exist_ok=True)
+        self.manifest_path = os.path.join(root_dir, MANIFEST_FILE)
+        self.entries = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = []
+        # 폴더가 지워진 항목은 제외
+        return [e for e in entries if os.path.isdir(os.path.join(self.root_dir, e["id"]))]
+
+    def _save_manifest_locked(self):
+        _write_json_atomic(self.manifest_path, self.entries)
+
+    def path(self, session_id, name=""):
+        return os.path.join(self.root_dir, session_id, name)
+
+    def new_session(self):
+        """새 세션 폴더를 만들고 세션 id 반환 (녹화 시작 시 호출)"""
+        base = time.strftime("%Y%m%d-%H%M%S")
+        session_id, n = base, 1
+        while os.path.exists(self.path(session_id)):
+            n += 1
+            session_id = f"{base}-{n}"
+        os.makedirs(self.path(session_id))
+        return session_id
+
+    def save_audio(self, session_id, pcm_bytes, rate=16000):
+        """16bit 모노 PCM을 FLAC(soundfile 사용 가능 시, 무손실 압축) 또는 WAV로 저장하고 경로 반환"""
+        if sf is not None:
+            path = self.path(session_id, "audio.flac")
+            try:
+                sf.write(path, np.frombuffer(pcm_bytes, dtype=np.int16), rate, format='FLAC', subtype='PCM_16')
+                return path
+            except Exception as e:
+                print(f"FLAC 저장 실패 (WAV로 저장): {e}")
+        path = self.path(session_id, "audio.wav")
+        with wave.open(path, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(rate)
+            wf.writeframes(pcm_bytes)
+        return path
+
+    @staticmethod
+    def load_audio(path):
+        """저장된 음성을 (16bit PCM bytes, 샘플레이트)로 읽음 (재생용)"""
+        if path.endswith(".flac"):
+            if sf is None: raise RuntimeError("FLAC 재생에는 soundfile 패키지가 필요합니다.")
+            data, rate = sf.read(path, dtype='int16')
+            return data.tobytes(), rate
+        with wave.open(path, 'rb') as wf:
+            return wf.readframes(wf.getnframes()), wf.getframerate()
+
+    def audio_path(self, session_id):
+        for name in ("audio.flac", "audio.wav"):
+            path = self.path(session_id, name)
+            if os.path.exists(path): return path
+        return None
+
+    def save_result(self, session_id, result):
+        """분석 결과를 result.json에 저장하고 manifest에 등록"""
+        _write_json_atomic(self.path(session_id, RESULT_FILE), result)
+        entry = {
+            "id": session_id,
+            "created": result.get("created", time.time()),
+            "mode": result.get("mode"),
+            "total_score": result.get("total_score"),
+            "bytes": _dir_size(self.path(session_id))
+        }
+        with self.lock:
+            self.entries = [e for e in self.entries if e["id"] != session_id] + [entry]
+            self._save_manifest_locked()
+
+    def load_result(self, session_id):
+        with open(self.path(session_id, RESULT_FILE), "r", encoding='utf-8') as f:
+            return json.load(f)
+
+    def list_sessions(self):
+        """manifest의 세션 목록 (최신 순)"""
+        with self.lock:
+            return sorted(self.entries, key=lambda e: e["created"], reverse=True)
+
+    def apply_retention(self):
+        """보관 기간/용량 초과 세션 삭제 (최근 keep_min개는 항상 유지). 삭제한 세션 id 목록 반환"""
+        now = time.time()
+        removed = []
+        with self.lock:
+            entries = sorted(self.entries, key=lambda e: e["created"], reverse=True)
+            kept, total = [], 0
+            for i, e in enumerate(entries):
+                expired = self.max_age_days and now - e["created"] > self.max_age_days * 86400
+                too_big = self.max_bytes and total + e.get("bytes", 0) > self.max_bytes
+                if i >= self.keep_min and (expired or too_big):
+                    removed.append(e["id"])
+                    continue
+                kept.append(e)
+                total += e.get("bytes", 0)
+            if removed:
+                self.entries = kept
+                self._save_manifest_locked()
+        for session_id in removed:
+            shutil.rmtree(self.path(session_id), ignore_errors=True)
+        # manifest에 없는 폴더(분석 전 종료 등)는 하루가 지나면 정리
+        known = {e["id"] for e in self.entries}
+        for name in os.listdir(self.root_dir):
+            path = self.path(name)
+            if name not in known and os.path.isdir(path) and now - os.path.getmtime(path) > 86400:
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(name)
+        return removed
@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+class SessionStore:
+    """연습 세션 기록 저장소 (SQLite, 추가 전용)
+
+    - sessions: 세션 1개당 1행 (시각, 발표 유형, 종합 점수, 길이)
+    - metrics: 세션별 지표 1개당 1행 (spm, gaze, fluency, match_rate ...)
+    - 세션 추가는 한 트랜잭션으로 커밋되므로 중간에 꺼져도 반쯤 쓰인 기록이 남지 않습니다.
+    - (mode, created), (created) 인덱스로 유형/기간별 조회와 최근 N개 조회가 전체 스캔 없이 동작합니다.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created REAL NOT NULL,
+                mode TEXT,
+                total_score INTEGER NOT NULL,
+                duration_sec REAL
+            )""")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS metrics (
+                session_id INTEGER NOT NULL REFERENCES sessions(id),
+                name TEXT NOT NULL,
+                value REAL,
+                PRIMARY KEY (session_id, name)
+            )""")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions(created)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_mode_created ON sessions(mode, created)")
+        self.conn.commit()
+
+    def add_session(self, mode, total_score, metrics=None, duration_sec=None, created=None):
+        """세션 1개와 지표들을 한 트랜잭션으로 추가하고 세션 id 반환"""
+        created = time.time() if created is None else created
+        with self.lock, self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO sessions (created, mode, total_score, duration_sec) VALUES (?, ?, ?, ?)",
+                (created, mode, int(total_score), duration_sec))
+            session_id = cur.lastrowid
+            if metrics:
+                self.conn.executemany("INSERT INTO metrics VALUES (?, ?, ?)",
+                                      [(session_id, name, value) for name, value in metrics.items()])
+        return session_id
+
+    def count(self, mode=None):
+        with self.lock:
+            if mode is None:
+                return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM sessions WHERE mode = ?", (mode,)).fetchone()[0]
+
+    def recent_scores(self, limit=200, mode=None):
+        """최근 limit개 세션의 종합 점수 (오래된 것 -> 최신 순서)"""
+        sql = "SELECT total_score FROM sessions"
+        args = []
+        if mode is not None:
+            sql += " WHERE mode = ?"; args.append(mode)
+        sql += " ORDER BY created DESC, id DESC LIMIT ?"; args.append(limit)
+        with self.lock:
+            rows = self.conn.execute(sql, args).fetchall()
+        return [r[0] for r in reversed(rows)]
+
+    def query(self, mode=None, since=None, until=None, limit=None, after_id=None):
+        """조건에 맞는 세션들을 지표와 함께 반환 (오래된 것 -> 최신 순서)
+
+        after_id를 주면 그 id 이후에 추가된 세션만 반환합니다 (증분 처리용).
+
+        반환값: [{"id", "created", "mode", "total_score", "duration_sec", "metrics": {...}}, ...]
+        """
+        where, args = [], []
+        if mode is not None: where.append("mode = ?"); args.append(mode)
+        if since is not None: where.append("created >= ?"); args.append(since)
+        if until is not None: where.append("created < ?"); args.append(until)
+        if after_id is not None: where.append("id > ?"); args.append(after_id)
+        sql = "SELECT id, created, mode, total_score, duration_sec FROM sessions"
+        if where: sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"; args.append(limit)
+
+        with self.lock:
+            rows = self.conn.execute(sql, args).fetchall()
+            sessions = [{"id": r[0], "created": r[1], "mode": r[2], "total_score": r[3],
+                         "duration_sec": r[4], "metrics": {}} for r in reversed(rows)]
+            by_id = {s["id"]: s for s in sessions}
+            ids = list(by_id)
+            # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                for session_id, name, value in self.conn.execute(
+                        f"SELECT session_id, name, value FROM metrics WHERE session_id IN ({','.join('?' * len(part))})", part):
+                    by_id[session_id]["metrics"][name] = value
+        return sessions
+
+    def get_state(self, key, default=None):
+        """부가 상태(JSON) 조회 (예: 진행 통계 스냅샷)"""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO state VALUES (?, ?)", (key, json.dumps(value, ensure_ascii=False)))
+
+    def migrate_json_history(self, json_path):
+        """예전 score_history.json(점수 리스트)을 한 번만 가져오고 파일은 .migrated로 이름 변경
+
+        기존 파일에는 시각/유형이 없으므로 파일 수정 시각 기준으로 1초 간격의 시각을 붙입니다.
+        """
+        if not os.path.exists(json_path): return 0
+        try:
+            with open(json_path, "r", encoding='utf-8') as f:
+                scores = json.load(f)
+        except Exception as e:
+            print(f"기존 기록 파일을 읽을 수 없습니다 ({json_path}): {e}")
+            return 0
+        scores = [s for s in scores if isinstance(s, (int, float))] if isinstance(scores, list) else []
+        base = os.path.getmtime(json_path) - len(scores)
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT INTO sessions (created, mode, total_score, duration_sec) VALUES (?, NULL, ?, NULL)",
+                                  [(base + i, int(s)) for i, s in enumerate(scores)])
+        # DB 커밋이 끝난 뒤에만 원본을 치워서, 도중에 꺼져도 다음 실행에서 다시 가져옴
+        os.replace(json_path, json_path + ".migrated")
+        print(f"📦 기존 점수 기록 {len(scores)}개를 세션 저장소로 옮겼습니다.")
+        return len(scores)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,111 @@
+import os
+import random
+import threading
+
+AUDIENCE_IDS = (1, 2)
+AUDIENCE_STATES = ('default', 'focused', 'distracted', 'question')
+DEFAULT_SPRITE_SIZE = (300, 225)
+# 청중 반응 추첨 비율 (기본 6 : 집중 2 : 딴짓 1 : 질문 1)
+AUDIENCE_STATE_POOL = ['default']*6 + ['focused']*2 + ['distracted']*1 + ['question']*1
+
+def choose_audience_states(is_anxious=False, rng=random):
+    """청중 두 명의 다음 상태 (긴장 모드면 둘 다 딴짓). 재생 모드에서는 시드를 고정해 같은 순서를 재현"""
+    if is_anxious: return 'distracted', 'distracted'
+    return rng.choice(AUDIENCE_STATE_POOL), rng.choice(AUDIENCE_STATE_POOL)
+
+class AudienceSprites:
+    """청중 이미지(audience{n}_{state}.png) 스프라이트 캐시
+
+    - preload(): 모든 상태의 PNG를 한 번만 디코딩/리사이즈 (백그라운드 스레드에서 호출 가능)
+    - get(): (청중, 상태, 크기)별 PhotoImage를 재사용 -> 상태 변경은 참조 교체만
+    - request_size(): 패널 크기가 바뀌었을 때만 백그라운드에서 다시 리사이즈
+    PhotoImage는 Tk 객체이므로 get()은 메인(UI) 스레드에서만 호출해야 합니다.
+    """
+    def __init__(self, resource_path, size=DEFAULT_SPRITE_SIZE):
+        self.resource_path = resource_path
+        self.size = tuple(size)
+        self.lock = threading.Lock()
+        self.originals = {}  # (audience, state) -> 디코딩된 원본 PIL 이미지
+        self.scaled = {}     # (audience, state, size) -> 리사이즈된 PIL 이미지
+        self.photos = {}     # (audience, state, size) -> PhotoImage (메인 스레드 전용)
+        self.pending_sizes = set()
+
+    def _path(self, audience, state):
+        path = self.resource_path(f"audience{audience}_{state}.png")
+        if not os.path.exists(path): path = self.resource_path(f"audience{audience}_default.png")
+        return path
+
+    def _original(self, audience, state):
+        key = (audience, state)
+        with self.lock:
+            img = self.originals.get(key)
+        if img is None:
+            from PIL import Image # preload()가 ComponentLoader에서 처음 불러옴 (시작 화면에는 불필요)
+            with Image.open(self._path(audience, state)) as f:
+                img = f.convert('RGBA') # 디스크 파일 핸들을 바로 닫도록 메모리로 복사
+            with self.lock:
+                self.originals[key] = img
+        return img
+
+    def _scale_all(self, size):
+        from PIL import Image
+        for audience in AUDIENCE_IDS:
+            for state in AUDIENCE_STATES:
+                try:
+                    img = self._original(audience, state).resize(size, Image.LANCZOS)
+                except Exception as e:
+                    print(f"청중 이미지 로드 실패 ({audience}, {state}): {e}")
+                    continue
+                with self.lock:
+                    self.scaled[(audience, state, size)] = img
+        with self.lock:
+            self.pending_sizes.discard(size)
+
+    def preload(self):
+        """현재 크기로 모든 청중 상태를 디코딩/리사이즈 (시작 시 백그라운드에서 호출)"""
+        self._scale_all(self.size)
+        return self
+
+    def is_ready(self, size=None):
+        size = tuple(size or self.size)
+        with self.lock:
+            return all((a, s, size) in self.scaled for a in AUDIENCE_IDS for s in AUDIENCE_STATES)
+
+    def request_size(self, size):
+        """패널 크기 변경 시 호출: 새 크기로 백그라운드 리사이즈 후 is_ready(size)가 True가 됨"""
+        size = tuple(size)
+        with self.lock:
+            if size in self.pending_sizes: return
+            self.pending_sizes.add(size)
+        threading.Thread(target=self._scale_all, args=(size,), daemon=True).start()
+
+    def set_size(self, size):
+        """새 크기를 현재 크기로 지정하고 이전 크기의 PhotoImage는 해제 (메인 스레드)"""
+        size = tuple(size)
+        if size == self.size: return
+        old = self.size
+        self.size = size
+        self.photos = {k: v for k, v in self.photos.items() if k[2] != old}
+        with self.lock:
+            self.scaled = {k: v for k, v in self.scaled.items() if k[2] != old}
+
+    def get(self, audience, state, size=None):
+        """(청중, 상태, 크기)에 해당하는 PhotoImage 반환 (메인 스레드). 실패 시 None"""
+        size = tuple(size or self.size)
+        key = (audience, state if state in AUDIENCE_STATES else 'default', size)
+        photo = self.photos.get(key)
+        if photo is not None: return photo
+        with self.lock:
+            img = self.scaled.get(key)
+        from PIL import Image, ImageTk
+        try:
+            if img is None: # 아직 미리 로드되지 않았으면 이번 한 번만 직접 처리
+                img = self._original(audience, key[1]).resize(size, Image.LANCZOS)
+                with self.lock:
+                    self.scaled[key] = img
+            photo = ImageTk.PhotoImage(img)
+        except Exception as e:
+            print(f"청중 이미지 표시 실패 ({audience}, {state}): {e}")
+            return None
+        self.photos[key] = photo
+        return photo
@@ -0,0 +1,94 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class ComponentLoader:
+    """무거운 구성요소(FaceMesh, Vosk, Whisper, PyAudio 등)를 백그라운드에서 병렬로 준비
+
+    - register(name, loader)로 등록하고 start()로 한꺼번에 로드를 시작합니다.
+    - is_ready()/get()으로 준비 상태를 확인하거나 준비될 때까지 기다릴 수 있습니다.
+    - 로드에 실패해도 '완료'로 간주하며(값은 None), 오류는 error()로 확인합니다.
+    """
+    def __init__(self, max_workers=4, t0=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.components = {}
+        self.stages = {} # 구성요소 외의 단계별 시간 (import, 첫 화면 표시 등)
+
+    def register(self, name, loader):
+        self.components[name] = {
+            "loader": loader, "value": None, "error": None, "status": "pending",
+            "start": None, "end": None, "event": threading.Event()
+        }
+
+    def mark_stage(self, name, seconds=None):
+        """프로세스 시작 기준 경과 시간(또는 직접 잰 시간)을 단계 이름으로 기록"""
+        with self.lock:
+            self.stages[name] = seconds if seconds is not None else time.perf_counter() - self.t0
+
+    def start(self):
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="startup")
+        for name in self.components:
+            pool.submit(self._load, name)
+        pool.shutdown(wait=False)
+
+    def _load(self, name):
+        comp = self.components[name]
+        with self.lock:
+            comp["status"] = "loading"
+            comp["start"] = time.perf_counter()
+        try:
+            value, error, status = comp["loader"](), None, "ready"
+        except Exception as e:
+            value, error, status = None, e, "failed"
+            print(f"❌ [{name}] 로드 실패: {e}")
+        with self.lock:
+            comp["value"], comp["error"], comp["status"] = value, error, status
+            comp["end"] = time.perf_counter()
+        comp["event"].set()
+
+    def is_ready(self, *names):
+        """지정한 구성요소가 모두 로드를 마쳤는지 (실패 포함)"""
+        return all(self.components[n]["event"].is_set() for n in names)
+
+    def all_done(self):
+        return self.is_ready(*self.components)
+
+    def get(self, name, timeout=None):
+        """준비될 때까지 기다렸다가 값 반환 (실패했거나 시간 초과면 None)"""
+        comp = self.components[name]
+        comp["event"].wait(timeout)
+        return comp["value"]
+
+    def status(self, name):
+        return self.components[name]["status"]
+
+    def error(self, name):
+        return self.components[name]["error"]
+
+    def report(self):
+        """단계/구성요소별 소요 시간(초) 리포트"""
+        with self.lock:
+            report = {"stages": dict(self.stages), "components": {}}
+            for name, comp in self.components.items():
+                duration = None
+                if comp["start"] is not None and comp["end"] is not None:
+                    duration = comp["end"] - comp["start"]
+                report["components"][name] = {
+                    "status": comp["status"],
+                    "seconds": duration,
+                    "ready_at": (comp["end"] - self.t0) if comp["end"] is not None else None
+                }
+            return report
+
+    def format_report(self):
+        report = self.report()
+        lines = ["⏱️ [시작 시간 리포트]"]
+        for name, sec in report["stages"].items():
+            lines.append(f"  - {name}: {sec:.2f}s")
+        for name, info in report["components"].items():
+            seconds = f"{info['seconds']:.2f}s" if info["seconds"] is not None else "-"
+            ready_at = f"{info['ready_at']:.2f}s" if info["ready_at"] is not None else "-"
+            lines.append(f"  - {name}: {info['status']} (로드 {seconds}, 준비 시점 {ready_at})")
+        return "\n".join(lines)
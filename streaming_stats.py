@@ -0,0 +1,172 @@
+"""녹화 중 데이터가 들어올 때마다 갱신하는 누적 통계 (평균/분산, 히스토그램, 분위수, 분 단위 구간)
+
+녹화가 끝난 뒤 전체 볼륨 목록을 다시 훑지 않도록 모든 값은 add() 시점에 O(1)로 갱신되며,
+summary()는 세션 길이와 무관하게 (분 단위 구간 수만큼만) 바로 결과를 만듭니다.
+"""
+import math
+
+VOLUME_HIST_MAX = 16000 # 볼륨 히스토그램 상한 (audioop.rms 기준, 넘으면 마지막 칸)
+VOLUME_HIST_BINS = 32
+BUCKET_SEC = 60.0 # 분 단위 구간 길이
+
+class RunningStats:
+    """Welford 방식 개수/평균/분산/최소/최대 (np.std와 같은 모표준편차)"""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min: self.min = value
+        if self.max is None or value > self.max: self.max = value
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "std": self.std, "min": self.min, "max": self.max}
+
+class Histogram:
+    """고정 구간 히스토그램 (lo 미만은 첫 칸, hi 이상은 마지막 칸)"""
+    def __init__(self, lo, hi, bins):
+        self.lo = lo
+        self.width = (hi - lo) / bins
+        self.counts = [0] * bins
+
+    def add(self, value):
+        index = int((value - self.lo) / self.width)
+        self.counts[min(len(self.counts) - 1, max(0, index))] += 1
+
+    def to_dict(self):
+        return {"lo": self.lo, "width": self.width, "counts": list(self.counts)}
+
+class P2Quantile:
+    """P² 알고리즘 분위수 추정 (Jain & Chlamtac, 1985). 값을 저장하지 않고 마커 5개만 유지"""
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        q = self.heights
+        if len(q) < 5:
+            q.append(value)
+            if len(q) == 5: q.sort()
+            return
+
+        # 값이 들어갈 칸 찾기 (양 끝 마커는 최소/최대로 갱신)
+        if value < q[0]: q[0] = value; k = 0
+        elif value >= q[4]: q[4] = value; k = 3
+        else: k = next(i for i in range(4) if q[i] <= value < q[i + 1])
+
+        n = self.positions
+        for i in range(k + 1, 5): n[i] += 1
+        for i in range(5): self.desired[i] += self.increments[i]
+
+        # 가운데 마커 3개를 목표 위치 쪽으로 한 칸씩 옮기며 높이 보정 (포물선, 안 되면 선형)
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    @property
+    def value(self):
+        q = self.heights
+        if not q: return None
+        if len(q) < 5: # 값이 5개 미만이면 정확한 분위수
+            ordered = sorted(q)
+            return ordered[min(len(ordered) - 1, int(round(self.p * (len(ordered) - 1))))]
+        return q[2]
+
+class MinuteBuckets:
+    """경과 시간(초)별 분 단위 합계 (bucket마다 필드 이름 -> 합계)"""
+    def __init__(self, bucket_sec=BUCKET_SEC):
+        self.bucket_sec = bucket_sec
+        self.buckets = []
+
+    def add(self, t, **values):
+        index = max(0, int(t // self.bucket_sec))
+        while len(self.buckets) <= index: self.buckets.append({})
+        bucket = self.buckets[index]
+        for name, value in values.items():
+            bucket[name] = bucket.get(name, 0) + value
+
+class SessionStats:
+    """녹화 1회분의 누적 통계 (RecordingSession이 lock 안에서 갱신)
+
+    - 볼륨: Welford 평균/표준편차, 히스토그램, p10/p50/p90 (P²)
+    - 분 단위: 볼륨 평균, 음절 수(SPM), 필러/떨림 수, 시선 정면/대본 비율
+    """
+    def __init__(self, bucket_sec=BUCKET_SEC):
+        self.volume = RunningStats()
+        self.volume_hist = Histogram(0, VOLUME_HIST_MAX, VOLUME_HIST_BINS)
+        self.volume_quantiles = {p: P2Quantile(p) for p in (0.1, 0.5, 0.9)}
+        self.minutes = MinuteBuckets(bucket_sec)
+
+    def add_volume(self, t, rms, trembled=False):
+        self.volume.add(rms)
+        self.volume_hist.add(rms)
+        for quantile in self.volume_quantiles.values(): quantile.add(rms)
+        self.minutes.add(t, volume_count=1, volume_sum=rms, trembles=1 if trembled else 0)
+
+    def add_speech(self, t, syllables, fillers=0):
+        self.minutes.add(t, syllables=syllables, fillers=fillers)
+
+    def add_gaze(self, t, face_detected, looking_down):
+        self.minutes.add(t, gaze_frames=1, looking_frames=1 if face_detected and not looking_down else 0,
+                         script_frames=1 if looking_down else 0)
+
+    def per_minute(self, duration_sec=None):
+        """분 단위 차트용 목록 [{"minute", "spm", "volume", "fillers", "trembles", "gaze_ratio", "script_ratio"}]
+
+        마지막 구간은 실제 길이(duration_sec)로 나눠 SPM이 낮게 나오지 않게 함
+        """
+        rows = []
+        size = self.minutes.bucket_sec
+        for i, b in enumerate(self.minutes.buckets):
+            span = size
+            if duration_sec is not None and i == len(self.minutes.buckets) - 1:
+                span = min(size, max(1.0, duration_sec - i * size))
+            frames = b.get("gaze_frames", 0)
+            rows.append({
+                "minute": i + 1,
+                "spm": int(b.get("syllables", 0) / span * 60),
+                "volume": int(b["volume_sum"] / b["volume_count"]) if b.get("volume_count") else 0,
+                "fillers": b.get("fillers", 0), "trembles": b.get("trembles", 0),
+                "gaze_ratio": b.get("looking_frames", 0) / frames if frames else None,
+                "script_ratio": b.get("script_frames", 0) / frames if frames else None,
+            })
+        return rows
+
+    def summary(self, duration_sec=None):
+        """결과 저장용 요약 (JSON으로 그대로 저장 가능)"""
+        volume = self.volume.to_dict()
+        volume.update({f"p{int(p * 100)}": q.value for p, q in self.volume_quantiles.items()})
+        volume["histogram"] = self.volume_hist.to_dict()
+        return {"volume": volume, "per_minute": self.per_minute(duration_sec)}
+
+def volume_stats(volumes):
+    """저장된 볼륨 목록으로 같은 요약을 만듦 (실시간 누적값이 없는 예전 결과/파일 분석용)"""
+    stats = SessionStats()
+    for rms in volumes: stats.add_volume(0, rms)
+    return stats.summary()["volume"]
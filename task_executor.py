@@ -0,0 +1,134 @@
+import os
+import queue
+import threading
+import tracing
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+class CancelToken(threading.Event):
+    """작업 취소 신호 (threading.Event 기반이라 기존 cancel_event 인자에 그대로 넘길 수 있음)"""
+    def cancel(self):
+        self.set()
+
+    @property
+    def cancelled(self):
+        return self.is_set()
+
+class TaskHandle:
+    """제출된 작업 하나 (future + 취소 토큰 + 소속 그룹)"""
+    def __init__(self, future, token, group):
+        self.future = future
+        self.token = token
+        self.group = group
+
+    def cancel(self):
+        """아직 시작 전이면 실행하지 않고, 실행 중이면 토큰으로 중단을 요청 (완료 콜백도 호출되지 않음)"""
+        self.token.cancel()
+        self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+class TaskExecutor:
+    """앱 전체가 공유하는 백그라운드 작업 실행기
+
+    - kind="cpu": Whisper/분석 등 계산 위주 작업 (작은 풀)
+    - kind="io": LLM 호출, 질문 미리 받기, 사운드/재생 루프 등 대기 위주 작업
+    작업 함수는 첫 인자로 CancelToken을 받아 주기적으로 확인해야 합니다.
+    on_done/on_error 콜백은 attach()한 Tk 루프에서 실행되므로 위젯을 바로 다뤄도 안전하며,
+    취소된 작업의 on_done/on_error는 버려지고 on_cancel만 (작업이 실제로 멈춘 뒤) 호출됩니다. 페이지를 떠나거나 새 녹화를 시작하면 cancel_group()으로
+    해당 그룹의 진행 중 작업을 한꺼번에 취소합니다.
+    """
+    def __init__(self, cpu_workers=None, io_workers=6, poll_ms=30):
+        cpu_workers = cpu_workers or max(1, min(2, (os.cpu_count() or 2) // 2))
+        self.pools = {
+            "cpu": ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix="task-cpu"),
+            "io": ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="task-io"),
+        }
+        self.poll_ms = poll_ms
+        self.lock = threading.Lock()
+        self.groups = {}
+        self.callbacks = queue.SimpleQueue()
+        self.root = None
+
+    def attach(self, root):
+        """Tk 루트에 붙여 완료 콜백을 UI 스레드에서 처리"""
+        self.root = root
+        root.after(self.poll_ms, self._pump)
+
+    def _pump(self):
+        while True:
+            try: callback, args = self.callbacks.get_nowait()
+            except queue.Empty: break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"작업 완료 콜백 오류: {e}")
+        try:
+            if self.root is not None and self.root.winfo_exists():
+                self.root.after(self.poll_ms, self._pump)
+        except Exception:
+            pass # 창이 닫히는 중
+
+    def submit(self, fn, *args, kind="io", group=None, on_done=None, on_error=None, on_cancel=None, token=None):
+        """fn(token, *args)를 kind 풀에서 실행하고 TaskHandle 반환"""
+        token = token or CancelToken()
+
+        def run():
+            if token.cancelled: raise CancelledError()
+            return fn(token, *args)
+
+        future = self.pools[kind].submit(run)
+        handle = TaskHandle(future, token, group)
+        if group is not None:
+            with self.lock:
+                self.groups.setdefault(group, set()).add(handle)
+                tracing.counter("executor_pending", sum(len(h) for h in self.groups.values()))
+        future.add_done_callback(lambda f: self._on_future_done(handle, on_done, on_error, on_cancel))
+        return handle
+
+    def _on_future_done(self, handle, on_done, on_error, on_cancel=None):
+        if handle.group is not None:
+            with self.lock:
+                self.groups.get(handle.group, set()).discard(handle)
+        if handle.token.cancelled or handle.future.cancelled():
+            if on_cancel: self._dispatch(on_cancel)
+            return
+        error = handle.future.exception()
+        if error is not None:
+            if isinstance(error, CancelledError):
+                if on_cancel: self._dispatch(on_cancel)
+                return
+            if on_error: self._dispatch(on_error, error)
+            else: print(f"백그라운드 작업 오류: {error}")
+        elif on_done:
+            self._dispatch(on_done, handle.future.result())
+
+    def _dispatch(self, callback, *args):
+        # attach() 전(또는 Tk 없이 쓰는 경우)에는 작업 스레드에서 바로 호출
+        if self.root is None: callback(*args)
+        else: self.callbacks.put((callback, args))
+
+    def cancel_group(self, group):
+        """그룹에 속한 진행 중/대기 중 작업을 모두 취소하고 취소한 개수 반환"""
+        with self.lock:
+            handles = self.groups.pop(group, set())
+        for handle in handles:
+            handle.cancel()
+        return len(handles)
+
+    def pending(self, group=None):
+        with self.lock:
+            if group is not None: return len(self.groups.get(group, ()))
+            return sum(len(h) for h in self.groups.values())
+
+    def shutdown(self):
+        with self.lock:
+            groups = list(self.groups)
+        for group in groups:
+            self.cancel_group(group)
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,90 @@
+import threading
+
+from ai_rewriter import AI_Announcer
+from llm_backend import LocalStubProvider
+
+def rewrite_stub():
+    """재작성 요청은 문단 원문에 표시를 붙여 돌려줌 (호출 횟수 확인용)"""
+    def responder(prompt, config):
+        return "재작성: " + prompt.rsplit("---\n", 1)[1].strip()
+    return LocalStubProvider(latency_sec=0, jitter_sec=0, chunk_chars=5, chunk_delay_sec=0, seed=0, responder=responder)
+
+def test_stream_yields_chunks_in_order():
+    chunks = list(AI_Announcer(rewrite_stub()).rewrite_stream("스트리밍으로 받는 대본입니다", "B"))
+    assert len(chunks) > 1
+    assert "".join(chunks) == "재작성: 스트리밍으로 받는 대본입니다"
+
+def test_stream_stops_when_cancelled():
+    cancel = threading.Event()
+    chunks = []
+    for chunk in AI_Announcer(rewrite_stub()).rewrite_stream("아주 길게 이어지는 대본 문장입니다", "B", cancel):
+        chunks.append(chunk)
+        cancel.set()
+    assert len(chunks) == 1
+
+def test_stream_without_model_reports_error():
+    assert next(AI_Announcer(None).rewrite_stream("대본", "A")).startswith("❌")
+
+def recording_stub(prompts):
+    """프롬프트를 기록하고 몇 번째 호출인지 돌려줌"""
+    def responder(prompt, config):
+        prompts.append(prompt)
+        return f"재작성 결과 {len(prompts)}"
+    return LocalStubProvider(latency_sec=0, jitter_sec=0, seed=0, responder=responder)
+
+def numbered_script(n, changed=None):
+    return "\n".join(f"{i}번째 줄은 발표 대본의 한 문장입니다." if i != changed else f"{i}번째 줄을 고쳐 썼습니다."
+                     for i in range(n))
+
+def test_sections_keep_lines_and_follow_budget():
+    assert AI_Announcer.split_sections(numbered_script(5)) == [numbered_script(5)]
+    script = numbered_script(40)
+    assert 1 < len(AI_Announcer.split_sections(script)) <= 3 # 줄마다가 아니라 예산 크기로 묶음
+    sections = AI_Announcer.split_sections(script, max_tokens=60)
+    assert len(sections) > 3
+    assert "\n".join(sections) == script # 구간 안 줄바꿈은 원문 그대로
+    assert AI_Announcer.split_sections("첫 문단\n\n\n둘째 문단", max_tokens=1) == ["첫 문단", "둘째 문단"]
+    assert AI_Announcer.split_sections("  ") == []
+
+def test_section_count_is_capped():
+    sections = AI_Announcer.split_sections(numbered_script(400), max_tokens=1, max_sections=8)
+    assert 1 < len(sections) <= 8
+    assert "\n".join(sections) == numbered_script(400)
+
+def test_first_rewrite_of_many_lines_is_one_request():
+    prompts = []
+    announcer = AI_Announcer(recording_stub(prompts))
+    assert announcer.find_previous_rewrite(numbered_script(40), "A") is None
+    assert announcer.rewrite_incremental(numbered_script(40), "A") == "재작성 결과 1"
+    assert len(prompts) == 1
+
+def test_edit_sends_previous_rewrite_and_changed_section_only():
+    prompts = []
+    announcer = AI_Announcer(recording_stub(prompts))
+    original = numbered_script(60)
+    assert "".join(announcer.rewrite_stream(original, "A")) == "재작성 결과 1"
+
+    edited = numbered_script(60, changed=30)
+    assert announcer.find_previous_rewrite(edited, "A") is not None
+    assert announcer.find_previous_rewrite(edited, "B") is None # 다른 스타일 결과는 쓰지 않음
+    assert announcer.rewrite_incremental(edited, "A") == "재작성 결과 2"
+    assert len(prompts) == 2
+    prompt = prompts[1]
+    assert "재작성 결과 1" in prompt and "30번째 줄을 고쳐 썼습니다." in prompt
+    sections = AI_Announcer.split_sections(edited)
+    assert len(sections) >= 3
+    assert sections[0] not in prompt and sections[-1] not in prompt # 바뀌지 않은 구간은 보내지 않음
+    assert len(prompt) < len(prompts[0]) + len(original)
+
+    assert announcer.rewrite_incremental(edited, "A") == "재작성 결과 2" # 고친 곳이 없으면 호출 없음
+    assert len(prompts) == 2
+
+def test_incremental_rewrite_cancelled():
+    cancel = threading.Event(); cancel.set()
+    assert AI_Announcer(rewrite_stub()).rewrite_incremental("가\n나", "A", cancel_event=cancel) is None
+
+def test_cancelled_stream_is_not_remembered():
+    cancel = threading.Event()
+    announcer = AI_Announcer(rewrite_stub())
+    for _ in announcer.rewrite_stream("아주 길게 이어지는 대본 문장입니다", "B", cancel): cancel.set()
+    assert announcer.find_previous_rewrite("아주 길게 이어지는 대본 문장입니다", "B") is None
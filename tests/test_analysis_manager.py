@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+import app_config
+from analysis_manager import AnalysisManager
+from llm_backend import LocalStubProvider, STUB_REPORT
+
+LONG_TEXT = "인공지능 발표 코칭 시스템의 실험 결과를 설명합니다. " * 1500
+
+@pytest.fixture
+def manager():
+    return AnalysisManager(app_config.STOPWORDS, app_config.COACHING_CONFIG)
+
+def stub(responder=None):
+    return LocalStubProvider(latency_sec=0, jitter_sec=0, seed=0, responder=responder)
+
+def test_validate_combined_response_accepts_fenced_json(manager):
+    text = "```json\n" + json.dumps({"keywords": [" 데이터 ", "", 3, "모델"], "logic_gaps": [],
+                                     "question": " 근거는? ", "report": "리포트"}, ensure_ascii=False) + "\n```"
+    assert manager.validate_combined_response(text, keyword_count=1) == {
+        "keywords": ["데이터"], "logic_gaps": [], "question": "근거는?", "report": "리포트"}
+
+@pytest.mark.parametrize("text", ["", "not json", "[]", '{"keywords": "데이터", "question": "q", "report": "r"}',
+                                  '{"keywords": [], "question": "q", "report": " "}'])
+def test_validate_combined_response_rejects_bad_schema(manager, text):
+    assert manager.validate_combined_response(text) is None
+
+def test_report_uses_combined_json_response(manager):
+    report, combined = manager.build_feedback_report(stub(), "정보 전달", "짧은 대본입니다.", 350, "짧은 발표 내용입니다.", [1000] * 20)
+    assert combined["keywords"] == ["데이터", "분석", "결과"]
+    assert combined["question"] in report
+    assert report.endswith(STUB_REPORT)
+
+def test_fallback_reuses_condensed_text(manager):
+    prompts = []
+    def responder(prompt, config):
+        prompts.append(prompt)
+        return "JSON 아님" if config.get("response_mime_type") else "요약 또는 리포트"
+    report, combined = manager.build_feedback_report(stub(responder), "정보 전달", LONG_TEXT, 350, LONG_TEXT, [1000] * 20)
+    assert combined is None
+    summaries = [p for p in prompts if "한 구간입니다" in p]
+    # 대본/STT를 한 번씩만 구간 요약하고, 통합 요청 1번 + 개별 리포트 1번
+    assert summaries and len(prompts) == len(summaries) + 2
+    assert len([p for p in summaries if "발표 STT" in p]) == len([p for p in summaries if "발표 대본" in p])
+    assert report.endswith("요약 또는 리포트")
+
+def test_no_text_model_gives_rule_based_report(manager):
+    report, combined = manager.build_feedback_report(None, "공감", "대본", 350, "안녕하세요 여러분 반가워요", [1000] * 20)
+    assert combined is None
+    assert "규칙 기반" in report and "건너뜁니다" in report
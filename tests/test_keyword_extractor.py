@@ -0,0 +1,41 @@
+import json
+
+import keyword_extractor
+from keyword_extractor import LocalKeywordExtractor
+
+STOPWORDS = ["그리고", "오늘", "여러분"]
+
+def test_tokenize_strips_josa_and_stopwords():
+    extractor = LocalKeywordExtractor(STOPWORDS)
+    assert extractor.tokenize("오늘 여러분 데이터를 분석에서는 모델의 성능은") == ["데이터", "분석", "모델", "성능"]
+
+def test_nouns_ending_in_do_gwa_are_kept():
+    """'정확도', '결과'의 끝 글자는 조사가 아님"""
+    extractor = LocalKeywordExtractor(STOPWORDS)
+    assert extractor.tokenize("정확도 결과 제도") == ["정확도", "결과", "제도"]
+
+def test_ambiguous_josa_removed_when_stem_is_known():
+    extractor = LocalKeywordExtractor(STOPWORDS)
+    extractor.doc_freq.update(["학생"])
+    assert extractor.tokenize("학생도 선생님과") == ["학생", "선생님과"]
+
+def test_extract_ranks_by_tfidf_and_learns_once(tmp_path):
+    corpus = tmp_path / "corpus.json"
+    extractor = LocalKeywordExtractor(STOPWORDS, str(corpus))
+    extractor.extract("공통 단어 공통 설명", 3)
+    script = "공통 인공지능 인공지능 코칭"
+    assert extractor.extract(script, 2) == ["인공지능", "코칭"]
+    assert extractor.doc_count == 2
+    extractor.extract(script, 2)
+    assert extractor.doc_count == 2 # 같은 대본은 한 번만 집계
+    assert json.loads(corpus.read_text(encoding='utf-8'))["doc_count"] == 2
+
+def test_doc_hashes_are_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(keyword_extractor, "MAX_DOC_HASHES", 3)
+    corpus = tmp_path / "corpus.json"
+    extractor = LocalKeywordExtractor(STOPWORDS, str(corpus))
+    for i in range(5): extractor.add_document(f"대본 번호 {i}")
+    assert len(extractor.doc_hashes) == 3
+    assert extractor.doc_count == 5
+    reloaded = LocalKeywordExtractor(STOPWORDS, str(corpus))
+    assert list(reloaded.doc_hashes) == list(extractor.doc_hashes)
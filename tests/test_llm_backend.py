@@ -0,0 +1,57 @@
+import sys
+import types
+
+import pytest
+
+from llm_backend import LocalStubProvider, GeminiProvider, RateLimitExceeded, STUB_REPORT, create_provider
+
+def quick_stub(**kwargs):
+    return LocalStubProvider(latency_sec=0, jitter_sec=0, chunk_delay_sec=0, **kwargs)
+
+def test_stub_answers_by_request_kind():
+    stub = quick_stub()
+    assert stub.generate_content("AI 코칭 리포트를 작성하세요").text == STUB_REPORT
+    assert "report" in stub.generate_content("분석", generation_config={"response_mime_type": "application/json"}).text
+    assert stub.generate_content("설명\n--- PARAGRAPH 1 ---\n원문 문단").text == "원문 문단"
+
+def test_stub_stream_rejoins_to_full_text():
+    stub = quick_stub(chunk_chars=3)
+    chunks = [c.text for c in stub.generate_content("AI 코칭 리포트", stream=True)]
+    assert len(chunks) > 1 and "".join(chunks) == STUB_REPORT
+
+def test_stub_failures_are_reproducible_with_seed():
+    def outcomes(seed):
+        stub = quick_stub(error_rate=0.3, rate_limit_rate=0.3, seed=seed)
+        result = []
+        for _ in range(20):
+            try:
+                stub.generate_content("요청"); result.append("ok")
+            except RateLimitExceeded: result.append("429")
+            except RuntimeError: result.append("500")
+        return result, stub.stats
+    first, stats = outcomes(7)
+    assert first == outcomes(7)[0]
+    assert stats["calls"] == 20 and stats["rate_limited"] == first.count("429") and stats["errors"] == first.count("500")
+
+def test_create_provider():
+    assert isinstance(create_provider({"backend": "local", "stub": {"latency_sec": 0}}), LocalStubProvider)
+    with pytest.raises(ValueError):
+        create_provider({"backend": "gemini", "model_name": "m"})
+    with pytest.raises(ValueError):
+        create_provider({"backend": "unknown"})
+
+def test_gemini_provider_forwards_kwargs(monkeypatch):
+    calls = []
+    class FakeModel:
+        def __init__(self, name): self.name = name
+        def generate_content(self, prompt, **kwargs): calls.append((prompt, kwargs)); return "응답"
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda api_key: None
+    genai.GenerativeModel = FakeModel
+    google = types.ModuleType("google"); google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+
+    provider = GeminiProvider("key", "gemini-test")
+    assert provider.generate_content("p", {"temperature": 0}, safety_settings="s") == "응답"
+    assert calls == [("p", {"generation_config": {"temperature": 0}, "stream": False, "safety_settings": "s"})]
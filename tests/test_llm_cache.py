@@ -0,0 +1,75 @@
+import time
+
+from llm_backend import LocalStubProvider
+from llm_cache import LLMResponseCache, CachedTextModel
+from llm_scheduler import PRIORITY_QUESTION, PRIORITY_REPORT
+
+def make_cache(tmp_path, **kwargs):
+    return LLMResponseCache(str(tmp_path / "cache.db"), **kwargs)
+
+def stub():
+    return LocalStubProvider(latency_sec=0, jitter_sec=0, chunk_chars=4, chunk_delay_sec=0,
+                             responder=lambda prompt, config: f"답: {prompt} 입니다")
+
+def test_get_put_roundtrip_and_persist(tmp_path):
+    cache = make_cache(tmp_path)
+    key = cache.make_key("m", "프롬프트", {"temperature": 0})
+    assert cache.get(key) is None
+    cache.put(key, "m", "응답")
+    assert cache.get(key) == "응답"
+    cache.close()
+    reopened = make_cache(tmp_path)
+    assert reopened.get(key) == "응답"
+    assert reopened.stats()["entries"] == 1
+
+def test_key_depends_on_model_prompt_and_config():
+    keys = {LLMResponseCache.make_key("a", "p"), LLMResponseCache.make_key("b", "p"),
+            LLMResponseCache.make_key("a", "q"), LLMResponseCache.make_key("a", "p", {"top_k": 1})}
+    assert len(keys) == 4
+    assert LLMResponseCache.make_key("a", "p", {}) == LLMResponseCache.make_key("a", "p", None)
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=30)
+    for name in ("a", "b"):
+        cache.put(name, "m", "x" * 10)
+        time.sleep(0.01)
+    cache.get("a") # a를 최근 사용으로
+    time.sleep(0.01)
+    cache.put("c", "m", "x" * 15)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 30
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = make_cache(tmp_path, ttl_sec=0.05)
+    cache.put("k", "m", "응답")
+    time.sleep(0.1)
+    assert cache.get("k") is None
+
+def test_cached_model_reuses_deterministic_responses(tmp_path):
+    provider = stub()
+    model = CachedTextModel(provider, make_cache(tmp_path))
+    first = model.generate_content("리포트", priority=PRIORITY_REPORT).text
+    second = model.generate_content("리포트", priority=PRIORITY_REPORT).text
+    assert first == second
+    assert provider.stats["calls"] == 1
+
+def test_creative_requests_bypass_cache(tmp_path):
+    provider = stub()
+    model = CachedTextModel(provider, make_cache(tmp_path))
+    model.generate_content("질문", priority=PRIORITY_QUESTION)
+    model.generate_content("질문", priority=PRIORITY_QUESTION)
+    model.generate_content("재작성", generation_config={"temperature": 0.9})
+    model.generate_content("재작성", generation_config={"temperature": 0.9})
+    assert provider.stats["calls"] == 4
+    assert model.bypassed == 4
+    assert model.cache.stats()["entries"] == 0
+
+def test_stream_is_stored_after_full_read(tmp_path):
+    provider = stub()
+    model = CachedTextModel(provider, make_cache(tmp_path))
+    streamed = "".join(chunk.text for chunk in model.generate_content("스트림", stream=True))
+    replay = list(model.generate_content("스트림", stream=True))
+    assert len(replay) == 1 and replay[0].text == streamed
+    assert provider.stats["calls"] == 1
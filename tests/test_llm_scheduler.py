@@ -0,0 +1,70 @@
+import time
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+
+from llm_backend import LocalStubProvider, RateLimitExceeded
+from llm_scheduler import (LLMScheduler, ScheduledTextModel, is_rate_limit_error,
+                           PRIORITY_REPORT, PRIORITY_REWRITE, PRIORITY_QUESTION)
+
+def fast_stub(**kwargs):
+    return LocalStubProvider(latency_sec=kwargs.pop("latency_sec", 0.0), jitter_sec=0, chunk_delay_sec=0, seed=0, **kwargs)
+
+def test_rate_limit_error_detection():
+    assert is_rate_limit_error(RateLimitExceeded("429"))
+    assert is_rate_limit_error(RuntimeError("Quota exceeded"))
+    assert not is_rate_limit_error(RuntimeError("500 Internal error"))
+
+def test_same_key_shares_one_call():
+    provider = fast_stub(latency_sec=0.1)
+    model = ScheduledTextModel(provider, LLMScheduler(requests_per_minute=600, burst=5, report_reserve=0))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(model.generate_content("같은 프롬프트").text)) for _ in range(3)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(results) == 3 and len(set(results)) == 1
+    assert provider.stats["calls"] == 1
+    assert model.scheduler.get_stats()["deduplicated"] == 2
+
+def test_higher_priority_dispatched_first():
+    # 버킷 1칸: 첫 작업이 토큰을 쓰면 나머지는 다음 토큰(0.1초)까지 대기열에서 우선순위로 정렬됨
+    scheduler = LLMScheduler(requests_per_minute=600, burst=1, report_reserve=0, max_concurrency=1)
+    order = []
+    def job(name): return lambda: order.append(name)
+    scheduler.submit(None, job("first"), PRIORITY_QUESTION).result(timeout=5)
+    futures = [scheduler.submit(None, job("question"), PRIORITY_QUESTION),
+               scheduler.submit(None, job("rewrite"), PRIORITY_REWRITE),
+               scheduler.submit(None, job("report"), PRIORITY_REPORT)]
+    for f in futures: f.result(timeout=5)
+    assert order == ["first", "report", "rewrite", "question"]
+
+def test_backed_off_job_does_not_block_others():
+    scheduler = LLMScheduler(requests_per_minute=6000, burst=5, report_reserve=0, backoff_base=1.0)
+    attempts = []
+    def flaky_report():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1: raise RateLimitExceeded("429 (test)")
+        return "report"
+    report = scheduler.submit(None, flaky_report, PRIORITY_REPORT)
+    while not attempts: time.sleep(0.01)
+    time.sleep(0.05) # 첫 시도가 429로 백오프 대기열에 들어갈 때까지
+    question = scheduler.submit(None, lambda: "question", PRIORITY_QUESTION)
+    assert question.result(timeout=0.9) == "question" # 백오프(1초 이상)가 끝나기 전에 처리됨
+    assert not report.done()
+    assert report.result(timeout=5) == "report"
+    assert scheduler.get_stats()["retries"] == 1
+
+def test_gives_up_after_max_retries():
+    scheduler = LLMScheduler(requests_per_minute=6000, burst=5, max_retries=1, backoff_base=0.01)
+    def always_429(): raise RateLimitExceeded("429 (test)")
+    future = scheduler.submit("k", always_429, PRIORITY_REPORT)
+    with pytest.raises(RateLimitExceeded):
+        future.result(timeout=5)
+    stats = scheduler.get_stats()
+    assert stats["failed"] == 1 and stats["retries"] == 1 and stats["inflight"] == 0
+
+def test_request_timeout():
+    model = ScheduledTextModel(fast_stub(latency_sec=0.5), LLMScheduler(requests_per_minute=600), timeout=0.05)
+    with pytest.raises(FutureTimeoutError):
+        model.generate_content("느린 요청")
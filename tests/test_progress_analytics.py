@@ -0,0 +1,55 @@
+import statistics
+
+import pytest
+
+from progress_analytics import ProgressAnalytics, MetricAggregate, ALL_MODES
+from session_store import SessionStore
+
+SCORES = [62, 75, 70, 88, 81, 90, 79]
+
+def add_all(store, analytics=None):
+    bests = []
+    for i, score in enumerate(SCORES):
+        mode = "정보" if i % 2 == 0 else "설득"
+        metrics = {"gaze": score - 10, "filler_count": 10 - i}
+        session_id = store.add_session(mode, score, metrics, created=i)
+        if analytics is not None:
+            bests.append(analytics.add_session({"id": session_id, "mode": mode, "total_score": score, "metrics": metrics}))
+    return bests
+
+def test_aggregate_matches_full_recompute():
+    agg = MetricAggregate('max', window=3)
+    for v in SCORES: agg.update(v)
+    assert agg.mean == pytest.approx(statistics.mean(SCORES))
+    assert agg.std == pytest.approx(statistics.stdev(SCORES))
+    assert agg.moving_avg == pytest.approx(statistics.mean(SCORES[-3:]))
+    assert agg.best == max(SCORES)
+
+def test_personal_bests_by_direction(tmp_path):
+    store = SessionStore(str(tmp_path / "s.sqlite3"))
+    bests = add_all(store, ProgressAnalytics(store, window=3))
+    assert bests[0] == [] # 첫 기록은 비교 대상 없음
+    assert bests[1] == ["filler_count", "gaze", "total_score"]
+    assert bests[2] == ["filler_count"] # 점수는 낮아졌지만 필러워는 줄어듦
+
+def test_summary_per_mode(tmp_path):
+    store = SessionStore(str(tmp_path / "s.sqlite3"))
+    analytics = ProgressAnalytics(store, window=3)
+    add_all(store, analytics)
+    info = analytics.summary("정보")["total_score"]
+    assert info["count"] == 4 and info["mean"] == pytest.approx(statistics.mean(SCORES[::2]))
+    assert analytics.summary()["total_score"]["count"] == len(SCORES)
+    assert analytics.summary("없는 모드") == {}
+    assert ALL_MODES in analytics.scopes
+
+def test_snapshot_reload_catches_up_incrementally(tmp_path):
+    store = SessionStore(str(tmp_path / "s.sqlite3"))
+    analytics = ProgressAnalytics(store, window=3)
+    add_all(store, analytics)
+    store.add_session("정보", 99, created=100) # 스냅샷 이후 추가 (예: 다른 실행에서 저장)
+    reloaded = ProgressAnalytics(store, window=3)
+    fresh = ProgressAnalytics(SessionStore(str(tmp_path / "s.sqlite3")), window=4) # 창 크기가 바뀌면 전부 다시 계산
+    for other in (reloaded, fresh):
+        total = other.summary()["total_score"]
+        assert total["count"] == len(SCORES) + 1 and total["best"] == 99
+    assert reloaded.summary()["total_score"]["moving_avg"] == pytest.approx(statistics.mean([90, 79, 99]))
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from prosody import pitch_track, analyze_prosody
+from session_analysis import AUDIO_RATE
+
+def tone(freq_hz, seconds, amplitude=8000):
+    t = np.arange(int(seconds * AUDIO_RATE)) / AUDIO_RATE
+    # 배음이 있는 목소리 비슷한 신호
+    return amplitude * (np.sin(2 * np.pi * freq_hz * t) + 0.5 * np.sin(2 * np.pi * 2 * freq_hz * t))
+
+def silence(seconds):
+    return np.zeros(int(seconds * AUDIO_RATE))
+
+def pcm(*parts):
+    return np.concatenate(parts).astype(np.int16).tobytes()
+
+@pytest.mark.parametrize("freq", [110.0, 180.0, 250.0])
+def test_pitch_track_finds_fundamental(freq):
+    _, f0, _ = pitch_track(pcm(tone(freq, 1.0)))
+    voiced = f0[~np.isnan(f0)]
+    assert len(voiced) > 0.9 * len(f0)
+    assert np.median(voiced) == pytest.approx(freq, rel=0.02)
+
+def test_silence_has_no_pitch():
+    _, f0, rms = pitch_track(pcm(silence(1.0)))
+    assert np.isnan(f0).all() and (rms == 0).all()
+    assert len(pitch_track(b"")[1]) == 0
+
+def test_pauses_counted_between_speech_only():
+    audio = pcm(silence(1.0), tone(150, 2.0), silence(0.5), tone(150, 2.0), silence(2.0), tone(150, 2.0), silence(1.0))
+    result = analyze_prosody(audio)
+    pauses = result["pauses"]
+    assert pauses["count"] == 2 # 앞/뒤 무음은 쉼이 아님
+    assert pauses["long_count"] == 1 # 2초 쉼만 LONG_PAUSE_SEC 이상
+    assert pauses["max_sec"] == pytest.approx(2.0, abs=0.1)
+    assert result["speech_sec"] == pytest.approx(6.0, abs=0.2)
+
+def test_monotone_vs_varied_intonation():
+    flat = analyze_prosody(pcm(tone(150, 3.0)))
+    varied = analyze_prosody(pcm(*(tone(f, 0.5) for f in (110, 150, 200, 260, 180, 120))))
+    assert flat["intonation_range_st"] < 1.0
+    assert varied["intonation_range_st"] > 6.0
+    assert flat["f0_median"] == pytest.approx(150, rel=0.02)
+    assert flat["jitter_pct"] < 1.0
@@ -0,0 +1,74 @@
+from question_generator import with_exclude
+from question_pool import QuestionPool
+
+BACKUP = ["백업 질문 1", "백업 질문 2"]
+
+class FakeGenerator:
+    """규칙 질문 1개 + 호출마다 다른 AI 질문 (받은 exclude 기록)"""
+    def __init__(self):
+        self.excludes = []
+
+    def get_rule_based_dynamic_questions(self, script, target_type):
+        return ["규칙 질문"]
+
+    def _generate_ai_dynamic_question(self, script, target_type, exclude=()):
+        self.excludes.append(list(exclude))
+        return f"AI 질문 {len(self.excludes)}"
+
+class InlineExecutor:
+    """submit한 작업을 바로 실행 (백그라운드 스레드 없이 순서 확인용)"""
+    def __init__(self):
+        self.cancelled = []
+
+    def submit(self, fn, *args, group=None, **kwargs):
+        fn(None, *args)
+
+    def cancel_group(self, group):
+        self.cancelled.append(group)
+
+def make_pool(max_ai_questions=2):
+    generator = FakeGenerator()
+    return QuestionPool(None, generator, BACKUP, max_ai_questions, executor=InlineExecutor()), generator
+
+def test_prepare_fills_rule_questions_and_one_ai_question():
+    pool, generator = make_pool()
+    pool.prepare("대본", "설득")
+    assert pool.pool[0] == "AI 질문 1" # AI 질문이 가장 먼저
+    assert set(pool.pool) == {"AI 질문 1", "규칙 질문", *BACKUP}
+    assert len(generator.excludes) == 1
+
+def test_ai_questions_are_distinct_and_capped():
+    pool, generator = make_pool(max_ai_questions=2)
+    pool.prepare("대본", "설득")
+    asked = [pool.pop() for _ in range(5)]
+    assert asked[:2] == ["AI 질문 1", "AI 질문 2"]
+    assert len(generator.excludes) == 2 # 한도까지만 요청
+    assert generator.excludes[1] == ["AI 질문 1"] # 이미 받은 질문은 다음 프롬프트에서 제외
+    assert len(set(asked)) == 5
+
+def test_seeded_question_counts_toward_limit():
+    pool, generator = make_pool(max_ai_questions=2)
+    pool.seed("대본", "설득", "통합 분석 질문")
+    pool.prepare("대본", "설득")
+    assert pool.pop() == "AI 질문 1"
+    assert "통합 분석 질문" in pool.pool
+    assert generator.excludes == [["통합 분석 질문"]]
+    pool.pop()
+    assert len(generator.excludes) == 1
+
+def test_same_script_is_not_refilled_until_reset():
+    pool, generator = make_pool()
+    pool.prepare("대본", "설득")
+    first = pool.pop()
+    pool.prepare("대본", "설득")
+    assert first not in pool.pool
+    pool.reset()
+    assert pool.executor.cancelled == ["question"]
+    assert pool.asked == set()
+
+def test_with_exclude_inserts_before_last_question_label():
+    prompt = "대본: ...\n\n[질문]"
+    result = with_exclude(prompt, ["이전 질문", ""])
+    assert result.endswith("- 이전 질문\n\n[질문]")
+    assert with_exclude(prompt, []) == prompt
+    assert with_exclude("라벨 없음", ["q"]).endswith("- q")
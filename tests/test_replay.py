@@ -0,0 +1,39 @@
+import wave
+
+import numpy as np
+
+from replay import replay_session, AUDIENCE_INTERVAL_SEC
+from capture_sources import SyntheticVideoSource
+from session_analysis import AUDIO_RATE
+
+def write_wav(path, seconds, rate=AUDIO_RATE, seed=0):
+    rng = np.random.RandomState(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    samples = 6000 * np.sin(2 * np.pi * 150 * t) + rng.normal(0, 300, len(t))
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1); f.setsampwidth(2); f.setframerate(rate)
+        f.writeframes(samples.astype(np.int16).tobytes())
+    return path
+
+def test_replay_covers_whole_file(tmp_path):
+    audio = write_wav(tmp_path / "a.wav", 9.0)
+    video = SyntheticVideoSource(seed=1)
+    session, stats = replay_session(str(audio), video, seed=3)
+    assert session.duration_sec == 9.0
+    assert stats["audio_sec"] == 9.0 and stats["chunks"] > 0
+    # 가상 시계 기준으로 영상 프레임도 오디오 길이만큼 처리됨
+    assert abs(stats["frames"] - 9.0 * video.fps) <= 2
+    assert len(stats["audience"]) == int(9.0 // AUDIENCE_INTERVAL_SEC)
+    assert session.prosody["duration_sec"] == 9.0
+
+def test_replay_resamples_other_rates(tmp_path):
+    audio = write_wav(tmp_path / "a.wav", 2.0, rate=8000)
+    session, _ = replay_session(str(audio))
+    assert abs(session.duration_sec - 2.0) < 0.01
+
+def test_same_seed_same_result(tmp_path):
+    audio = str(write_wav(tmp_path / "a.wav", 10.0))
+    runs = [replay_session(audio, SyntheticVideoSource(seed=2), seed=7, question_every=3.0)[1]["audience"]
+            for _ in range(2)]
+    assert runs[0] == runs[1]
+    assert any("asker" in event for event in runs[0])
@@ -0,0 +1,76 @@
+import random
+import re
+import difflib
+
+import numpy as np
+
+from scoring import compute_scores, score_batch, stack_features, rescore_results, match_ratio
+
+def baseline_scores(script, transcript, word_count, filler_count, gaze, tremble_count, duration_sec, mode):
+    """리팩터링 전 show_analysis_page의 채점식 그대로 (비교 기준)"""
+    duration_min = max(0.01, duration_sec / 60)
+    spm = int(word_count / duration_min) if word_count > 0 else 0
+    score_speed = max(0, 100 - int(abs(350 - spm) * 0.4))
+    total_frames = max(1, gaze['total_frames'])
+    base_gaze_score = (gaze['looking_frames'] / total_frames) * 100
+    script_penalty = (gaze['script_frames'] / total_frames) * 150
+    final_gaze_score = max(0, min(100, int(base_gaze_score - script_penalty)))
+    if len(transcript.strip()) > 5:
+        clean = lambda text: re.sub(r'[^가-힣a-zA-Z0-9]', '', text)
+        match_rate = min(100, int(difflib.SequenceMatcher(None, clean(script), clean(transcript)).ratio() * 100 * 1.05))
+    else:
+        match_rate = 0
+    tremble_score = max(0, 100 - int(tremble_count / duration_min * 2))
+    score_fluency = int((max(0, 100 - filler_count * 3) + tremble_score) / 2)
+    if '정보' in mode: total = int(match_rate * 0.4 + score_fluency * 0.3 + final_gaze_score * 0.2 + score_speed * 0.1)
+    elif '설득' in mode: total = int(final_gaze_score * 0.4 + score_speed * 0.2 + score_fluency * 0.2 + match_rate * 0.2)
+    else: total = int(match_rate * 0.3 + final_gaze_score * 0.3 + score_fluency * 0.2 + score_speed * 0.2)
+    return {"total_score": total, "spm": spm, "score_speed": score_speed, "gaze": final_gaze_score,
+            "match_rate": match_rate, "fluency": score_fluency}
+
+WORDS = ["인공지능", "발표", "데이터", "결과", "분석", "연구", "청중", "코칭"]
+
+def random_session(rng):
+    script = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))
+    transcript = " ".join(w for w in script.split() if rng.random() > 0.3) if rng.random() > 0.1 else "음"
+    total = rng.randint(0, 3000)
+    looking = rng.randint(0, total)
+    return dict(script=script, transcript=transcript, word_count=rng.randint(0, 3000), filler_count=rng.randint(0, 40),
+                gaze={"total_frames": total, "looking_frames": looking, "script_frames": rng.randint(0, total - looking)},
+                tremble_count=rng.randint(0, 30), duration_sec=rng.uniform(0, 900),
+                mode=rng.choice(["정보 전달", "설득/동기부여", "공감/소통", "기타"]))
+
+def test_matches_baseline_formulas():
+    rng = random.Random(1234)
+    for _ in range(500):
+        session = random_session(rng)
+        expected = baseline_scores(**session)
+        result = compute_scores(**session)
+        assert {name: result[name] for name in expected} == expected, session
+
+def test_batch_equals_single_session_scoring():
+    rng = random.Random(7)
+    sessions = [random_session(rng) for _ in range(50)]
+    # 보관된 result.json처럼 발표 유형을 함께 저장 (재채점은 전사 대신 저장된 집계값 사용)
+    singles = [dict(compute_scores(**s), mode=s["mode"]) for s in sessions]
+    rescored = rescore_results(singles)
+    for single, again in zip(singles, rescored):
+        for name in ("total_score", "spm", "score_speed", "gaze", "match_rate", "fluency"):
+            assert single[name] == again[name]
+
+def test_long_pauses_lower_fluency_only_when_analyzed():
+    session = dict(script="발표 대본", transcript="발표 대본입니다", word_count=300, filler_count=0,
+                   gaze={"total_frames": 10, "looking_frames": 10, "script_frames": 0}, tremble_count=0,
+                   duration_sec=60, mode="정보")
+    without = compute_scores(**session)
+    with_pauses = compute_scores(**session, prosody={"pauses": {"long_count": 4}})
+    assert without["fluency"] == 100
+    assert with_pauses["fluency"] == int((100 + 100 + 60) / 3)
+    assert with_pauses["long_pause_count"] == 4 and without["long_pause_count"] is None
+
+def test_short_transcript_has_no_match_rate():
+    assert match_ratio("대본", "어") is None
+    arrays = stack_features([{"word_count": 10, "duration_sec": 60, "match_ratio": None, "mode": "정보"}])
+    scores = score_batch(arrays)
+    assert scores["match_rate"][0] == 0 and not scores["has_match"][0]
+    assert np.isnan(arrays["match_ratio"][0])
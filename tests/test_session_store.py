@@ -0,0 +1,49 @@
+import json
+import os
+
+from session_store import SessionStore
+
+def make_store(tmp_path):
+    return SessionStore(str(tmp_path / "sessions.sqlite3"))
+
+def test_add_and_query_by_mode_and_time(tmp_path):
+    store = make_store(tmp_path)
+    store.add_session("정보", 70, {"spm": 350, "gaze": 80}, 120, created=100)
+    store.add_session("설득", 80, {"spm": 400}, 60, created=200)
+    store.add_session("정보", 90, created=300)
+    assert store.count() == 3 and store.count("정보") == 2
+    assert store.recent_scores() == [70, 80, 90]
+    assert store.recent_scores(limit=1, mode="정보") == [90]
+
+    info = store.query(mode="정보")
+    assert [s["total_score"] for s in info] == [70, 90]
+    assert info[0]["metrics"] == {"spm": 350, "gaze": 80} and info[1]["metrics"] == {}
+    assert [s["created"] for s in store.query(since=150, until=300)] == [200]
+    assert [s["total_score"] for s in store.query(after_id=info[0]["id"])] == [80, 90]
+
+def test_state_roundtrip_and_reopen(tmp_path):
+    store = make_store(tmp_path)
+    store.set_state("progress", {"count": 3, "모드": "정보"})
+    store.add_session("정보", 50)
+    store.close()
+    reopened = make_store(tmp_path)
+    assert reopened.get_state("progress") == {"count": 3, "모드": "정보"}
+    assert reopened.get_state("missing", []) == []
+    assert reopened.count() == 1
+
+def test_migrate_json_history_once(tmp_path):
+    history = tmp_path / "score_history.json"
+    history.write_text(json.dumps([60, "잘못된 값", 75.0, 88]), encoding='utf-8')
+    store = make_store(tmp_path)
+    assert store.migrate_json_history(str(history)) == 3
+    assert store.recent_scores() == [60, 75, 88] # 원래 순서 유지
+    assert not history.exists() and os.path.exists(str(history) + ".migrated")
+    assert store.migrate_json_history(str(history)) == 0 # 두 번째 실행은 아무것도 안 함
+    assert store.count() == 3
+
+def test_migrate_ignores_unreadable_file(tmp_path):
+    history = tmp_path / "score_history.json"
+    history.write_text("{깨진 파일", encoding='utf-8')
+    store = make_store(tmp_path)
+    assert store.migrate_json_history(str(history)) == 0
+    assert history.exists() and store.count() == 0
@@ -0,0 +1,26 @@
+import time
+
+from startup import ComponentLoader
+
+def test_components_load_in_parallel_and_report():
+    loader = ComponentLoader(max_workers=3)
+    loader.register('slow_a', lambda: time.sleep(0.2) or "a")
+    loader.register('slow_b', lambda: time.sleep(0.2) or "b")
+    loader.register('broken', lambda: 1 / 0)
+    t = time.perf_counter()
+    loader.start()
+    assert loader.get('slow_a', timeout=5) == "a" and loader.get('slow_b', timeout=5) == "b"
+    assert time.perf_counter() - t < 0.35 # 병렬 로드
+    assert loader.get('broken', timeout=5) is None
+    assert loader.all_done()
+    assert loader.status('broken') == "failed" and isinstance(loader.error('broken'), ZeroDivisionError)
+    report = loader.report()["components"]
+    assert report['slow_a']["status"] == "ready" and report['slow_a']["seconds"] >= 0.2
+
+def test_not_ready_before_start():
+    loader = ComponentLoader()
+    loader.register('x', lambda: 1)
+    loader.mark_stage('imports', 0.5)
+    assert not loader.is_ready('x')
+    assert loader.get('x', timeout=0.01) is None
+    assert "imports: 0.50s" in loader.format_report()
@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+import pytest
+
+from streaming_stats import RunningStats, Histogram, P2Quantile, SessionStats, volume_stats
+
+def test_running_stats_matches_numpy():
+    rng = random.Random(3)
+    values = [rng.gauss(3000, 800) for _ in range(5000)]
+    stats = RunningStats()
+    for v in values: stats.add(v)
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(np.mean(values))
+    assert stats.std == pytest.approx(np.std(values)) # 모표준편차
+    assert (stats.min, stats.max) == (min(values), max(values))
+    assert RunningStats().std == 0.0
+
+def test_histogram_clamps_out_of_range():
+    hist = Histogram(0, 100, 10)
+    for v in (-5, 0, 9.9, 10, 55, 100, 1000): hist.add(v)
+    assert hist.counts == [3, 1, 0, 0, 0, 1, 0, 0, 0, 2]
+
+@pytest.mark.parametrize("p", [0.1, 0.5, 0.9])
+def test_p2_quantile_close_to_exact(p):
+    rng = random.Random(11)
+    values = [rng.lognormvariate(8, 0.5) for _ in range(20000)]
+    estimator = P2Quantile(p)
+    for v in values: estimator.add(v)
+    exact = np.percentile(values, p * 100)
+    assert estimator.value == pytest.approx(exact, rel=0.03)
+
+def test_p2_quantile_exact_for_few_values():
+    estimator = P2Quantile(0.5)
+    assert estimator.value is None
+    for v in (5, 1, 3): estimator.add(v)
+    assert estimator.value == 3
+
+def test_per_minute_buckets_and_last_partial_minute():
+    stats = SessionStats()
+    for t in range(90): # 1분 30초, 초당 볼륨 1개 / 음절 5개
+        stats.add_volume(t, 1000 if t < 60 else 3000, trembled=(t % 30 == 0))
+        stats.add_speech(t, 5, fillers=1 if t % 20 == 0 else 0)
+        stats.add_gaze(t, face_detected=True, looking_down=(t % 4 == 0))
+    rows = stats.per_minute(duration_sec=90)
+    assert [r["minute"] for r in rows] == [1, 2]
+    assert rows[0]["spm"] == 300 and rows[1]["spm"] == 300 # 마지막 30초는 실제 길이로 나눔
+    assert rows[0]["volume"] == 1000 and rows[1]["volume"] == 3000
+    assert rows[0]["fillers"] == 3 and rows[0]["trembles"] == 2
+    assert rows[0]["gaze_ratio"] == pytest.approx(45 / 60) and rows[0]["script_ratio"] == pytest.approx(15 / 60)
+
+def test_summary_is_json_ready_and_matches_volume_stats():
+    volumes = list(range(100, 2100, 10))
+    stats = SessionStats()
+    for i, v in enumerate(volumes): stats.add_volume(i * 0.1, v)
+    summary = stats.summary(duration_sec=len(volumes) * 0.1)["volume"]
+    assert summary == volume_stats(volumes)
+    assert summary["p50"] == pytest.approx(np.median(volumes), rel=0.02)
+    assert sum(summary["histogram"]["counts"]) == len(volumes)
@@ -0,0 +1,87 @@
+import threading
+
+import app_config
+from analysis_manager import AnalysisManager
+from llm_backend import LocalStubProvider
+from task_executor import TaskExecutor, CancelToken
+
+def wait_for(event):
+    assert event.wait(5)
+
+def test_on_done_receives_result_and_token_is_passed():
+    executor = TaskExecutor()
+    done = threading.Event(); results = []
+    executor.submit(lambda token, x: (isinstance(token, CancelToken), x * 2), 21,
+                    on_done=lambda r: (results.append(r), done.set()))
+    wait_for(done)
+    assert results == [(True, 42)]
+    executor.shutdown()
+
+def test_errors_go_to_on_error():
+    executor = TaskExecutor()
+    done = threading.Event(); errors = []
+    def fail(token): raise ValueError("실패")
+    executor.submit(fail, on_error=lambda e: (errors.append(e), done.set()))
+    wait_for(done)
+    assert isinstance(errors[0], ValueError)
+    executor.shutdown()
+
+def test_cancel_group_stops_running_task_and_drops_callbacks():
+    executor = TaskExecutor(io_workers=1)
+    started, finished = threading.Event(), threading.Event()
+    callbacks = []
+    def loop(token):
+        started.set()
+        while not token.cancelled: token.wait(0.01)
+        finished.set()
+        return "끝"
+    handle = executor.submit(loop, group='page', on_done=callbacks.append, on_error=callbacks.append)
+    queued = executor.submit(lambda token: callbacks.append("실행됨"), group='page')
+    wait_for(started)
+    assert executor.pending('page') == 2
+    assert executor.cancel_group('page') == 2
+    wait_for(finished)
+    assert handle.cancelled and queued.cancelled
+    assert callbacks == [] and executor.pending() == 0
+    executor.shutdown()
+
+def test_on_cancel_runs_after_cancelled_task_stops():
+    executor = TaskExecutor(io_workers=1)
+    started, cancelled = threading.Event(), threading.Event()
+    events = []
+    def loop(token):
+        started.set()
+        while not token.cancelled: token.wait(0.01)
+        events.append("멈춤")
+    executor.submit(loop, group='page', on_done=events.append,
+                    on_cancel=lambda: (events.append("취소"), cancelled.set()))
+    wait_for(started)
+    executor.cancel_group('page')
+    wait_for(cancelled)
+    assert events == ["멈춤", "취소"]
+    executor.shutdown()
+
+def test_feedback_report_stops_before_next_llm_call_when_cancelled():
+    """분석 화면을 떠나면(토큰 취소) 남은 LLM 호출을 보내지 않고 콜백도 없음"""
+    executor = TaskExecutor()
+    manager = AnalysisManager(app_config.STOPWORDS, app_config.COACHING_CONFIG)
+    first_call, release = threading.Event(), threading.Event()
+    prompts = []
+    def responder(prompt, config):
+        prompts.append(prompt)
+        first_call.set(); release.wait(5)
+        return "요약"
+    provider = LocalStubProvider(latency_sec=0, jitter_sec=0, seed=0, responder=responder)
+    long_text = "발표 내용을 길게 설명하는 문장입니다. " * 2000
+    callbacks = []
+    handle = executor.submit(lambda token: manager.build_feedback_report(
+        provider, "정보", long_text, 350, long_text, [1000] * 20, cancel_token=token),
+        group='page', on_done=callbacks.append, on_error=callbacks.append)
+    wait_for(first_call)
+    executor.cancel_group('page')
+    release.set()
+    handle.future.exception(timeout=5)
+    assert len(prompts) == 1 # 이미 보낸 첫 구간 요약만 나가고 남은 구간/통합/개별 리포트 요청은 보내지 않음
+    assert not any("JSON" in p for p in prompts)
+    assert callbacks == []
+    executor.shutdown()
@@ -0,0 +1,47 @@
+from text_chunker import estimate_tokens, split_sentences, split_into_chunks, fit_to_budget, map_reduce
+
+def numbered_script(n):
+    return " ".join(f"{i}번째 문장은 발표 내용을 설명합니다." for i in range(n))
+
+def test_estimate_tokens_counts_hangul_denser():
+    assert estimate_tokens("가" * 30) == 21
+    assert estimate_tokens("a" * 40) == 11
+
+def test_split_sentences():
+    assert split_sentences("첫 문장입니다. 둘째 문장! 셋째?\n넷째") == ["첫 문장입니다.", "둘째 문장!", "셋째?", "넷째"]
+
+def test_short_text_is_one_chunk():
+    assert split_into_chunks("짧은 대본입니다.") == ["짧은 대본입니다."]
+
+def test_chunks_respect_budget_and_overlap():
+    script = numbered_script(300)
+    chunks = split_into_chunks(script, max_tokens=400, overlap_tokens=40)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c) <= 400 for c in chunks)
+    # 마지막 문장까지 들어 있고, 다음 구간은 앞 구간 끝 문장들(overlap_tokens 이내)로 시작
+    assert "299번째" in chunks[-1]
+    first, second = split_sentences(chunks[0]), split_sentences(chunks[1])
+    overlap = [s for s in second if s in first]
+    assert overlap and overlap == first[-len(overlap):] and second[:len(overlap)] == overlap
+    assert sum(estimate_tokens(s) for s in overlap) <= 40
+
+def test_unbroken_sentence_is_split_by_characters():
+    chunks = split_into_chunks("가" * 9000, max_tokens=1000, overlap_tokens=0)
+    assert len(chunks) > 1 and "".join(chunks) == "가" * 9000
+
+def test_fit_to_budget_samples_whole_script():
+    script = numbered_script(300)
+    fitted = fit_to_budget(script, max_tokens=500)
+    assert estimate_tokens(fitted) <= 500
+    assert any(f" {i}번째" in fitted for i in range(250, 300)) # 앞부분만 남기지 않음
+    assert fit_to_budget("짧은 대본", max_tokens=500) == "짧은 대본"
+
+def test_fit_to_budget_fallback_uses_character_budget():
+    """문장 경계가 없는 한글은 글자 수가 아닌 추정 토큰 수로 잘라 예산을 거의 다 씀"""
+    fitted = fit_to_budget("가" * 30000, max_tokens=4000)
+    assert estimate_tokens(fitted) <= 4000
+    assert len(fitted) > 5500
+
+def test_map_reduce_keeps_order():
+    assert map_reduce(["a", "b", "c"], str.upper, "".join) == "ABC"
+    assert map_reduce(["x"], str.upper, list) == ["X"]
@@ -0,0 +1,70 @@
+import re
+
+# 한 번의 LLM 요청에 넣을 구간 크기 (토큰 추정치 기준)
+CHUNK_MAX_TOKENS = 4000
+CHUNK_OVERLAP_TOKENS = 200
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+|\n+')
+_HANGUL_RE = re.compile(r'[가-힣]')
+
+def estimate_tokens(text):
+    """토큰 수 대략 추정 (한글 약 1.5자/토큰, 그 외 약 4자/토큰)"""
+    hangul = len(_HANGUL_RE.findall(text))
+    return int(hangul / 1.5 + (len(text) - hangul) / 4) + 1
+
+def split_sentences(text):
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s and s.strip()]
+
+def split_into_chunks(text, max_tokens=CHUNK_MAX_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS):
+    """문장 경계 기준으로 max_tokens 이하의 구간들로 나눔 (앞 구간 끝 문장들을 overlap_tokens만큼 겹침)"""
+    if estimate_tokens(text) <= max_tokens: return [text]
+
+    sentences = []
+    for s in split_sentences(text):
+        if estimate_tokens(s) <= max_tokens:
+            sentences.append(s)
+            continue
+        # 문장 하나가 구간보다 길면 글자 수로 강제 분할
+        step = max(1, int(len(s) * max_tokens / estimate_tokens(s)))
+        sentences.extend(s[i:i + step] for i in range(0, len(s), step))
+
+    chunks, current, current_tokens = [], [], 0
+    for s in sentences:
+        t = estimate_tokens(s)
+        if current and current_tokens + t > max_tokens:
+            chunks.append(" ".join(current))
+            # 겹침: 직전 구간의 마지막 문장들을 다음 구간 앞에 다시 붙임
+            overlap, overlap_t = [], 0
+            for prev in reversed(current):
+                pt = estimate_tokens(prev)
+                if overlap_t + pt > overlap_tokens: break
+                overlap.insert(0, prev); overlap_t += pt
+            current, current_tokens = overlap, overlap_t
+        current.append(s)
+        current_tokens += t
+    if current: chunks.append(" ".join(current))
+    return chunks
+
+def fit_to_budget(text, max_tokens=CHUNK_MAX_TOKENS):
+    """API 호출 없이 예산에 맞게 줄임 (앞부분만 자르지 않고 전체에서 고르게 문장을 뽑음)"""
+    if estimate_tokens(text) <= max_tokens: return text
+    sentences = split_sentences(text)
+    total = sum(estimate_tokens(s) for s in sentences)
+    keep_ratio = max_tokens / max(1, total)
+    kept, acc = [], 0.0
+    for s in sentences:
+        acc += keep_ratio
+        if acc >= 1.0:
+            kept.append(s); acc -= 1.0
+    fitted = " ".join(kept) if kept else text
+    if estimate_tokens(fitted) <= max_tokens: return fitted
+    # 문장 경계가 없거나 남은 문장이 예산보다 길면 토큰이 아닌 추정 글자 수로 자름 (한글은 토큰당 약 1.5자)
+    return fitted[:max(1, int(len(fitted) * max_tokens / estimate_tokens(fitted)))]
+
+def map_reduce(chunks, map_fn, reduce_fn):
+    """구간별 map_fn을 순서대로 실행한 뒤 결과 리스트로 reduce_fn 호출
+
+    호출하는 쪽이 이미 TaskExecutor 작업 안에서 돌고, LLM 동시 요청 수는 LLMScheduler가 제한하므로
+    여기서 스레드 풀을 따로 만들지 않음 (취소 시 map_fn이 예외를 내면 남은 구간은 바로 건너뜀)
+    """
+    return reduce_fn([map_fn(chunk) for chunk in chunks])
@@ -0,0 +1,137 @@
+"""실행 구간(span)/카운터 기록과 Chrome Trace(Perfetto) JSON 내보내기
+
+    import tracing
+    with tracing.span("face_mesh", "video"): ...
+    tracing.counter("audio_backlog", frames)
+    tracing.export("sessions/<id>/trace.json")   # chrome://tracing 또는 ui.perfetto.dev에서 열기
+
+- 꺼져 있으면(기본) span()은 미리 만든 빈 컨텍스트를 돌려주고 counter()/instant()는 바로 반환하므로
+  전역 변수 확인 한 번 외에는 비용이 없습니다.
+- 켜져 있으면 이벤트를 리스트에 append만 합니다 (CPython에서 append는 스레드 안전, lock 없음).
+- 세션(녹화 1회)마다 start()로 새로 시작하고 export()로 파일에 쓴 뒤 stop()/clear()로 끝냅니다.
+"""
+import os
+import json
+import time
+import threading
+
+MAX_EVENTS = 500000 # 이보다 많으면 더 기록하지 않음 (메모리 보호)
+
+_enabled = False
+_events = []
+_t0_ns = 0
+_dropped = 0
+_threads = {}
+_meta = {}
+
+class _NoopSpan:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def set(self, **args): pass
+
+_NOOP = _NoopSpan()
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        event = {"name": self.name, "cat": self.cat, "ph": "X", "ts": (self.start - _t0_ns) / 1000,
+                 "dur": (end - self.start) / 1000, "pid": 1, "tid": _tid()}
+        if self.args: event["args"] = self.args
+        _append(event)
+        return False
+
+    def set(self, **args):
+        """구간이 끝나기 전에 결과값(인식 글자 수 등)을 덧붙임"""
+        if self.args is None: self.args = {}
+        self.args.update(args)
+
+def _tid():
+    ident = threading.get_ident()
+    if ident not in _threads:
+        _threads[ident] = threading.current_thread().name
+    return ident
+
+def _append(event):
+    global _dropped
+    if len(_events) >= MAX_EVENTS:
+        _dropped += 1
+        return
+    _events.append(event)
+
+def enabled():
+    return _enabled
+
+def meta():
+    """현재 기록의 meta (start()에 넘긴 session_id 등) 사본"""
+    return dict(_meta)
+
+def start(**meta):
+    """새 기록 시작 (이전 기록은 버림). meta는 내보낼 때 파일에 함께 저장"""
+    global _enabled, _t0_ns
+    clear()
+    _meta.update(meta)
+    _t0_ns = time.perf_counter_ns()
+    _enabled = True
+
+def stop():
+    global _enabled
+    _enabled = False
+
+def clear():
+    """기록한 이벤트/스레드 이름/메타 버림 (세션이 끝난 뒤 다음 start() 전까지 메모리를 잡고 있지 않게)"""
+    global _dropped
+    _events.clear()
+    _threads.clear()
+    _meta.clear()
+    _dropped = 0
+
+def span(name, cat="app", **args):
+    """with 블록의 실행 시간을 기록 (꺼져 있으면 아무것도 하지 않음)"""
+    if not _enabled: return _NOOP
+    return _Span(name, cat, args or None)
+
+def counter(name, value, cat="counter"):
+    """값 변화 기록 (대기열 길이, 누적 드롭 수 등). Perfetto에서 그래프로 표시됨"""
+    if not _enabled: return
+    _append({"name": name, "cat": cat, "ph": "C", "ts": (time.perf_counter_ns() - _t0_ns) / 1000,
+             "pid": 1, "tid": _tid(), "args": {name: value}})
+
+def instant(name, cat="app", **args):
+    """순간 이벤트 (녹화 시작/정지, 질문 팝업 등)"""
+    if not _enabled: return
+    event = {"name": name, "cat": cat, "ph": "i", "s": "t", "ts": (time.perf_counter_ns() - _t0_ns) / 1000,
+             "pid": 1, "tid": _tid()}
+    if args: event["args"] = args
+    _append(event)
+
+def summary():
+    """span 이름별 횟수/합계/최대(ms) (콘솔 출력용)"""
+    stats = {}
+    for event in list(_events):
+        if event["ph"] != "X": continue
+        s = stats.setdefault(event["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        ms = event["dur"] / 1000
+        s["count"] += 1; s["total_ms"] += ms; s["max_ms"] = max(s["max_ms"], ms)
+    return stats
+
+def export(path):
+    """Chrome Trace Event 형식(JSON)으로 저장하고 이벤트 수 반환"""
+    events = list(_events)
+    thread_names = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+                    for tid, name in list(_threads.items())]
+    meta = dict(_meta, dropped_events=_dropped)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding='utf-8') as f:
+        json.dump({"traceEvents": thread_names + events, "displayTimeUnit": "ms", "metadata": meta}, f, ensure_ascii=False)
+    return len(events)
@@ -0,0 +1,103 @@
+import tkinter as tk
+
+def downsample_minmax(values, max_buckets):
+    """값이 많으면 구간(bucket)별 최솟값/최댓값만 남겨 모양(최고/최저점)을 유지하며 줄임
+
+    반환값: [(원래 인덱스, 값), ...] (인덱스 순서 유지)
+    """
+    n = len(values)
+    if n <= max_buckets * 2: return list(enumerate(values))
+    points = []
+    step = n / max_buckets
+    for b in range(max_buckets):
+        start, end = int(b * step), min(n, int((b + 1) * step))
+        if start >= end: continue
+        lo = min(range(start, end), key=values.__getitem__)
+        hi = max(range(start, end), key=values.__getitem__)
+        for i in sorted({lo, hi}):
+            points.append((i, values[i]))
+    return points
+
+class TrendChart(tk.Canvas):
+    """연습 점수 트렌드를 Tk Canvas에 직접 그리는 가벼운 차트 (matplotlib 불필요)
+
+    - set_data()로 값만 바꾸면 기존 캔버스 아이템의 좌표만 갱신 (Figure 생성/누수 없음)
+    - 점이 많으면 픽셀 폭에 맞춰 최소/최대값 기준으로 다운샘플링
+    - 창 크기가 바뀌면 같은 데이터로 다시 그림
+    """
+    PAD_LEFT, PAD_RIGHT, PAD_TOP, PAD_BOTTOM = 40, 15, 30, 25
+    LINE_COLOR = '#007aff'
+    FILL_COLOR = '#e5f1ff' # Tk Canvas는 투명도가 없어 옅은 색으로 대신함
+    MARKER_LIMIT = 60 # 점 개수가 이보다 적을 때만 마커 표시
+
+    def __init__(self, parent, width=800, height=250, y_max=105, title="연습 점수 트렌드", **kwargs):
+        super().__init__(parent, width=width, height=height, bg='white', highlightthickness=0, **kwargs)
+        self.y_max = y_max
+        self.title = title
+        self.values = []
+        self.fill_item = None
+        self.line_item = None
+        self.bind('<Configure>', lambda e: self._redraw())
+
+    def set_data(self, values):
+        self.values = list(values)
+        self._redraw()
+
+    def append(self, value):
+        self.values.append(value)
+        self._redraw()
+
+    def _plot_area(self):
+        w, h = self.winfo_width(), self.winfo_height()
+        if w <= 1: w, h = int(self['width']), int(self['height']) # 아직 화면에 배치되기 전
+        return self.PAD_LEFT, self.PAD_TOP, w - self.PAD_RIGHT, h - self.PAD_BOTTOM
+
+    def _draw_axes(self, x0, y0, x1, y1):
+        self.delete('axes')
+        for v in range(0, 101, 20):
+            y = y1 - (y1 - y0) * v / self.y_max
+            self.create_line(x0, y, x1, y, fill='#dddddd', dash=(3, 3), tags='axes')
+            self.create_text(x0 - 6, y, text=str(v), anchor='e', fill='#666666', font=("Arial", 9), tags='axes')
+        self.create_rectangle(x0, y0, x1, y1, outline='#bbbbbb', tags='axes')
+        self.create_text((x0 + x1) / 2, y0 / 2, text=self.title, font=("Arial", 12, "bold"), tags='axes')
+
+    def _redraw(self):
+        x0, y0, x1, y1 = self._plot_area()
+        if x1 - x0 < 10 or y1 - y0 < 10: return
+        self.delete('markers', 'xlabels', 'empty')
+
+        if not self.values:
+            self.delete('axes')
+            if self.line_item: self.delete(self.line_item); self.line_item = None
+            if self.fill_item: self.delete(self.fill_item); self.fill_item = None
+            self.create_text((x0 + x1) / 2, (y0 + y1) / 2, text="아직 연습 기록이 없습니다", font=("Arial", 12), tags='empty')
+            return
+
+        self._draw_axes(x0, y0, x1, y1)
+        n = len(self.values)
+        # 1회차를 왼쪽 끝보다 반 칸 안쪽에 두어 점이 테두리에 걸리지 않게 함 (x: 0.5 ~ n+0.5)
+        sx = (x1 - x0) / n
+        sy = (y1 - y0) / self.y_max
+        points = downsample_minmax(self.values, max(1, (x1 - x0) // 2))
+        xy = [(x0 + (i + 0.5) * sx, y1 - min(max(v, 0), self.y_max) * sy) for i, v in points]
+        coords = [c for p in xy for c in p]
+        if len(xy) == 1: coords += coords # 점 하나일 때도 선 아이템 유지
+
+        fill_coords = [coords[0], y1] + coords + [coords[-2], y1]
+        if self.fill_item is None:
+            self.fill_item = self.create_polygon(*fill_coords, fill=self.FILL_COLOR, outline='')
+            self.line_item = self.create_line(*coords, fill=self.LINE_COLOR, width=2)
+        else:
+            self.coords(self.fill_item, *fill_coords)
+            self.coords(self.line_item, *coords)
+        self.tag_raise('axes', self.fill_item)
+        self.tag_raise(self.line_item)
+
+        if n <= self.MARKER_LIMIT:
+            for x, y in xy:
+                self.create_oval(x - 3, y - 3, x + 3, y + 3, fill=self.LINE_COLOR, outline='white', tags='markers')
+
+        # X축 눈금: 정수 회차만, 최대 10개 정도
+        tick_step = max(1, -(-n // 10))
+        for i in range(0, n, tick_step):
+            self.create_text(x0 + (i + 0.5) * sx, y1 + 12, text=str(i + 1), fill='#666666', font=("Arial", 9), tags='xlabels')